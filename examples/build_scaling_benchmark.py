@@ -0,0 +1,52 @@
+import time
+
+from pypowerautomate.actions import Actions, ComposeAction, ScopeStatement
+from pypowerautomate.flow import Flow
+from pypowerautomate.triggers import ManualTrigger
+
+SIZES = (1_000, 10_000, 50_000, 100_000, 200_000)
+
+
+def build_chain(action_count: int) -> Flow:
+    # Each append checks the new action and its predecessor against the nodes of the flow.
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    for k in range(action_count):
+        flow.append_action(ComposeAction(f"compose {k}", k))
+    return flow
+
+
+def build_fan_in(action_count: int) -> Flow:
+    # Half of the actions run in parallel after the trigger, one action runs after all of them, and the rest follow it.
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    branches = [ComposeAction(f"branch {k}", k) for k in range(action_count // 2)]
+    flow.root_actions.add_parallel(None, branches)
+    flow.append_action(ComposeAction("join", 0), branches)
+    for k in range(action_count - len(branches) - 1):
+        flow.append_action(ComposeAction(f"compose {k}", k))
+    return flow
+
+
+def build_nested(action_count: int) -> Flow:
+    # Scopes of ten actions each, appended one after the other.
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    for k in range(action_count // 10):
+        scope = ScopeStatement(f"scope {k}", Actions())
+        for j in range(9):
+            scope.actions.append(ComposeAction(f"compose {k}.{j}", j))
+        flow.append_action(scope)
+    return flow
+
+
+# The time per action stays about the same as the flows grow, so building is linear in the number of actions.
+print(f"{'actions':>8} {'chain':>18} {'fan-in':>18} {'nested':>18}")
+for size in SIZES:
+    row = []
+    for build in (build_chain, build_fan_in, build_nested):
+        start = time.perf_counter()
+        build(size)
+        elapsed = time.perf_counter() - start
+        row.append(f"{elapsed * 1000:8.0f}ms {elapsed / size * 1e6:5.2f}us")
+    print(f"{size:8} {row[0]:>18} {row[1]:>18} {row[2]:>18}")
@@ -0,0 +1,60 @@
+import tempfile
+import time
+
+from pypowerautomate.actions import Actions, ComposeAction, ScopeStatement
+from pypowerautomate.flow import Flow
+from pypowerautomate.package import Package
+from pypowerautomate.serialization import JsonSerializer, available_backends, use_serializer
+from pypowerautomate.solution import Solution
+from pypowerautomate.triggers import ManualTrigger
+
+ACTIONS_PER_FLOW = 2000
+FLOWS_PER_SOLUTION = 10
+REPEAT = 3
+
+
+def build_flow(index: int) -> Flow:
+    # A synthetic flow: Compose actions with nested inputs, and Scope statements holding more of them.
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    for k in range(ACTIONS_PER_FLOW // 2):
+        flow.append_action(ComposeAction(f"compose {k}", {"index": k, "flow": index, "items": [f"@variables('v{k}')", k / 3, None], "text": "データ"}))
+        scope = ScopeStatement(f"scope {k}", Actions())
+        scope.actions.append(ComposeAction(f"nested {k}", [{"key": f"value {k}"}]))
+        flow.append_action(scope)
+    return flow
+
+
+def measure(task) -> float:
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        task()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+flows = [build_flow(i) for i in range(FLOWS_PER_SOLUTION)]
+output_dir = tempfile.mkdtemp()
+
+print(f"{'backend':8} {'options':28} {'export_json':>12} {'package zip':>12} {'solution zip':>13}")
+for backend in available_backends():
+    for compact, ensure_ascii in ((False, True), (True, False)):
+        try:
+            serializer = JsonSerializer(backend, compact=compact, ensure_ascii=ensure_ascii)
+        except ValueError:
+            continue  # e.g. orjson only writes compact JSON without escapes
+
+        def build_solution():
+            solution = Solution("benchmark", "pre", "publisher")
+            for i, flow in enumerate(flows):
+                solution.add_package(Package(f"flow{i}", flow))
+            solution.export_zipfile(output_dir)
+
+        with use_serializer(serializer):
+            flow_time = measure(flows[0].export_json)
+            package_time = measure(lambda: Package("flow", flows[0]).export_zipfile(output_dir))
+            solution_time = measure(build_solution)
+        options = f"compact={compact}, ensure_ascii={ensure_ascii}"
+        print(f"{backend:8} {options:28} {flow_time * 1000:10.1f}ms {package_time * 1000:10.1f}ms {solution_time * 1000:11.1f}ms")
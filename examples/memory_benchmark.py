@@ -0,0 +1,31 @@
+import gc
+import time
+import tracemalloc
+
+from pypowerautomate.actions import ComposeAction, HttpAction
+from pypowerautomate.flow import Flow
+from pypowerautomate.triggers import ManualTrigger
+
+# About 1 GB of memory is needed for the largest flow.
+SIZES = (10_000, 100_000, 1_000_000)
+
+
+def build_flow(action_count: int) -> Flow:
+    # A synthetic flow: a chain alternating Compose and HTTP actions.
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_actions(ComposeAction(f"compose {k}", k) if k % 2 else HttpAction(f"http {k}", "https://example.com", "GET") for k in range(action_count))
+    return flow
+
+
+print(f"{'actions':>9} {'traced':>10} {'per action':>11} {'build':>9}")
+for size in SIZES:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    flow = build_flow(size)
+    elapsed = time.perf_counter() - start
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{size:9} {traced / 2**20:8.1f}MB {traced / size:9.0f} B {elapsed:8.2f}s")
+    del flow
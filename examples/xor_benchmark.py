@@ -0,0 +1,52 @@
+import json
+import time
+
+from pypowerautomate.actions import ComposeAction
+from pypowerautomate.flow import Flow
+from pypowerautomate.serialization import xor_decode, xor_encode
+from pypowerautomate.triggers import ManualTrigger
+
+DEFINITION_SIZE = 10 * 2**20
+XOR_KEY = "12,34,56,78,90"
+REPEAT = 3
+
+
+def legacy_xor_encode(json_str: str, xor_key: str) -> str:
+    # The encoder of Flow.export_json before it worked on bytes: one ord, ^ and str per character.
+    xor_key = [int(x) for x in xor_key.split(",")]
+    return ",".join([str(ord(json_str[i]) ^ xor_key[i % len(xor_key)]) for i in range(len(json_str))])
+
+
+def build_flow(size: int) -> Flow:
+    # A synthetic flow with Compose actions until its definition is about `size` bytes long.
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    action_count = size // 266
+    flow.append_actions(ComposeAction(f"compose {k}", {"index": k, "text": f"@variables('value {k}')", "items": [k, k / 7, None]}) for k in range(action_count))
+    return flow
+
+
+def measure(task) -> float:
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        task()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+flow = build_flow(DEFINITION_SIZE)
+definition = json.dumps(flow.export())
+encoded = xor_encode(definition, XOR_KEY)
+assert encoded == legacy_xor_encode(definition, XOR_KEY)
+assert xor_decode(encoded, XOR_KEY) == definition.encode("utf-8")
+print(f"definition: {len(definition) / 2**20:.1f}MB, encoded: {len(encoded) / 2**20:.1f}MB, key: {XOR_KEY}")
+
+for label, task in (
+    ("legacy encode", lambda: legacy_xor_encode(definition, XOR_KEY)),
+    ("xor_encode", lambda: xor_encode(definition, XOR_KEY)),
+    ("xor_decode", lambda: xor_decode(encoded, XOR_KEY)),
+    ("export_json(xor_key)", lambda: flow.export_json(xor_key=XOR_KEY)),
+):
+    print(f"{label:22} {measure(task) * 1000:10.1f}ms")
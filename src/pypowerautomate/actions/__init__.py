@@ -1,5 +1,8 @@
-from .base import BaseAction, State
+from .base import BaseAction, State, cache_exports
+from .pagination import PaginatedAction
 from .actions import Actions, RawActions
+from .registry import ActionNameRegistry, scope_registry
+from .limits import PlatformLimits, LimitBudget
 from .condition import Condition
 from .statements import IfStatement, ForeachStatement, ScopeStatement, DoUntilStatement, SwitchStatement, CaseStatement, DefaultCaseStatement
 from .http import HttpAction
@@ -16,3 +19,4 @@ from .flows import *
 from .powerapps import *
 from .excelonlinebusiness import *
 from .expression import *
+from .sharepointbatch import SharepointBatchBuilder
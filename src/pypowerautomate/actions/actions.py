@@ -1,10 +1,110 @@
 import json
-from typing import List, Dict, Tuple, Union
+from typing import Iterable, Iterator, List, Dict, Sequence, Set, Tuple, Union
 from copy import deepcopy
+from heapq import heapify, heappop, heappush
+from itertools import islice
 
-from .base import BaseAction, SkeletonNode
+from .base import RUN_AFTER_SUCCEEDED, BaseAction, SkeletonNode, run_after_states, _caching_exports, _changed_since, _deferred_actions, _tick, _SHARE_NESTED
+from .registry import ActionNameRegistry, scope_registry
+from .limits import LimitBudget
 from .variable import InitVariableAction
 
+_MISSING = object()
+
+
+def export_nested(actions: 'Actions|RawActions') -> 'Dict|Actions':
+    """
+    Exports the nested actions of an If, Switch, Foreach, Until or Scope action.
+
+    While a JSON writer streams the action (see `pypowerautomate.serialization`), Actions are returned as they are,
+    so that the writer exports them one action at a time instead of building the whole nested dictionary.
+
+    Args:
+        actions (Actions|RawActions): The nested actions.
+
+    Returns:
+        Dict|Actions: The exported actions, or the Actions themselves while streaming.
+    """
+    deferred = _deferred_actions.get()
+    if deferred is not None and isinstance(actions, Actions):
+        deferred.append(actions)
+        return actions
+    return actions.export()
+
+
+class _ActionsTables:
+    """
+    The indexes of an Actions instance: its nodes by name and by identity, and its variable initialization nodes.
+
+    The tables can be handed over to another Actions instance in constant time. The instance that gives them up
+    keeps a snapshot (the number of nodes and the position in the journal) and only copies the tables back out
+    when it is used again. While a snapshot may exist, nodes are only appended or replaced by their copies, and
+    every replacement is journaled so that it can be undone.
+    """
+
+    __slots__ = ("nodes", "node_ids", "variable_init_nodes", "journal")
+
+    def __init__(self, root_node: SkeletonNode) -> None:
+        self.nodes: Dict[str, BaseAction] = {"root": root_node}
+        self.node_ids: Set[int] = {id(root_node)}
+        self.variable_init_nodes: List[BaseAction] = []
+        self.journal: List[Tuple[object, object, BaseAction]]|None = None
+
+    def replace(self, key: str, node: BaseAction, new_node: BaseAction):
+        """
+        Replaces a node, journaling the previous one while snapshots may exist.
+
+        Args:
+            key (str): The key of the node in `nodes`.
+            node (BaseAction): The node.
+            new_node (BaseAction): The node that takes its place.
+        """
+        if self.journal is not None:
+            self.journal.append((self.nodes, key, node))
+        self.nodes[key] = new_node
+        self.node_ids.discard(id(node))
+        self.node_ids.add(id(new_node))
+        for index, init_node in enumerate(self.variable_init_nodes):
+            if init_node is node:
+                if self.journal is not None:
+                    self.journal.append((self.variable_init_nodes, index, node))
+                self.variable_init_nodes[index] = new_node
+
+    def snapshot(self) -> Tuple[int, int, int]:
+        """
+        Takes a snapshot of the current state of the tables.
+
+        Returns:
+            Tuple[int, int, int]: The number of nodes, of variable initialization nodes and of journal entries.
+        """
+        if self.journal is None:
+            self.journal = []
+        return len(self.nodes), len(self.variable_init_nodes), len(self.journal)
+
+    def restore(self, snapshot: Tuple[int, int, int]) -> '_ActionsTables':
+        """
+        Copies the tables as they were when the snapshot was taken.
+
+        Args:
+            snapshot (Tuple[int, int, int]): A snapshot returned by `snapshot`.
+
+        Returns:
+            _ActionsTables: The copied tables, which are not journaled.
+        """
+        node_count, variable_init_count, journal_length = snapshot
+        tables = _ActionsTables.__new__(_ActionsTables)
+        tables.nodes = dict(islice(self.nodes.items(), node_count))
+        tables.variable_init_nodes = self.variable_init_nodes[:variable_init_count]
+        tables.journal = None
+        for container, key, previous in reversed(self.journal[journal_length:]):
+            if container is self.nodes:
+                if key in tables.nodes:
+                    tables.nodes[key] = previous
+            elif key < variable_init_count:
+                tables.variable_init_nodes[key] = previous
+        tables.node_ids = {id(node) for node in tables.nodes.values()}
+        return tables
+
 
 class Actions:
     """
@@ -17,20 +117,495 @@ class Actions:
 
     Note:
     To manage variable initialization actions at the top of the chain in flows triggered by events, such actions are only allowed at the root level and must be executed in sequence before other actions.
-    """
 
-    used_names = []
+    Action names are made unique through an ActionNameRegistry. Unless one is given, the registry of the active
+    `ActionNameRegistry.scope` is used (see `scope_registry`), or a new registry outside of a scope. When an action
+    is added, the Actions nested in it are bound to the registry of this instance: their actions whose names are
+    already taken there are renamed. Names are released when their actions are removed (see `splice`), unless
+    they are shared with another Actions instance.
+
+    Composing Actions with `+` shares the action objects of the operands instead of copying them (copy-on-write).
+    A shared action is copied by the first Actions instance that modifies it, or that hands it out through `get`,
+    `nodes`, `last_update_node` or the other methods returning actions, so the actions obtained from an Actions
+    instance can be modified without affecting the operands or the result of a composition. Action objects kept
+    from before the composition are shared by all of them and should not be modified; get them again instead.
 
-    def __init__(self, is_root: bool = False) -> None:
+    With a limit budget attached (see `set_budget`), every addition is checked against the limits of the platform
+    and fails with a ValueError when a limit would be exceeded, before anything is changed.
+
+    Inside `cache_exports`, exports are cached: exporting again after a change only rebuilds the changed actions and
+    the actions they are nested in (see `BaseAction.cached_export`).
+    """
+
+    def __init__(self, is_root: bool = False, name_registry: ActionNameRegistry|None = None) -> None:
         self.root_node = SkeletonNode("root")
-        self.last_update_node = self.root_node
+        self.__last: BaseAction = self.root_node
         self.is_root_actions: bool = is_root
-        self.nodes: Dict[str, BaseAction] = {"root": self.root_node}
-        self.variable_init_nodes: List[BaseAction] = []
+        if name_registry is None:
+            name_registry = scope_registry()
+            if name_registry is None:
+                name_registry = ActionNameRegistry()
+        self.name_registry: ActionNameRegistry = name_registry
+        # The names this instance reserved and shares with no other Actions instance, which are released on removal.
+        self.__reserved: Set[str] = set()
+        self.__tables = _ActionsTables(self.root_node)
+        self.__snapshot: Tuple[int, int, int]|None = None
+        # The ids of the nodes that no other Actions instance holds, which this instance modifies in place.
+        self.__owned: Set[int] = {id(self.root_node)}
+        self.budget: LimitBudget|None = None
+        self.depth: int = 1
+        # The time of the last change, and of the last export with its result (see `BaseAction.cached_export`).
+        self._version: int = _tick()
+        self.__export_cache: Tuple[int, List[Tuple[str, Dict]]]|None = None
+
+    def __current_tables(self) -> _ActionsTables:
+        """
+        Returns the tables of this instance, copying them out first if they were handed over to another instance.
+
+        Returns:
+            _ActionsTables: The tables.
+        """
+        if self.__snapshot is not None:
+            self.__tables = self.__tables.restore(self.__snapshot)
+            self.__snapshot = None
+        return self.__tables
+
+    def __private_tables(self) -> _ActionsTables:
+        """
+        Returns the tables of this instance, copying them first if snapshots of them may exist,
+        so that nodes can be removed or renamed.
+
+        Returns:
+            _ActionsTables: The tables.
+        """
+        tables = self.__current_tables()
+        if tables.journal is not None:
+            tables = self.__tables = tables.restore(tables.snapshot())
+        return tables
+
+    @property
+    def nodes(self) -> Dict[str, BaseAction]:
+        """
+        Dict[str, BaseAction]: The nodes of this instance keyed by action name, in insertion order, including the root node.
+        Nodes shared with other Actions instances are copied first, so the nodes can be modified.
+        """
+        return self.__own_all().nodes
+
+    def _node_table(self) -> Dict[str, BaseAction]:
+        """
+        Returns the nodes of this instance keyed by action name, including the root node, without copying the nodes
+        shared with other Actions instances. The nodes must not be modified.
+
+        Returns:
+            Dict[str, BaseAction]: The nodes.
+        """
+        return self.__current_tables().nodes
+
+    @property
+    def node_ids(self) -> Set[int]:
+        """
+        Set[int]: The ids of the nodes of this instance, including the root node.
+        """
+        return self.__current_tables().node_ids
+
+    @property
+    def variable_init_nodes(self) -> List[BaseAction]:
+        """
+        List[BaseAction]: The variable initialization actions of this instance.
+        """
+        return self.__own_all().variable_init_nodes
+
+    @property
+    def last_update_node(self) -> BaseAction:
+        """
+        BaseAction: The action that `append` adds actions after: the last action added, or the root node.
+        """
+        return self.__own(self.__last)
+
+    @last_update_node.setter
+    def last_update_node(self, action: BaseAction):
+        self.__last = action
+
+    def __contains__(self, action: object) -> bool:
+        """
+        Checks whether the given action object is a node of this Actions instance, by identity.
+
+        Args:
+            action (object): The action to look up.
+
+        Returns:
+            bool: True if the action is a node of this Actions instance.
+        """
+        return id(action) in self.node_ids
+
+    def get(self, name: str) -> BaseAction|None:
+        """
+        Looks up a node by its action name.
+
+        Args:
+            name (str): The name of the action.
+
+        Returns:
+            BaseAction|None: The action with the given name, or None if there is no such action.
+        """
+        node = self.__current_tables().nodes.get(name)
+        return self.__own(node) if node is not None else None
+
+    def successors(self, action: BaseAction) -> Tuple[BaseAction, ...]:
+        """
+        Returns the actions that follow the given action in this Actions instance, like its `next_nodes`.
+
+        Args:
+            action (BaseAction): An action of this Actions instance, or its root node.
+
+        Returns:
+            Tuple[BaseAction, ...]: The next actions.
+        """
+        return tuple(self.__own(node) for node in self.__successors(action))
+
+    def __successors(self, action: BaseAction) -> Tuple[BaseAction, ...]:
+        """
+        Returns the next actions of an action without copying them. The next actions of a shared node may be the
+        objects they were copied from, so they are looked up by name.
+        """
+        nodes = self.__current_tables().nodes
+        return tuple(node for node in map(nodes.get, [next_node.action_name for next_node in action.next_nodes]) if node is not None)
+
+    def runafter_of(self, action: BaseAction) -> Dict[str, Sequence[str]]:
+        """
+        Returns the run-after conditions of the given action, like its `runafter`, without allocating them.
+
+        Args:
+            action (BaseAction): An action of this Actions instance.
+
+        Returns:
+            Dict[str, Sequence[str]]: The run-after conditions, keyed by the names of the preceding actions.
+        """
+        runafter = action._runafter
+        return runafter if runafter is not None else {}
+
+    def __own(self, node: BaseAction) -> BaseAction:
+        """
+        Returns the node of this instance with the name of the given one, copying it first if other Actions instances
+        hold it (see `BaseAction._copy_for_write`). The copy takes its place in the links of this instance.
+
+        Args:
+            node (BaseAction): A node of this instance, or the root node.
+
+        Returns:
+            BaseAction: The node, which this instance can modify.
+        """
+        tables = self.__current_tables()
+        key = "root" if node is self.root_node else node.action_name
+        node = tables.nodes.get(key, node)
+        if id(node) in self.__owned:
+            return node
+        copy = node._copy_for_write()
+        copy.next_nodes = self.__successors(node)
+        tables.replace(key, node, copy)
+        self.__owned.add(id(copy))
+        self._version = _tick()
+        if node is self.root_node:
+            self.root_node = copy
+        if self.__last is node:
+            self.__last = copy
+        for prev_action in (self.root_node, *map(tables.nodes.get, self.runafter_of(copy))):
+            if prev_action is not None and prev_action is not copy and id(prev_action) in self.__owned:
+                prev_action.next_nodes = tuple(copy if next_node is node else next_node for next_node in prev_action.next_nodes)
+        return copy
+
+    def __own_all(self) -> _ActionsTables:
+        """
+        Copies all the nodes that other Actions instances hold, so that every node of this instance can be modified.
+
+        Returns:
+            _ActionsTables: The tables.
+        """
+        tables = self.__current_tables()
+        if len(self.__owned) == len(tables.nodes):
+            return tables
+        copies: Dict[int, Tuple[BaseAction, BaseAction]] = {}
+        for key, node in list(tables.nodes.items()):
+            if id(node) not in self.__owned:
+                copy = node._copy_for_write()
+                copies[id(node)] = (node, copy)
+                tables.replace(key, node, copy)
+                self.__owned.add(id(copy))
+        nodes = tables.nodes
+        for node in nodes.values():
+            node.next_nodes = [nodes[next_node.action_name] for next_node in node.next_nodes if next_node.action_name in nodes]
+        self.root_node = copies.get(id(self.root_node), (None, self.root_node))[1]
+        self.__last = copies.get(id(self.__last), (None, self.__last))[1]
+        self._version = _tick()
+        return tables
+
+    def __register_node(self, new_action: BaseAction):
+        """
+        Records a newly linked action in the name and identity indexes.
+
+        Args:
+            new_action (BaseAction): The action that was added.
+        """
+        tables = self.__current_tables()
+        self._version = _tick()
+        self.__last = new_action
+        tables.nodes[new_action.action_name] = new_action
+        tables.node_ids.add(id(new_action))
+        self.__owned.add(id(new_action))
+
+    def __link(self, prev_action: BaseAction, new_action: BaseAction, force_exec: bool = False, exec_if_failed: bool = False):
+        """
+        Links an action after another one.
+
+        Args:
+            prev_action (BaseAction): The preceding action, or the root node.
+            new_action (BaseAction): The following action.
+            force_exec (bool): If true, the new action will execute even if the previous action failed.
+            exec_if_failed (bool): If true, the new action will execute only if the previous action failed.
+        """
+        self.__link_all(prev_action, (new_action,), force_exec, exec_if_failed)
+
+    def __link_all(self, prev_action: BaseAction, new_actions: Tuple[BaseAction, ...], force_exec: bool = False, exec_if_failed: bool = False):
+        """
+        Links several actions after the same action, updating its next actions once.
+        Shared nodes are copied before they are modified.
+
+        Args:
+            prev_action (BaseAction): The preceding action, or the root node.
+            new_actions (Tuple[BaseAction, ...]): The following actions.
+            force_exec (bool): If true, the new actions will execute even if the previous action failed.
+            exec_if_failed (bool): If true, the new actions will execute only if the previous action failed.
+        """
+        self._version = _tick()
+        if not isinstance(prev_action, SkeletonNode):
+            new_actions = tuple(self.__own(new_action) for new_action in new_actions)
+            for new_action in new_actions:
+                new_action.update_runafter(prev_action, force_exec=force_exec, exec_if_failed=exec_if_failed)
+        self.__set_successors(prev_action, self.__successors(prev_action) + new_actions)
+
+    def __set_successors(self, action: BaseAction, next_nodes: Tuple[BaseAction, ...]):
+        """
+        Replaces the next actions of an action, dropping duplicates. A shared node is copied first.
+
+        Args:
+            action (BaseAction): The action, or the root node.
+            next_nodes (Tuple[BaseAction, ...]): The new next actions.
+        """
+        unique: Dict[int, BaseAction] = {}
+        for node in next_nodes:
+            unique.setdefault(id(node), node)
+        next_nodes = tuple(unique.values())
+        self._version = _tick()
+        if next_nodes != self.__successors(action):
+            self.__own(action).next_nodes = next_nodes
+
+    def predecessors(self, action: BaseAction) -> List[BaseAction]:
+        """
+        Returns the actions that the given action runs after, or the root node if it is one of the top actions.
+
+        Args:
+            action (BaseAction): An action of this Actions instance.
+
+        Returns:
+            List[BaseAction]: The preceding actions.
+        """
+        return [self.__own(node) for node in self.__predecessors(action)]
+
+    def __predecessors(self, action: BaseAction) -> List[BaseAction]:
+        """
+        Returns the preceding actions of an action without copying them.
+        """
+        nodes = self.__current_tables().nodes
+        prev_actions = [nodes[name] for name in self.runafter_of(action) if name in nodes]
+        if any(node.action_name == action.action_name for node in self.__successors(self.root_node)):
+            prev_actions.append(self.root_node)
+        return prev_actions
+
+    def set_budget(self, budget: LimitBudget|None):
+        """
+        Attaches a limit budget, which counts the actions of this instance and of the Actions nested in them,
+        and checks every later addition against the limits of the platform. This is done by `Flow` for its root actions.
+
+        Args:
+            budget (LimitBudget|None): The budget, or None to stop counting.
+
+        Raises:
+            ValueError: If the current actions already exceed a limit.
+        """
+        if budget is not None:
+            budget.charge([node for node in self.nodes.values() if node is not self.root_node], self.depth)
+        self.budget = budget
+
+    def set_runafter(self, action: BaseAction, prev_actions: Dict[BaseAction, Sequence[str]]|Sequence[BaseAction]):
+        """
+        Replaces the run-after conditions of an action, moving it after the given actions.
+        If no preceding action is given, the action becomes one of the top actions.
+
+        Args:
+            action (BaseAction): An action of this Actions instance.
+            prev_actions (Dict[BaseAction, Sequence[str]]|Sequence[BaseAction]): The preceding actions, mapped to the
+                states they must end in. A sequence of actions means that each of them must succeed.
+
+        Raises:
+            ValueError: If the action or one of the preceding actions is not in this Actions instance.
+        """
+        if not isinstance(prev_actions, dict):
+            prev_actions = {prev_action: RUN_AFTER_SUCCEEDED for prev_action in prev_actions}
+        if action is self.root_node or id(action) not in self.node_ids:
+            raise ValueError(f"{action} not in Actions")
+        for prev_action in prev_actions:
+            if prev_action is action or id(prev_action) not in self.node_ids:
+                raise ValueError(f"{prev_action} cannot precede {action}")
+
+        action = self.__own(action)
+        for prev_action in self.__predecessors(action):
+            self.__set_successors(prev_action, tuple(node for node in self.__successors(prev_action) if node is not action))
+        runafter = {}
+        for prev_action, states in prev_actions.items():
+            if prev_action is not self.root_node:
+                runafter[prev_action.action_name] = tuple(states)
+            self.__set_successors(prev_action, self.__successors(prev_action) + (action,))
+        if not runafter:
+            self.__set_successors(self.root_node, self.__successors(self.root_node) + (action,))
+        self.__write_runafter(action, runafter)
+
+    def __write_runafter(self, action: BaseAction, runafter: Dict[str, Sequence[str]]):
+        """
+        Replaces the run-after conditions of an action. A shared node is copied first.
+
+        Args:
+            action (BaseAction): The action.
+            runafter (Dict[str, Sequence[str]]): The new run-after conditions.
+        """
+        self._version = _tick()
+        self.__own(action).runafter = runafter
+
+    def remove(self, action: BaseAction):
+        """
+        Removes an action. The actions that ran after it run after its preceding actions instead,
+        with the run-after states the removed action had.
+
+        Args:
+            action (BaseAction): An action of this Actions instance.
+
+        Raises:
+            ValueError: If the action is not in this Actions instance.
+        """
+        self.splice(action, None)
+
+    def splice(self, action: BaseAction, replacement: 'Actions|None'):
+        """
+        Replaces an action with the actions of another Actions instance, for example to inline the taken
+        branch of an If statement. The top actions of the replacement run after the actions that the replaced
+        action ran after, and the actions that ran after the replaced action run after the last actions of the
+        replacement instead. With no replacement, or an empty one, the action is simply removed.
+
+        The nodes of the replacement are moved into this instance, so the replacement should not be used afterwards.
+
+        Args:
+            action (BaseAction): An action of this Actions instance.
+            replacement (Actions|None): The actions that take its place.
+
+        Raises:
+            ValueError: If the action is not in this Actions instance, or if an action name of the replacement is already used.
+        """
+        if action is self.root_node or id(action) not in self.node_ids:
+            raise ValueError(f"{action} not in Actions")
+        inner = replacement.topological_order() if replacement is not None else []
+        tables = self.__current_tables()
+        for node in inner:
+            if node.action_name in tables.nodes or id(node) in tables.node_ids:
+                raise ValueError(f"{node} already exists in Actions")
+        if self.budget is not None:
+            self.budget.charge(inner, self.depth)
+
+        tables = self.__private_tables()
+        self._version = _tick()
+        prev_actions = self.__predecessors(action)
+        prev_runafter = dict(self.runafter_of(action))
+        followers = self.__successors(action)
+        for prev_action in prev_actions:
+            self.__set_successors(prev_action, tuple(node for node in self.__successors(prev_action) if node is not action))
+
+        last_actions: List[BaseAction] = []
+        if inner:
+            preceded = {name for node in inner for name in replacement.runafter_of(node)}
+            for node in inner:
+                tables.nodes[node.action_name] = node
+                tables.node_ids.add(id(node))
+                replacement.__owned.discard(id(node))
+                self.__owned.add(id(node))
+                if node.action_name in replacement.__reserved and replacement.name_registry is self.name_registry:
+                    self.__reserved.add(node.action_name)
+                if not node._runafter:
+                    node.runafter = dict(prev_runafter)
+                    for prev_action in prev_actions:
+                        self.__set_successors(prev_action, self.__successors(prev_action) + (node,))
+                if node.action_name not in preceded:
+                    last_actions.append(node)
+            tables.variable_init_nodes.extend(replacement.variable_init_nodes)
+        else:
+            last_actions = [prev_action for prev_action in prev_actions if prev_action is not self.root_node]
+
+        for follower in followers:
+            runafter = dict(self.runafter_of(follower))
+            states = runafter.pop(action.action_name, RUN_AFTER_SUCCEEDED)
+            for last_action in last_actions:
+                if inner:
+                    runafter.setdefault(last_action.action_name, states)
+                else:
+                    runafter.setdefault(last_action.action_name, prev_runafter[last_action.action_name])
+                self.__set_successors(last_action, self.__successors(last_action) + (follower,))
+            if not runafter:
+                self.__set_successors(self.root_node, self.__successors(self.root_node) + (follower,))
+            self.__write_runafter(follower, runafter)
+
+        if self.budget is not None:
+            self.budget.release(action, {id(node) for node in inner})
+        if replacement is not None:
+            replacement.__reserved.clear()
+        del tables.nodes[action.action_name]
+        tables.node_ids.discard(id(action))
+        if action.action_name in self.__reserved:
+            self.__reserved.discard(action.action_name)
+            self.name_registry.release(action.action_name)
+        tables.variable_init_nodes = [node for node in tables.variable_init_nodes if node is not action]
+        if id(action) in self.__owned:
+            self.__owned.discard(id(action))
+            action.next_nodes = ()
+            action.runafter = {}
+            action.have_parent_node = False
+        if self.__last is action:
+            self.__last = last_actions[-1] if last_actions else list(tables.nodes.values())[-1]
+
+    def __share(self) -> 'Actions':
+        """
+        Creates an Actions instance that shares all the nodes of this instance. From then on, each instance copies
+        a shared node before modifying it or handing it out.
+
+        The tables are handed over to the new instance in constant time, and this instance keeps a snapshot of them.
+
+        Returns:
+            Actions: The new Actions instance.
+        """
+        tables = self.__current_tables()
+        new_actions = Actions(self.is_root_actions, self.name_registry)
+        new_actions.root_node = self.root_node
+        new_actions.__last = self.__last
+        new_actions.__tables = tables
+        new_actions.__owned = set()
+        new_actions.budget = self.budget
+        new_actions.depth = self.depth
+        self.__snapshot = tables.snapshot()
+        self.__owned = set()
+        self.__reserved = set()
+        return new_actions
 
     def __validate_action(self, new_action: BaseAction, prev_action: List[BaseAction|None] = [None]):
         """
         Validates a new action before adding it to the tree, ensuring it does not already exist, and checks parent-child constraints.
+        Every check, including the limit budget, is made before the Actions nested in the action are bound to the
+        registry of this instance, so a failed addition leaves their names unchanged.
 
         Args:
             new_action (BaseAction): The action to be validated.
@@ -39,23 +614,103 @@ class Actions:
         Raises:
             ValueError: If the action violates any constraints.
         """
-        if new_action in self.nodes.values():
+        if id(new_action) in self.node_ids:
             raise ValueError(f"{new_action} already exists in Actions")
         if new_action.have_parent_node:
             raise ValueError(f"{new_action} already have a parent Actions.")
         for action in prev_action:
-            if action and action not in self.nodes.values():
+            if action and id(action) not in self.node_ids:
                 raise ValueError(f"{action} not in Actions")
         if not self.is_root_actions and isinstance(new_action, InitVariableAction):
             raise ValueError(f"{new_action} cannot be set into non-root Actions")
+        if self.budget is not None:
+            self.budget.charge([new_action], self.depth)
+        self.__bind_nested([new_action])
+
+        new_action.action_name = self.name_registry.reserve(new_action.action_name)
+        self.__reserved.add(new_action.action_name)
+
+    def __bind_nested(self, new_actions: Iterable[BaseAction]):
+        """
+        Binds the Actions nested in new actions, at any depth, to the registry of this instance (see `__rebind`),
+        so that action names stay unique in a flow whatever registry the nested Actions were built with.
+
+        Args:
+            new_actions (Iterable[BaseAction]): The actions being added.
+        """
+        registry = self.name_registry
+        stack = [child for new_action in new_actions for child in new_action.get_child_actions()]
+        while stack:
+            actions = stack.pop()
+            actions.__rebind(registry)
+            stack.extend(actions.__nested_actions())
 
-        original_name = new_action.action_name
-        counter = 1
-        while new_action.action_name in Actions.used_names:
-            new_action.action_name = f"{original_name}_{counter}"
-            counter += 1
+    def __nested_actions(self) -> List['Actions']:
+        """
+        Returns the Actions nested in the actions of this instance. The actions holding them are copied first if they
+        are shared, so that the nested Actions belong to this instance only.
 
-        Actions.used_names.append(new_action.action_name)
+        Returns:
+            List[Actions]: The nested Actions.
+        """
+        children = []
+        for node in list(self.__current_tables().nodes.values()):
+            if node.get_child_actions():
+                children.extend(self.__own(node).get_child_actions())
+        return children
+
+    def __rebind(self, registry: ActionNameRegistry):
+        """
+        Makes this instance reserve its names in the given registry. Actions whose names are already taken there
+        are renamed, and the run-after conditions that refer to them are updated. Names are also changed when
+        another Actions instance already holds them in the registry, which happens when Actions composed from
+        the same fragment with `+` are nested in the same flow.
+
+        Args:
+            registry (ActionNameRegistry): The registry of the Actions instance this instance is nested in.
+        """
+        rename = self.name_registry is not registry
+        tables = self.__current_tables()
+        if not rename and len(self.__owned) == len(tables.nodes):
+            return
+        new_names: Dict[str, str] = {}
+        for name, node in tables.nodes.items():
+            if node is self.root_node:
+                continue
+            new_name = registry.reserve(name) if rename else name
+            if not registry.claim(new_name, self):
+                new_name = registry.reserve(name)
+                registry.claim(new_name, self)
+            if new_name != name:
+                new_names[name] = new_name
+            if rename or new_name != name:
+                self.__reserved.add(new_name)
+            else:
+                self.__reserved.discard(new_name)
+        self.name_registry = registry
+        if new_names:
+            self.__rename(new_names)
+
+    def __rename(self, new_names: Dict[str, str]):
+        """
+        Renames actions of this instance, updating the run-after conditions that refer to them.
+        Shared actions are copied first.
+
+        Args:
+            new_names (Dict[str, str]): The new names, keyed by the previous names.
+        """
+        self.__private_tables()
+        tables = self.__own_all()
+        nodes: Dict[str, BaseAction] = {}
+        for name, node in tables.nodes.items():
+            if node is not self.root_node:
+                node.action_name = name = new_names.get(name, name)
+            runafter = node._runafter
+            if runafter and not new_names.keys().isdisjoint(runafter):
+                node.runafter = {new_names.get(prev_name, prev_name): states for prev_name, states in runafter.items()}
+            nodes[name] = node
+        tables.nodes = nodes
+        self._version = _tick()
 
     def add_top(self, new_action: BaseAction):
         """
@@ -65,11 +720,9 @@ class Actions:
             new_action (BaseAction): The action to be added.
         """
         self.__validate_action(new_action)
-        self.root_node.add_next_action(new_action)
         new_action.have_parent_node = True
-        new_action.update_runafter(self.root_node)
-        self.last_update_node = new_action
-        self.nodes[new_action.action_name] = new_action
+        self.__register_node(new_action)
+        self.__link(self.root_node, new_action)
 
     def add_after(self, new_action: BaseAction, prev_action: List[BaseAction|SkeletonNode|None]|BaseAction|SkeletonNode|None, force_exec: bool = False, exec_if_failed: bool = False):
         """
@@ -85,16 +738,11 @@ class Actions:
             prev_action = [prev_action]
 
         self.__validate_action(new_action, prev_action)
-        for action in prev_action:
-            if action != None:
-                action.add_next_action(new_action)
-
         new_action.have_parent_node = True
+        self.__register_node(new_action)
         for action in prev_action:
             if action != None:
-                new_action.update_runafter(action, force_exec=force_exec, exec_if_failed=exec_if_failed)
-        self.last_update_node = new_action
-        self.nodes[new_action.action_name] = new_action
+                self.__link(action, new_action, force_exec, exec_if_failed)
 
     def append(self, new_action: BaseAction, force_exec: bool = False, exec_if_failed: bool = False):
         """
@@ -106,15 +754,118 @@ class Actions:
             exec_if_failed (bool): If true, the new action will execute only if the previous action failed.
         """
         self.__validate_action(new_action)
-        self.last_update_node.add_next_action(new_action)
+        prev_action = self.last_update_node
         new_action.have_parent_node = True
-        new_action.update_runafter(self.last_update_node, force_exec=force_exec, exec_if_failed=exec_if_failed)
-        self.last_update_node = new_action
-        self.nodes[new_action.action_name] = new_action
+        self.__register_node(new_action)
+        self.__link(prev_action, new_action, force_exec, exec_if_failed)
+
+    def extend(self, new_actions: Iterable[BaseAction], prev_action: List[BaseAction|SkeletonNode|None]|BaseAction|SkeletonNode|None = None, force_exec: bool = False, exec_if_failed: bool = False):
+        """
+        Adds a chain of actions, each running after the one before it. The first action runs after `prev_action`,
+        or after the last updated node if it is not given.
+
+        The whole batch is validated before anything is added, so either all the actions are added or none is.
+
+        Args:
+            new_actions (Iterable[BaseAction]): The actions to be added, in execution order.
+            prev_action (BaseAction, optional): The action or actions after which the chain should be added.
+            force_exec (bool): If true, each action will execute regardless of the previous action's success.
+            exec_if_failed (bool): If true, each action will execute only if the previous action failed.
+
+        Raises:
+            ValueError: If an action violates any constraints.
+        """
+        self.add_parallel(prev_action, [list(new_actions)], force_exec, exec_if_failed)
+
+    def add_parallel(self, prev_action: List[BaseAction|SkeletonNode|None]|BaseAction|SkeletonNode|None, branches: Iterable[BaseAction|Iterable[BaseAction]], force_exec: bool = False, exec_if_failed: bool = False):
+        """
+        Adds branches that all run after the same action. Each branch is a single action or a chain of actions.
+        If `prev_action` is None, the branches run after the last updated node.
+
+        The whole batch is validated before anything is added, so either all the actions are added or none is.
+        The last updated node becomes the last action of the last branch.
+
+        Example:
+            actions.add_parallel(start, [notify, [get_rows, update_rows]])
+
+        Args:
+            prev_action (BaseAction): The action or actions after which the branches should be added.
+            branches (Iterable[BaseAction|Iterable[BaseAction]]): The branches to be added.
+            force_exec (bool): If true, each action will execute regardless of the previous action's success.
+            exec_if_failed (bool): If true, each action will execute only if the previous action failed.
+
+        Raises:
+            ValueError: If an action violates any constraints.
+        """
+        if prev_action is None:
+            prev_action = [self.last_update_node]
+        elif not isinstance(prev_action, List):
+            prev_action = [prev_action]
+        prev_action = [action for action in prev_action if action != None] or [self.root_node]
+        chains = [[branch] if isinstance(branch, BaseAction) else list(branch) for branch in branches]
+        chains = [chain for chain in chains if chain]
+        batch = [action for chain in chains for action in chain]
+
+        self.__validate_batch(batch, prev_action)
+        names = self.name_registry.reserve_many(action.action_name for action in batch)
+        self.__reserved.update(names)
+        for action, name in zip(batch, names):
+            action.action_name = name
+            action.have_parent_node = True
+        batch_ids = [id(action) for action in batch]
+        tables = self.__current_tables()
+        self._version = _tick()
+        tables.nodes.update(zip(names, batch))
+        tables.node_ids.update(batch_ids)
+        self.__owned.update(batch_ids)
+
+        state_list = run_after_states(force_exec, exec_if_failed)
+        heads = tuple(chain[0] for chain in chains)
+        for action in prev_action:
+            self.__link_all(action, heads, force_exec, exec_if_failed)
+        for chain in chains:
+            for prev, action in zip(chain, chain[1:]):
+                prev.next_nodes = (action,)
+                action.runafter = {prev.action_name: state_list}
+        if batch:
+            self.last_update_node = batch[-1]
+
+    def __validate_batch(self, new_actions: List[BaseAction], prev_action: List[BaseAction|SkeletonNode]):
+        """
+        Validates a batch of new actions in a single pass, with the same rules as `__validate_action`, then binds
+        the Actions nested in them. The names of the actions themselves are not reserved.
+
+        Args:
+            new_actions (List[BaseAction]): The actions to be validated.
+            prev_action (List[BaseAction]): The actions to which the batch would be linked.
+
+        Raises:
+            ValueError: If an action violates any constraints.
+        """
+        node_ids = self.node_ids
+        for action in prev_action:
+            if id(action) not in node_ids:
+                raise ValueError(f"{action} not in Actions")
+        batch_ids = {id(new_action) for new_action in new_actions}
+        if len(batch_ids) != len(new_actions) or not node_ids.isdisjoint(batch_ids):
+            seen = set()
+            for new_action in new_actions:
+                if id(new_action) in node_ids or id(new_action) in seen:
+                    raise ValueError(f"{new_action} already exists in Actions")
+                seen.add(id(new_action))
+        for new_action in new_actions:
+            if new_action.have_parent_node:
+                raise ValueError(f"{new_action} already have a parent Actions.")
+            if not self.is_root_actions and isinstance(new_action, InitVariableAction):
+                raise ValueError(f"{new_action} cannot be set into non-root Actions")
+        if self.budget is not None:
+            self.budget.charge(new_actions, self.depth)
+        self.__bind_nested(new_actions)
 
     def copy_nodes(self, original_node: BaseAction) -> BaseAction:
         """
-        Recursively copies a node and all its children.
+        Copies a node and all the nodes reachable from it. Each node is copied exactly once, even when it is
+        reachable through several paths, and the copy is iterative so long chains do not hit the recursion limit.
 
         Args:
             original_node (BaseAction): The root node from which the copy will begin.
@@ -122,31 +873,77 @@ class Actions:
         Returns:
             BaseAction: The root of the copied subtree.
         """
-        new_node = original_node.clone()
-        for child in original_node.next_nodes:
-            new_child = self.copy_nodes(child)
-            new_node.add_next_action(new_child)
-        return new_node
+        copies: Dict[int, BaseAction] = {id(original_node): original_node.clone()}
+        stack: List[BaseAction] = [original_node]
+        while stack:
+            node = stack.pop()
+            new_children = []
+            for child in self.__successors(node):
+                new_child = copies.get(id(child))
+                if new_child is None:
+                    new_child = child.clone()
+                    copies[id(child)] = new_child
+                    stack.append(child)
+                new_children.append(new_child)
+            copies[id(node)].next_nodes = new_children
+        return copies[id(original_node)]
 
     def __deepcopy__(self, memo) -> 'Actions':
         """
         Creates a deep copy of this Actions instance, including all nodes and their connections.
 
+        Every node is copied once, in the order of `nodes`. The copies get names reserved in the same registry,
+        and their links and run-after conditions are rebuilt directly rather than re-validated one by one,
+        so the copy takes linear time.
+
+        When the action holding this instance is copied for writing (see `BaseAction._copy_for_write`), the copy
+        shares the nodes of this instance instead.
+
         Returns:
             Actions: A new Actions instance that is a deep copy of this instance.
         """
-        new_root = self.copy_nodes(self.root_node)
-        new_actions = Actions(self.is_root_actions)
-        new_actions.root_node = new_root
-        new_actions.nodes = {"root": new_root}
-        stack: List[Tuple[BaseAction, BaseAction|None]] = [(new_root, None)]
-        while stack:
-            child, parent = stack.pop()
-            if parent:
-                new_actions.add_after(child, [parent])
-            for next_node in child.next_nodes:
-                stack.append((next_node, child))
-        new_actions.last_update_node = new_actions.nodes[self.last_update_node.action_name]
+        if memo.get(id(_SHARE_NESTED)) is _SHARE_NESTED:
+            new_actions = memo[id(self)] = self.__share()
+            return new_actions
+        return self.__copy(self.name_registry, memo)
+
+    def __copy(self, name_registry: ActionNameRegistry, memo: Dict) -> 'Actions':
+        """
+        Copies every node of this Actions instance into a new instance that owns all of them.
+
+        Args:
+            name_registry (ActionNameRegistry): The registry in which the names of the copies are reserved.
+            memo (Dict): The deepcopy memo.
+
+        Returns:
+            Actions: The copy.
+        """
+        new_actions = Actions(self.is_root_actions, name_registry)
+        memo[id(self)] = new_actions
+        tables = self.__current_tables()
+        new_tables = new_actions.__tables
+        copies: Dict[int, BaseAction] = {id(self.root_node): new_actions.root_node}
+        new_names: Dict[str, str] = {}
+        for node in tables.nodes.values():
+            if node is self.root_node:
+                continue
+            new_node = deepcopy(node, memo)
+            new_node.action_name = name_registry.reserve(node.action_name)
+            new_node.have_parent_node = True
+            new_names[node.action_name] = new_node.action_name
+            copies[id(node)] = new_node
+            new_tables.nodes[new_node.action_name] = new_node
+            new_tables.node_ids.add(id(new_node))
+            new_actions.__owned.add(id(new_node))
+            new_actions.__reserved.add(new_node.action_name)
+
+        for node in tables.nodes.values():
+            new_node = copies[id(node)]
+            new_node.next_nodes = [copies[id(child)] for child in self.__successors(node)]
+            new_node.runafter = {new_names.get(name, name): states for name, states in self.runafter_of(node).items()}
+
+        new_actions.__last = copies[id(self.__last)]
+        new_tables.variable_init_nodes.extend(copies[id(node)] for node in tables.variable_init_nodes)
         return new_actions
 
     def clone(self) -> 'Actions':
@@ -162,6 +959,13 @@ class Actions:
         """
         Supports the addition of another Actions instance or a BaseAction to this instance, combining their nodes appropriately.
 
+        The result shares the nodes of both operands, so the cost of the addition does not depend on the size of
+        the left-hand side; a shared node is only copied once it is modified or handed out (see `Actions`).
+        The first actions of the right-hand side run after the last action of the left-hand side.
+        A BaseAction operand is cloned before it is appended, and an Actions operand is copied only if it has nodes
+        or names in common with the left-hand side, or, when it uses another registry, names already taken in the
+        registry of the left-hand side. Otherwise its names are reserved there.
+
         Args:
             rhs_actions (Union['Actions', BaseAction]): The right-hand side Actions instance or BaseAction to add.
 
@@ -172,39 +976,190 @@ class Actions:
             TypeError: If the right-hand side is neither an Actions instance nor a BaseAction.
         """
         if isinstance(rhs_actions, Actions):
-            new_actions = self.clone()
+            new_actions = self.__share()
             new_actions.is_root_actions |= rhs_actions.is_root_actions
-            stack: List[Tuple[BaseAction, SkeletonNode | BaseAction | None]] = [(rhs_actions.root_node, None)]
-            while stack:
-                child, parent = stack.pop()
-                new_child = child.clone()
-                for next_node in child.next_nodes:
-                    if isinstance(new_child, SkeletonNode):
-                        stack.append((next_node, new_actions.last_update_node))
-                    else:
-                        stack.append((next_node, new_child))
-                if not isinstance(new_child, SkeletonNode):
-                    new_actions.add_after(new_child, [parent])
+            registry = new_actions.name_registry
+            foreign = rhs_actions.name_registry is not registry
+            if rhs_actions.__overlaps(new_actions) or (foreign and any(name in registry for name in rhs_actions.__current_tables().nodes if name != "root")):
+                rhs_actions = rhs_actions.__copy(registry, {})
+                owned = rhs_actions.__owned
+                new_actions.__reserved = rhs_actions.__reserved
+                foreign = False
+            else:
+                owned = set()
+                rhs_actions.__owned = {id(rhs_actions.root_node)}
+                rhs_actions.__reserved = set()
+            rhs_tables = rhs_actions.__current_tables()
+            rhs_nodes = [node for node in rhs_tables.nodes.values() if node is not rhs_actions.root_node]
+            if new_actions.budget is not None:
+                new_actions.budget.charge(rhs_nodes, new_actions.depth)
+            if foreign:
+                registry.reserve_many(node.action_name for node in rhs_nodes)
+
+            tables = new_actions.__tables
+            new_actions._version = _tick()
+            for node in rhs_nodes:
+                tables.nodes[node.action_name] = node
+                tables.node_ids.add(id(node))
+            new_actions.__owned.update(id(node) for node in rhs_nodes if id(node) in owned)
+            tables.variable_init_nodes.extend(rhs_tables.variable_init_nodes)
+            new_actions.__link_all(new_actions.__last, rhs_actions.__successors(rhs_actions.root_node))
+            if rhs_actions.__last is not rhs_actions.root_node:
+                new_actions.__last = tables.nodes[rhs_actions.__last.action_name]
             return new_actions
         elif isinstance(rhs_actions, BaseAction):
-            new_actions = self.clone()
+            new_actions = self.__share()
             new_actions.append(rhs_actions.clone())
             return new_actions
         raise TypeError("Both operand must be instance of the Actions class or BaseAction")
 
+    def __overlaps(self, other: 'Actions') -> bool:
+        """
+        Checks whether this Actions instance has a node or an action name in common with another one.
+
+        Args:
+            other (Actions): The other Actions instance.
+
+        Returns:
+            bool: True if a node or a name is used by both instances.
+        """
+        other_nodes = other.__current_tables().nodes
+        for name, node in self.__current_tables().nodes.items():
+            if node is self.root_node:
+                continue
+            if id(node) in other.node_ids or name in other_nodes:
+                return True
+        return False
+
+    def topological_order(self) -> List[BaseAction]:
+        """
+        Returns the actions (excluding the root node) in an order where every action comes after the actions it
+        runs after. The dependencies are taken from the run-after conditions and the next nodes of each action.
+
+        Insertion order is kept whenever it is already valid, which is checked in a single pass. Otherwise the
+        actions are sorted with Kahn's algorithm, taking ready actions in insertion order, in O(V+E) time
+        (plus a logarithmic factor for the ordering of ready actions).
+
+        Returns:
+            List[BaseAction]: The sorted actions.
+
+        Raises:
+            ValueError: If an action runs after an action that is not in this Actions instance,
+                or if the dependencies form a cycle.
+        """
+        return self.__sort(self.__own_all().nodes)
+
+    def __sort(self, table: Dict[str, BaseAction]) -> List[BaseAction]:
+        """
+        Sorts the given nodes of this instance as described in `topological_order`, without copying shared nodes.
+        """
+        nodes = [node for node in table.values() if node is not self.root_node]
+        index_by_name = {node.action_name: index for index, node in enumerate(nodes)}
+        index_by_id = {id(node): index for index, node in enumerate(nodes)}
+        predecessors: List[Set[int]] = []
+        for node in nodes:
+            indexes = set()
+            for name in self.runafter_of(node):
+                index = index_by_name.get(name)
+                if index is None:
+                    raise ValueError(f"{node.action_name} runs after {name}, which is not in Actions")
+                indexes.add(index)
+            predecessors.append(indexes)
+        for index, node in enumerate(nodes):
+            for next_node in self.__successors(node):
+                next_index = index_by_id.get(id(next_node))
+                if next_index is None:
+                    raise ValueError(f"{next_node.action_name} follows {node.action_name} but is not in Actions")
+                predecessors[next_index].add(index)
+
+        if all(index < position for position, indexes in enumerate(predecessors) for index in indexes):
+            return nodes
+
+        followers: List[List[int]] = [[] for _ in nodes]
+        in_degree = [len(indexes) for indexes in predecessors]
+        for position, indexes in enumerate(predecessors):
+            for index in indexes:
+                followers[index].append(position)
+        ready = [position for position, degree in enumerate(in_degree) if degree == 0]
+        heapify(ready)
+        order = []
+        while ready:
+            position = heappop(ready)
+            order.append(nodes[position])
+            for follower in followers[position]:
+                in_degree[follower] -= 1
+                if in_degree[follower] == 0:
+                    heappush(ready, follower)
+
+        if len(order) < len(nodes):
+            cycle = self.__find_cycle(nodes, predecessors, in_degree)
+            raise ValueError(f"Actions contain a cycle: {' -> '.join(node.action_name for node in cycle)}")
+        return order
+
+    @staticmethod
+    def __find_cycle(nodes: List[BaseAction], predecessors: List[Set[int]], in_degree: List[int]) -> List[BaseAction]:
+        """
+        Finds a cycle among the actions that Kahn's algorithm could not sort. Each of them has an unsorted
+        predecessor, so walking predecessors from any of them must come back to an action already visited.
+
+        Args:
+            nodes (List[BaseAction]): The actions, in insertion order.
+            predecessors (List[Set[int]]): The predecessor indexes of each action.
+            in_degree (List[int]): The remaining in-degrees; unsorted actions have a positive in-degree.
+
+        Returns:
+            List[BaseAction]: The actions on the cycle in execution order, starting and ending with the same action.
+        """
+        position = next(position for position, degree in enumerate(in_degree) if degree > 0)
+        visited: Dict[int, int] = {}
+        path = []
+        while position not in visited:
+            visited[position] = len(path)
+            path.append(position)
+            position = min(index for index in predecessors[position] if in_degree[index] > 0)
+        cycle = path[visited[position]:] + [position]
+        return [nodes[index] for index in reversed(cycle)]
+
     def export(self) -> Dict:
         """
         Exports the Actions tree to a dictionary, excluding the root node.
+        Actions are emitted in topological order (see `topological_order`), so every action comes after the actions it runs after.
 
         Returns:
             Dict: A dictionary representation of all actions except the root.
+
+        Raises:
+            ValueError: If the actions contain a cycle or a run-after condition on an unknown action.
         """
-        d = {}
-        for node in self.nodes.values():
-            if isinstance(node, SkeletonNode):
-                continue
-            d[node.action_name] = node.export()
-        return d
+        return dict(self.iter_export())
+
+    def iter_export(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Exports the actions one at a time, in the order of `export`, so that they can be written without holding
+        the whole exported dictionary.
+
+        Returns:
+            Iterator[Tuple[str, Dict]]: The action names with the exported actions.
+
+        Raises:
+            ValueError: If the actions contain a cycle or a run-after condition on an unknown action.
+        """
+        caching = _caching_exports.get()
+        cache = self.__export_cache
+        if caching and cache is not None and not _changed_since((self,), cache[0]):
+            yield from cache[1]
+            return
+
+        items = [] if caching else None
+        for node in self.__sort(self.__current_tables().nodes):
+            exported = node.cached_export()
+            if items is not None:
+                items.append((node.action_name, exported))
+                if _deferred_actions.get() is not None:
+                    items = None
+            yield node.action_name, exported
+        if items is not None:
+            self.__export_cache = (_tick(), items)
 
 
 class RawActions:
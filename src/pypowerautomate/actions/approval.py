@@ -11,6 +11,8 @@ class StartAndWaitForAnApprovalAction(BaseAction):
         connection_host (dict): Static configuration detailing the API connection for approval actions.
     """
 
+    __slots__ = ("email", "title")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_approvals",
         "connectionName": "shared_approvals",
@@ -54,7 +56,7 @@ class StartAndWaitForAnApprovalAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -68,6 +70,8 @@ class WaitForAnApprovalAction(BaseAction):
         connection_host (dict): Static configuration detailing the API connection for approval actions.
     """
 
+    __slots__ = ("approval_name",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_approvals",
         "connectionName": "shared_approvals",
@@ -105,7 +109,7 @@ class WaitForAnApprovalAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -1,12 +1,18 @@
-from typing import Dict, Set, Union
-import uuid
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
 from copy import deepcopy
+from itertools import count
+from operator import attrgetter, is_
+
+from ..metadata import assign_id, current_allocator
 
 # Prevent Pylance from complaining about Actions not being imported with the lazy import.
 # Does not execute unless being type checked by a linter.
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .actions import Actions
+    from .limits import LimitBudget
 
 class State:
     """
@@ -26,19 +32,188 @@ class State:
     Waiting = "Waiting"
 
 
+# Shared run-after state lists. They are tuples so that every action can safely reference the same object.
+RUN_AFTER_SUCCEEDED = (State.Succeeded,)
+RUN_AFTER_FAILED = (State.Failed,)
+RUN_AFTER_ALWAYS = (State.Succeeded, State.Failed, State.Skipped, State.TimedOut)
+
+
+def run_after_states(force_exec: bool = False, exec_if_failed: bool = False) -> Tuple[str, ...]:
+    """
+    Returns the run-after states matching the execution flags used throughout the library.
+
+    Args:
+        force_exec (bool): If True, the action executes regardless of the parent's state, except where prohibited.
+        exec_if_failed (bool): If True, the action executes only if the parent action fails.
+
+    Returns:
+        Tuple[str, ...]: The run-after states.
+    """
+    if force_exec:
+        return RUN_AFTER_ALWAYS
+    elif exec_if_failed:
+        return RUN_AFTER_FAILED
+    return RUN_AFTER_SUCCEEDED
+
+
+_MISSING = object()
+_LINK_ATTRIBUTES = frozenset(["_runafter", "_next_nodes", "have_parent_node", "_budget", "_version", "_export_cache", "_allocation"])
+
+# A process-wide clock, advanced whenever an action is exported or marked as changed, or the links of an Actions
+# instance change. Cached exports stay valid while nothing they depend on has a later time. Advancing it is a
+# single call to a C iterator, so threads exporting or editing flows at the same time never get the same time.
+_clock = count(1)
+
+# Set in the deepcopy memo by `BaseAction._copy_for_write`, so that nested Actions are shared rather than copied.
+_SHARE_NESTED = object()
+
+# The nested Actions left unexported by `export_nested` while a JSON writer streams an action, or None.
+_deferred_actions: ContextVar[List['Actions']|None] = ContextVar("deferred_actions", default=None)
+
+
+# Whether exports are cached, while `cache_exports` is active.
+_caching_exports: ContextVar[bool] = ContextVar("caching_exports", default=False)
+
+
+@contextmanager
+def cache_exports() -> Iterator[None]:
+    """
+    Caches the exports of actions while the context is active (see `BaseAction.cached_export`), so that exporting
+    again only rebuilds the actions that changed. Flows created with `cache_exports=True` export inside it.
+
+    The exported dictionaries are then shared between exports and must not be modified, and parameters modified
+    in place are only exported again after `BaseAction.mark_dirty` is called.
+
+    Example:
+        with cache_exports():
+            for _ in range(10):
+                actions[-1].inputs = ...
+                exported = flow.export()
+    """
+    token = _caching_exports.set(True)
+    try:
+        yield
+    finally:
+        _caching_exports.reset(token)
+
+
+def _tick() -> int:
+    """
+    Advances the clock of changes.
+
+    Returns:
+        int: The new time.
+    """
+    return next(_clock)
+
+
+def _attribute_snapshot(action: 'BaseAction') -> Tuple:
+    """
+    Returns the values of the attributes that an action is exported from, to tell later whether one was reassigned.
+    """
+    getter = _snapshot_getters.get(type(action))
+    if getter is None:
+        getter = attrgetter("_runafter", *_copied_attributes(type(action)))
+        _snapshot_getters[type(action)] = getter
+    try:
+        return getter(action)
+    except AttributeError:
+        return tuple(getattr(action, name, _MISSING) for name in ("_runafter",) + _copied_attributes(type(action)))
+
+
+def _changed_since(objects: Iterable[Union['BaseAction', 'Actions']], stamp: int) -> bool:
+    """
+    Checks whether actions or Actions instances, or anything nested in them, changed after the given time:
+    an action was marked as changed or exported again, an attribute of an action was reassigned, the links
+    of an Actions instance changed, or the operationMetadataId of an action comes from another allocator.
+
+    Args:
+        objects (Iterable[BaseAction|Actions]): The actions and Actions instances.
+        stamp (int): The time.
+
+    Returns:
+        bool: True if something changed after the time.
+    """
+    allocator = current_allocator()
+    stack = list(objects)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, BaseAction):
+            nodes = (item,)
+            root_node = None
+        else:
+            if item._version > stamp:
+                return True
+            nodes = item._node_table().values()
+            root_node = item.root_node
+        for node in nodes:
+            cache = node._export_cache
+            if cache is None:
+                if node is root_node:
+                    continue
+                return True
+            if node._version > stamp or not all(map(is_, _attribute_snapshot(node), cache[1])):
+                return True
+            if node._allocation is not None and node._allocation[0] is not allocator:
+                return True
+            if cache[3]:
+                stack.extend(cache[3])
+    return False
+
+
+_copied_attributes_cache: Dict[type, Tuple[str, ...]] = {}
+_snapshot_getters: Dict[type, attrgetter] = {}
+
+
+def _copied_attributes(cls: type) -> Tuple[str, ...]:
+    """
+    Lists the slot attributes of an action class that are copied by `BaseAction.__deepcopy__`.
+
+    Args:
+        cls (type): The action class.
+
+    Returns:
+        Tuple[str, ...]: The names of the slots declared along the class hierarchy, excluding link information.
+    """
+    attributes = _copied_attributes_cache.get(cls)
+    if attributes is None:
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for name in slots:
+                if name not in _LINK_ATTRIBUTES and name not in ("__dict__", "__weakref__") and name not in names:
+                    names.append(name)
+        attributes = tuple(names)
+        _copied_attributes_cache[cls] = attributes
+    return attributes
+
+
 class BaseAction:
     """
     Defines a base class for creating action nodes in a workflow.
 
+    Actions use `__slots__` so that large generated flows stay compact. The run-after conditions and the next actions
+    are only allocated once the action is linked, and the run-after state lists are shared immutable tuples, which
+    are exported as lists.
+
     Attributes:
         action_name (str): The name of the action.
         type (str): The type of the action, defined in derived classes.
         runafter (Dict): A dictionary defining conditions under which this action should run after another action.
-        metadata (Dict): Metadata associated with the action.
-        next_nodes (Set[BaseAction]): A set of actions that follow this action.
+        metadata (Dict): Metadata associated with the action. Unless it is set explicitly, its operationMetadataId
+            is allocated when the metadata is read, by the current IdAllocator (see `pypowerautomate.metadata.assign_id`).
+        next_nodes (Tuple[BaseAction, ...]): The actions that follow this action.
         have_parent_node (bool): Flag indicating whether this action is a child of another action.
+
+    Inside `cache_exports`, exports are cached (see `cached_export`): an action is exported again once one of its
+    attributes was reassigned. Modifying a parameter in place, such as a dictionary, list, Condition or Expression
+    held by an attribute, is not detected; call `mark_dirty` afterwards.
     """
 
+    __slots__ = ("action_name", "type", "_metadata", "_allocation", "_runafter", "_next_nodes", "have_parent_node", "_budget", "_version", "_export_cache")
+
     def __init__(self, name: str):
         """
         Initializes the BaseAction with a specific name.
@@ -48,15 +223,109 @@ class BaseAction:
         """
         self.action_name: str = name
         self.type: str = ""
-        self.runafter: dict[str, list[str]] = {}
-        self.metadata: Dict = {}
-        self.next_nodes: Set[BaseAction] = set()
+        self._runafter: Dict[str, Sequence[str]]|None = None
+        self._metadata: Dict|None = None
+        self._allocation: Tuple|None = None
+        self._next_nodes: Tuple[BaseAction, ...] = ()
         self.have_parent_node: bool = False
-        self.metadata["operationMetadataId"] = uuid.uuid4().__str__()
+        # The LimitBudget counting this action, with its nesting level, estimated size and number of variables.
+        self._budget: Tuple['LimitBudget', int, int, int]|None = None
+        # The time of the last export or change, and the last export with the attributes and nested actions it was made from.
+        self._version: int = 0
+        self._export_cache: Tuple[int, Tuple, Dict, Tuple]|None = None
+
+    def mark_dirty(self):
+        """
+        Marks the action as changed, so that it is exported again, as well as the actions and Actions it is nested
+        in. Call it after modifying a parameter of the action in place.
+        """
+        self._version = _tick()
+
+    def cached_export(self) -> Dict:
+        """
+        Returns the export of the action. Inside `cache_exports`, the dictionary of the previous export is reused
+        while neither the action nor the actions nested in it changed since; it is shared between exports then and
+        must not be modified. Otherwise the action is simply exported.
+
+        While a JSON writer streams the action (see `pypowerautomate.serialization`), a valid cached export is
+        reused but no new export is cached, so that streaming does not keep the exported dictionaries in memory.
+
+        Returns:
+            Dict: The exported action.
+        """
+        if not _caching_exports.get():
+            return self.export()
+        cache = self._export_cache
+        if cache is not None and not _changed_since((self,), cache[0]):
+            return cache[2]
+        exported = self.export()
+        if _deferred_actions.get() is None:
+            self._version = _tick()
+            self._export_cache = (self._version, _attribute_snapshot(self), exported, tuple(self._exported_children()))
+        return exported
+
+    def _exported_children(self) -> Sequence[Union['BaseAction', 'Actions']]:
+        """
+        Returns the actions and Actions whose exports are part of the export of this action.
+        """
+        return self.get_child_actions()
+
+    @property
+    def metadata(self) -> Dict:
+        """
+        The metadata of this action. Unless it was set explicitly, the operationMetadataId is taken from the current
+        allocator when the metadata is read, and kept while the allocator and the action name are unchanged.
+        """
+        if self._metadata is None:
+            self._metadata = {}
+        metadata, self._allocation = assign_id(self._metadata, self._allocation, "actions", self.action_name)
+        self._metadata = metadata
+        return metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict):
+        self._metadata = metadata
+
+    @property
+    def runafter(self) -> Dict[str, Sequence[str]]:
+        """
+        The run-after conditions of this action, keyed by the names of the preceding actions.
+        The dictionary is only allocated when it is first read or assigned, and changes made to it are kept.
+        """
+        if self._runafter is None:
+            self._runafter = {}
+        return self._runafter
+
+    @runafter.setter
+    def runafter(self, runafter: Dict[str, Sequence[str]]):
+        self._runafter = runafter
+
+    def export_runafter(self) -> Dict[str, List[str]]:
+        """
+        Exports the run-after conditions of this action, with the states as lists, without allocating them.
+
+        Returns:
+            Dict[str, List[str]]: A new dictionary of the run-after conditions.
+        """
+        if not self._runafter:
+            return {}
+        return {name: list(states) for name, states in self._runafter.items()}
+
+    @property
+    def next_nodes(self) -> Tuple['BaseAction', ...]:
+        """
+        The actions that follow this action.
+        """
+        return self._next_nodes
+
+    @next_nodes.setter
+    def next_nodes(self, nodes: Iterable['BaseAction']):
+        self._next_nodes = tuple(nodes)
 
     def __deepcopy__(self, memo) -> 'BaseAction':
         """
-        Creates a deep copy of the current action, with a new UUID and reset link information.
+        Creates a deep copy of the current action, with reset link information.
+        The copy gets a new operationMetadataId when its metadata is next read, even if the ID was set explicitly.
 
         Args:
             memo (Dict): Memory map to manage deep copies and avoid circular references.
@@ -67,12 +336,25 @@ class BaseAction:
         cls = self.__class__
         new_instance = cls.__new__(cls)
         memo[id(self)] = new_instance
-        for k, v in self.__dict__.items():
-            setattr(new_instance, k, deepcopy(v, memo))
-        new_instance.metadata["operationMetadataId"] = str(uuid.uuid4())
-        new_instance.runafter = {}
-        new_instance.next_nodes = set()
+        for k in _copied_attributes(cls):
+            v = getattr(self, k, _MISSING)
+            if v is not _MISSING:
+                setattr(new_instance, k, deepcopy(v, memo))
+        if hasattr(self, "__dict__"):
+            for k, v in self.__dict__.items():
+                setattr(new_instance, k, deepcopy(v, memo))
+        if memo.get(id(_SHARE_NESTED)) is _SHARE_NESTED:
+            new_instance._allocation = self._allocation
+        else:
+            if new_instance._metadata is not None:
+                new_instance._metadata.pop("operationMetadataId", None)
+            new_instance._allocation = None
+        new_instance._runafter = None
+        new_instance._next_nodes = ()
         new_instance.have_parent_node = False
+        new_instance._budget = None
+        new_instance._version = 0
+        new_instance._export_cache = None
         return new_instance
 
     def clone(self) -> 'BaseAction':
@@ -84,14 +366,35 @@ class BaseAction:
         """
         return deepcopy(self)
 
+    def _copy_for_write(self) -> 'BaseAction':
+        """
+        Copies the action for an Actions instance that shares it with other Actions instances, before the action is
+        modified or handed out through that instance (see `Actions`). Unlike `clone`, the copy keeps the name, the
+        operationMetadataId, the links and the budget of the action, so that it exports the same, and its nested
+        Actions share their actions with those of the original until either side modifies them.
+
+        Returns:
+            BaseAction: The copy.
+        """
+        new_instance = deepcopy(self, {id(_SHARE_NESTED): _SHARE_NESTED})
+        new_instance._runafter = dict(self._runafter) if self._runafter is not None else None
+        new_instance._next_nodes = self._next_nodes
+        new_instance.have_parent_node = self.have_parent_node
+        new_instance._budget = self._budget
+        new_instance._version = _tick()
+        return new_instance
+
     def add_next_action(self, node: 'BaseAction'):
         """
-        Adds an action to the set of next actions.
+        Adds an action to the next actions, unless it is already one of them.
 
         Args:
             node (BaseAction): The action to add as a next action.
         """
-        self.next_nodes.add(node)
+        for next_node in self._next_nodes:
+            if next_node is node:
+                return
+        self._next_nodes += (node,)
 
     def update_runafter(self, parent_node: 'BaseAction', force_exec: bool = False, exec_if_failed: bool = False):
         """
@@ -102,15 +405,39 @@ class BaseAction:
             force_exec (bool): If True, the action will execute regardless of the parent's state, except where prohibited.
             exec_if_failed (bool): If True, the action will execute if the parent action fails.
         """
-        state_list = [State.Succeeded]
-        if force_exec:
-            state_list = [State.Succeeded, State.Failed, State.Skipped, State.TimedOut]
-        elif exec_if_failed:
-            state_list = [State.Failed]
+        state_list = run_after_states(force_exec, exec_if_failed)
         if not isinstance(parent_node, SkeletonNode):
         #     self.runafter = {}
         # else:
-            self.runafter[parent_node.action_name] = state_list
+            if self._runafter is None:
+                self._runafter = {}
+            self._runafter[parent_node.action_name] = state_list
+            self.mark_dirty()
+
+    def get_child_actions(self) -> Sequence['Actions']:
+        """
+        Returns the nested Actions of this action, such as the branches of an If statement or the body of a loop.
+        Actions without nested Actions return an empty sequence.
+
+        Returns:
+            Sequence[Actions]: The nested Actions.
+        """
+        return ()
+
+    def _replace_child_actions(self, old: 'Actions|None', new: 'Actions|None'):
+        """
+        Updates the limit budget of the flow, if this action is counted in one, before nested Actions are replaced.
+        Statements call it from the methods that set their nested Actions.
+
+        Args:
+            old (Actions|None): The nested Actions being replaced.
+            new (Actions|None): The new nested Actions.
+
+        Raises:
+            ValueError: If a limit of the flow would be exceeded.
+        """
+        if self._budget is not None:
+            self._budget[0].replace_child_actions(self, old, new)
 
     def export(self) -> Dict:
         """
@@ -133,22 +460,13 @@ class BaseAction:
         """
         from .actions import Actions  # Lazy Import(to avoid circular import)
         if isinstance(rhs_actions, Actions):
-            new_actions = Actions(rhs_actions.is_root_actions)
+            new_actions = Actions(rhs_actions.is_root_actions, rhs_actions.name_registry)
             new_actions.append(self)
-            stack: list[tuple[BaseAction|SkeletonNode, BaseAction|SkeletonNode|None]] = [(rhs_actions.root_node, None)]
-            while stack:
-                child, parent = stack.pop()
-                new_child = child.clone()
-                for next_node in child.next_nodes:
-                    stack.append((next_node, new_child if not isinstance(new_child, SkeletonNode) else new_actions.last_update_node))
-                if not isinstance(new_child, SkeletonNode):
-                    new_actions.add_after(new_child, [parent])
-            return new_actions
+            return new_actions + rhs_actions
         elif isinstance(rhs_actions, BaseAction):
             new_actions = Actions()
             new_actions.append(self.clone())
-            new_actions.append(rhs_actions.clone())
-            return new_actions
+            return new_actions + rhs_actions
 
     def __repr__(self) -> str:
         """
@@ -169,6 +487,8 @@ class SkeletonNode(BaseAction):
         Inherits all attributes from BaseAction.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str):
         """
         Initializes the SkeletonNode with a specific name, primarily used as a root node.
@@ -16,6 +16,8 @@ class SelectAction(BaseAction):
     Defines a selection action similar to the `map` function, transforming an input array or list into a new structure based on specified key-value pairs.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, inputs: List | str|Expression, key: str|Expression|None = None, value: str|Expression|None = None, select: str|Expression|None = None):
         """
         Initializes a new instance of SelectAction.
@@ -46,7 +48,7 @@ class SelectAction(BaseAction):
         Returns:
             Dict: A dictionary containing the configuration of this action.
         """
-        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.runafter, "inputs": self.inputs}
+        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.export_runafter(), "inputs": self.inputs}
         return d
 
 
@@ -55,6 +57,8 @@ class CreateTableAction(BaseAction):
     Defines an action to create a table from an array of dictionaries or an expression that evaluates to such an array, formatted as CSV or HTML.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, inputs: List[Dict] | str|Expression, format: str|Expression):
         """
         Initializes a new instance of CreateTableAction.
@@ -79,7 +83,7 @@ class CreateTableAction(BaseAction):
         Returns:
             Dict: A dictionary containing the configuration of this action.
         """
-        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.runafter, "inputs": self.inputs}
+        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.export_runafter(), "inputs": self.inputs}
         return d
 
 
@@ -88,6 +92,8 @@ class ComposeAction(BaseAction):
     Defines an action to compose data into a specified structure, typically used for constructing new data objects.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, inputs: List | Dict | str|Expression):
         """
         Initializes a new instance of ComposeAction.
@@ -109,7 +115,7 @@ class ComposeAction(BaseAction):
         Returns:
             Dict: A dictionary containing the configuration of this action.
         """
-        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.runafter, "inputs": self.inputs}
+        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.export_runafter(), "inputs": self.inputs}
         return d
 
 
@@ -118,6 +124,8 @@ class FilterArrayAction(BaseAction):
     Defines an action to filter elements of an array based on a specified condition, similar to the `filter` function.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, inputs: List | str|Expression, where: str|Expression):
         """
         Initializes a new instance of FilterArrayAction.
@@ -142,7 +150,7 @@ class FilterArrayAction(BaseAction):
         Returns:
             Dict: A dictionary containing the configuration of this action.
         """
-        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.runafter, "inputs": self.inputs}
+        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.export_runafter(), "inputs": self.inputs}
         return d
 
 
@@ -151,6 +159,8 @@ class JoinAction(BaseAction):
     Defines an action to concatenate elements of an array into a single string, separated by a specified delimiter.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, inputs: List | str|Expression, join_with: str|Expression):
         """
         Initializes a new instance of JoinAction.
@@ -175,7 +185,7 @@ class JoinAction(BaseAction):
         Returns:
             Dict: A dictionary containing the configuration of this action.
         """
-        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.runafter, "inputs": self.inputs}
+        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.export_runafter(), "inputs": self.inputs}
         return d
 
 
@@ -184,6 +194,8 @@ class ParseJSONAction(BaseAction):
     Defines an action to parse JSON based on a given schema
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, content: str|Expression, schema: dict):
         """
         Initializes a new instance of ParseJSON.
@@ -206,5 +218,5 @@ class ParseJSONAction(BaseAction):
         Returns:
             Dict: A dictionary containing the configuration of this action.
         """
-        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.runafter, "inputs": self.inputs}
+        d = {"metadata": self.metadata, "type": self.type, "runAfter": self.export_runafter(), "inputs": self.inputs}
         return d
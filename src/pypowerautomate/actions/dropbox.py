@@ -2,6 +2,7 @@ from typing import Dict
 
 from .expression import Expression
 from .base import BaseAction
+from .pagination import PaginatedAction
 
 
 class DropboxCreateFileAction(BaseAction):
@@ -15,6 +16,8 @@ class DropboxCreateFileAction(BaseAction):
         body (str): The content to be written to the file.
     """
 
+    __slots__ = ("folderPath", "filename", "body")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -45,7 +48,7 @@ class DropboxCreateFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
         return d
 
@@ -59,6 +62,8 @@ class DropboxGetFileContentAction(BaseAction):
         inferContentType (bool): Whether to infer the content type of the file. Defaults to True.
     """
 
+    __slots__ = ("id", "inferContentType")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -85,7 +90,7 @@ class DropboxGetFileContentAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
         return d
 
@@ -99,6 +104,8 @@ class DropboxUpdateFileAction(BaseAction):
         body (str): The new content to be written to the file.
     """
 
+    __slots__ = ("id", "body")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -125,11 +132,11 @@ class DropboxUpdateFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
         return d
 
-class DropboxListFilesInFolderAction(BaseAction):
+class DropboxListFilesInFolderAction(PaginatedAction):
     """
     Defines an Action to list the files in a Dropbox folder.
 
@@ -138,6 +145,8 @@ class DropboxListFilesInFolderAction(BaseAction):
         id (str): The ID of the folder to list files in.
     """
 
+    __slots__ = ("id",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -160,9 +169,9 @@ class DropboxListFilesInFolderAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
-        return d
+        return self.export_pagination(d)
 
 
 class DropboxListFilesInRootFolderAction(BaseAction):
@@ -173,6 +182,8 @@ class DropboxListFilesInRootFolderAction(BaseAction):
         name (str): The name of the action.
     """
 
+    __slots__ = ()
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -193,7 +204,7 @@ class DropboxListFilesInRootFolderAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -210,6 +221,8 @@ class DropboxCopyFileAction(BaseAction):
         overwrite (bool): Whether to overwrite the destination file if it already exists. Defaults to False.
     """
 
+    __slots__ = ("source", "destination", "overwrite")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -241,7 +254,7 @@ class DropboxCopyFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -256,6 +269,8 @@ class DropboxDeleteFileAction(BaseAction):
         id (str): The ID of the file to delete.
     """
 
+    __slots__ = ("id",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -281,7 +296,7 @@ class DropboxDeleteFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -296,6 +311,8 @@ class DropboxGetFileMetadataAction(BaseAction):
         id (str): The ID of the file to retrieve metadata for.
     """
 
+    __slots__ = ("id",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -321,7 +338,7 @@ class DropboxGetFileMetadataAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -338,6 +355,8 @@ class DropboxExtractArchiveToFolderAction(BaseAction):
         overwrite (bool): Whether to overwrite existing files in the destination folder. Defaults to False.
     """
 
+    __slots__ = ("source", "destination", "overwrite")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -371,7 +390,7 @@ class DropboxExtractArchiveToFolderAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -387,6 +406,8 @@ class DropboxGetFileContentUsingPathAction(BaseAction):
         inferContentType (bool): Whether to infer the content type of the file. Defaults to True.
     """
 
+    __slots__ = ("path", "inferContentType")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -416,7 +437,7 @@ class DropboxGetFileContentUsingPathAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -431,6 +452,8 @@ class DropboxGetFileMetadataUsingPathAction(BaseAction):
         path (str): The path of the file to retrieve the metadata for.
     """
 
+    __slots__ = ("path",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_dropbox",
         "connectionName": "shared_dropbox",
@@ -456,7 +479,7 @@ class DropboxGetFileMetadataUsingPathAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import Dict, cast
 
 from .expression import Expression
 from .base import BaseAction
+from .pagination import PaginatedAction
 
 class DATETIME_FORMAT(str, Enum):
     serial_number = "Serial Number"
@@ -11,6 +12,8 @@ class DATETIME_FORMAT(str, Enum):
 # DATETIME_FORMAT = set([None, "Serial Number", "ISO 8601"])
 
 class ExcelOnlineGetTables(BaseAction):
+    __slots__ = ("location", "documentLibrary", "file")
+
     connection_host = {
         "connectionName": "shared_excelonlinebusiness",
         "operationId": "GetTables",
@@ -64,12 +67,14 @@ class ExcelOnlineGetTables(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 class ExcelOnlineGetRow(BaseAction):
+    __slots__ = ("location", "documentLibrary", "file", "table", "keyColumn", "keyValue", "dateTimeFormat")
+
     connection_host = {
         "connectionName": "shared_excelonlinebusiness",
         "operationId": "GetItem",
@@ -150,12 +155,14 @@ class ExcelOnlineGetRow(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
-class ExcelOnlineListRows(BaseAction):
+class ExcelOnlineListRows(PaginatedAction):
+    __slots__ = ("location", "documentLibrary", "file", "table", "filterQuery", "orderBy", "top", "skip", "select", "dateTimeFormat")
+
     connection_host = {
         "connectionName": "shared_excelonlinebusiness",
         "operationId": "GetItems",
@@ -239,6 +246,9 @@ class ExcelOnlineListRows(BaseAction):
         parameters["file"] = self.file
         parameters["table"] = self.table
 
+        if self.filterQuery:
+            parameters["$filter"] = self.filterQuery
+
         if self.orderBy:
             parameters["$orderby"] = self.orderBy
 
@@ -254,13 +264,13 @@ class ExcelOnlineListRows(BaseAction):
         if self.dateTimeFormat:
             parameters["dateTimeFormat"] = self.dateTimeFormat
 
-        inputs["host"] = ExcelOnlineGetTables.connection_host
+        inputs["host"] = ExcelOnlineListRows.connection_host
         inputs["parameters"] = parameters
 
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
-        return d
\ No newline at end of file
+        return self.export_pagination(d)
\ No newline at end of file
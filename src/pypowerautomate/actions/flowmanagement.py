@@ -11,6 +11,9 @@ class CreateFlowAction(BaseAction):
     Attributes:
         connection_host (dict): Predefined connection details for Microsoft PowerApps flow management API.
     """
+
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_flowmanagement",
         "connectionName": "shared_flowmanagement",
@@ -46,6 +49,7 @@ class CreateFlowAction(BaseAction):
         self.parameters["Flow/properties/state"] = "Started"
         self.parameters["Flow/properties/connectionReferences"] = connection_ref.export()
         self.inputs["parameters"] = self.parameters
+        self.mark_dirty()
 
     def export(self) -> Dict:
         """
@@ -57,7 +61,7 @@ class CreateFlowAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -69,6 +73,9 @@ class DeleteFlowAction(BaseAction):
     Attributes:
         connection_host (dict): Predefined connection details for Microsoft PowerApps flow management API.
     """
+
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_flowmanagement",
         "connectionName": "shared_flowmanagement",
@@ -101,7 +108,7 @@ class DeleteFlowAction(BaseAction):
         """
         d = {}
         d["metadata"] = self.metadata
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["type"] = self.type
         d["inputs"] = self.inputs
         return d
@@ -114,6 +121,9 @@ class ListConnectionsAction(BaseAction):
     Attributes:
         connection_host (dict): Predefined connection details for Microsoft PowerApps flow management API.
     """
+
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_flowmanagement",
         "connectionName": "shared_flowmanagement",
@@ -145,7 +155,7 @@ class ListConnectionsAction(BaseAction):
         """
         d = {}
         d["metadata"] = self.metadata
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["type"] = self.type
         d["inputs"] = self.inputs
         return d
@@ -158,6 +168,9 @@ class ListUserEnvironmentsAction(BaseAction):
     Attributes:
         connection_host (dict): Predefined connection details for Microsoft PowerApps flow management API.
     """
+
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_flowmanagement",
         "connectionName": "shared_flowmanagement",
@@ -185,7 +198,7 @@ class ListUserEnvironmentsAction(BaseAction):
         """
         d = {}
         d["metadata"] = self.metadata
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["type"] = self.type
         d["inputs"] = self.inputs
         return d
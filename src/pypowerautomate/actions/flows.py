@@ -4,11 +4,19 @@ from .expression import Expression
 
 from ..triggers import ManualTrigger
 
-from ..package import Package
 from .base import BaseAction
 
+# Prevent Pylance from complaining about Package not being imported with the lazy import.
+# Does not execute unless being type checked by a linter.
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..package import Package
+
 class FlowRunChildAction(BaseAction):
-    def __init__(self, name: str, child: Package|str|Expression, *args):
+    __slots__ = ("name", "body", "host")
+
+    def __init__(self, name: str, child: 'Package|str|Expression', *args):
+        from ..package import Package  # Lazy Import(to avoid circular import)
         super().__init__(name)
 
         self.name = name
@@ -34,6 +42,7 @@ class FlowRunChildAction(BaseAction):
             parameter = parameter.export()
 
         self.body[name] = parameter
+        self.mark_dirty()
 
     def export(self) -> Dict:
         d = {}
@@ -16,6 +16,9 @@ class HttpAction(BaseAction):
     Attributes:
         METHODS (set): Valid HTTP methods for the action.
     """
+
+    __slots__ = ("method", "uri", "queries", "body", "headers", "cookie")
+
     # Todo: Cookie handling
     # Todo: HTTP response handling
 
@@ -112,7 +115,7 @@ class HttpAction(BaseAction):
             inputs["queries"] = self.queries
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -0,0 +1,296 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from .base import BaseAction, _copied_attributes
+from .condition import Condition
+from .expression import Expression
+
+# Prevent Pylance from complaining about Actions not being imported with the lazy import.
+# Does not execute unless being type checked by a linter.
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .actions import Actions
+
+# Estimated bytes taken in the exported definition by the name, metadata, type and runAfter keys of an action.
+ACTION_SIZE_OVERHEAD = 128
+
+# Attributes that are not exported as parameters of the action.
+_UNMEASURED_ATTRIBUTES = frozenset(["action_name", "type", "_metadata"])
+_measured_attributes_cache: Dict[type, Tuple[str, ...]] = {}
+
+
+class PlatformLimits:
+    """
+    The Power Automate limits that a flow definition is checked against while it is generated.
+    The defaults are the documented limits of the platform; lower them to keep a safety margin.
+
+    Attributes:
+        max_actions (int): The number of actions in the flow, including nested actions.
+        max_nesting_depth (int): The number of If, Switch, Foreach, Until and Scope actions an action can be nested in.
+        max_variables (int): The number of variables initialized in the flow.
+        max_expression_length (int): The number of characters of a single expression.
+        max_definition_size (int): The estimated size of the flow definition, in bytes.
+    """
+
+    __slots__ = ("max_actions", "max_nesting_depth", "max_variables", "max_expression_length", "max_definition_size")
+
+    def __init__(self, max_actions: int = 500, max_nesting_depth: int = 8, max_variables: int = 250, max_expression_length: int = 8192, max_definition_size: int = 1048576):
+        self.max_actions: int = max_actions
+        self.max_nesting_depth: int = max_nesting_depth
+        self.max_variables: int = max_variables
+        self.max_expression_length: int = max_expression_length
+        self.max_definition_size: int = max_definition_size
+
+
+class LimitBudget:
+    """
+    Running counters of a flow definition, checked against PlatformLimits every time actions are added, so that a
+    flow exceeding the limits fails while it is generated rather than when it is imported.
+
+    A budget is attached to the root Actions of a flow (see `Flow` and `Actions.set_budget`). Actions nested in
+    the If, Switch, Foreach, Until and Scope actions of a budgeted Actions join the budget too, including nested
+    actions set afterwards. Each action is measured once, when it joins the budget, from its own parameters, so
+    the cost of an update does not depend on the size of the flow. Changes made to the parameters of an action
+    after it was added are not measured.
+
+    Attributes:
+        limits (PlatformLimits): The limits.
+        action_count (int): The number of actions.
+        variable_count (int): The number of initialized variables.
+        definition_size (int): The estimated size of the definition, in bytes.
+        max_depth (int): The deepest nesting seen, as the number of actions an action is nested in.
+        longest_expression (int): The length of the longest expression seen.
+    """
+
+    __slots__ = ("limits", "action_count", "variable_count", "definition_size", "max_depth", "longest_expression")
+
+    def __init__(self, limits: PlatformLimits|None = None):
+        """
+        Initializes an empty budget.
+
+        Args:
+            limits (PlatformLimits, optional): The limits. Defaults to the platform limits.
+        """
+        self.limits: PlatformLimits = limits if limits is not None else PlatformLimits()
+        self.action_count: int = 0
+        self.variable_count: int = 0
+        self.definition_size: int = 0
+        self.max_depth: int = 0
+        self.longest_expression: int = 0
+
+    def charge(self, nodes: Iterable[BaseAction], depth: int):
+        """
+        Adds actions, with the actions nested in them, to the counters. Actions that are already counted are skipped.
+        Either all the actions are added or, if a limit would be exceeded, none is.
+
+        Args:
+            nodes (Iterable[BaseAction]): The actions.
+            depth (int): The nesting level of the Actions that holds them, 1 for the top level.
+
+        Raises:
+            ValueError: If a limit would be exceeded.
+        """
+        pending, adopted, longest = self.__measure(nodes, depth)
+        self.__commit(pending, adopted, [], [], longest)
+
+    def release(self, node: BaseAction, keep: Set[int] = frozenset()):
+        """
+        Removes an action, with the actions nested in it, from the counters.
+
+        Args:
+            node (BaseAction): The action.
+            keep (Set[int]): The ids of nested actions that stay in the flow, with the actions nested in them.
+        """
+        released = self.__charged(node, keep)
+        self.__commit([], [], released, [child for node in released for child in node.get_child_actions() if child.budget is self], 0)
+
+    def replace_child_actions(self, container: BaseAction, old: 'Actions|None', new: 'Actions|None'):
+        """
+        Updates the counters when the nested actions of a counted action are replaced.
+
+        Args:
+            container (BaseAction): The If, Switch, Foreach, Until or Scope action.
+            old (Actions|None): The nested actions being replaced.
+            new (Actions|None): The new nested actions.
+
+        Raises:
+            ValueError: If a limit would be exceeded. The counters are then unchanged.
+        """
+        if container._budget is None or container._budget[0] is not self or old is new:
+            return
+        depth = container._budget[1] + 1
+        released = self.__charged_actions(old) if old is not None else []
+        pending, adopted, longest = self.__measure(self.__nodes_of(new) if new is not None else [], depth)
+        if new is not None:
+            adopted.append((new, depth))
+        if old is not None and old.budget is self:
+            released_actions = [old]
+        else:
+            released_actions = []
+        self.__commit(pending, adopted, released, released_actions, longest)
+
+    def export(self) -> Dict:
+        """
+        Exports the counters and the limits.
+
+        Returns:
+            Dict: The counters, each with its limit.
+        """
+        limits = self.limits
+        return {
+            "actions": {"count": self.action_count, "limit": limits.max_actions},
+            "nesting_depth": {"count": self.max_depth, "limit": limits.max_nesting_depth},
+            "variables": {"count": self.variable_count, "limit": limits.max_variables},
+            "expression_length": {"count": self.longest_expression, "limit": limits.max_expression_length},
+            "definition_size": {"count": self.definition_size, "limit": limits.max_definition_size},
+        }
+
+    @staticmethod
+    def __nodes_of(actions: 'Actions') -> List[BaseAction]:
+        return [node for node in actions._node_table().values() if node is not actions.root_node]
+
+    def __charged_actions(self, actions: 'Actions') -> List[BaseAction]:
+        return [released for node in self.__nodes_of(actions) for released in self.__charged(node, frozenset())]
+
+    def __charged(self, node: BaseAction, keep: Set[int]) -> List[BaseAction]:
+        """
+        Lists an action and the actions nested in it that are counted in this budget, skipping the kept ones.
+        """
+        charged = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if id(node) in keep or node._budget is None or node._budget[0] is not self:
+                continue
+            charged.append(node)
+            for child in node.get_child_actions():
+                stack.extend(self.__nodes_of(child))
+        return charged
+
+    def __measure(self, nodes: Iterable[BaseAction], depth: int) -> Tuple[List[Tuple[BaseAction, int, int, int]], List[Tuple['Actions', int]], int]:
+        """
+        Measures actions that are not counted yet, with the actions nested in them. The counters are not changed.
+
+        Returns:
+            Tuple: The measured actions with their depth, size and number of variables, the nested Actions with
+                their depth, and the length of the longest expression of the measured actions.
+
+        Raises:
+            ValueError: If an expression is too long.
+        """
+        pending = []
+        adopted = []
+        longest = 0
+        stack = [(node, depth) for node in nodes]
+        while stack:
+            node, node_depth = stack.pop()
+            if node._budget is not None and node._budget[0] is self:
+                continue
+            size, variables, expression_length = self.__measure_node(node)
+            pending.append((node, node_depth, size, variables))
+            if expression_length > longest:
+                longest = expression_length
+            for child in node.get_child_actions():
+                adopted.append((child, node_depth + 1))
+                stack.extend((child_node, node_depth + 1) for child_node in self.__nodes_of(child))
+        return pending, adopted, longest
+
+    def __measure_node(self, node: BaseAction) -> Tuple[int, int, int]:
+        """
+        Estimates the exported size of an action, not including the actions nested in it, and checks its expressions.
+
+        Returns:
+            Tuple[int, int, int]: The size in bytes, the number of variables the action initializes and the length
+                of its longest expression.
+
+        Raises:
+            ValueError: If an expression is too long.
+        """
+        size = ACTION_SIZE_OVERHEAD + len(node.action_name) + len(node.type)
+        longest = 0
+        max_length = self.limits.max_expression_length
+        stack = [getattr(node, name, None) for name in _measured_attributes(type(node))]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, str):
+                size += len(value) + 2
+                if value.startswith("@") or "@{" in value:
+                    if len(value) > max_length:
+                        raise ValueError(f"An expression of {node.action_name} has {len(value)} characters, more than the limit of {max_length}")
+                    if len(value) > longest:
+                        longest = len(value)
+            elif isinstance(value, dict):
+                stack.extend(value.keys())
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                stack.extend(value)
+            elif isinstance(value, (Expression, Condition)):
+                stack.append(value.export())
+            elif value is not None and not isinstance(value, BaseAction):
+                definition = getattr(value, "definition", None)  # RawActions
+                if isinstance(definition, dict):
+                    stack.append(definition)
+                elif not hasattr(value, "root_node"):  # Actions are measured action by action
+                    size += len(str(value))
+
+        variables = 0
+        if node.type == "InitializeVariable":
+            variables = len(getattr(node, "inputs", {}).get("variables", []))
+        return size, variables, longest
+
+    def __commit(self, pending: List[Tuple[BaseAction, int, int, int]], adopted: List[Tuple['Actions', int]], released: List[BaseAction], released_actions: List['Actions'], longest: int):
+        """
+        Checks the limits and applies the changes, or raises without changing anything.
+        `longest` is the length of the longest expression of the pending actions.
+
+        Raises:
+            ValueError: If a limit would be exceeded.
+        """
+        limits = self.limits
+        action_count = self.action_count + len(pending) - len(released)
+        variable_count = self.variable_count
+        definition_size = self.definition_size
+        deepest = 0
+        for node, depth, size, variables in pending:
+            variable_count += variables
+            definition_size += size
+            if depth > deepest:
+                deepest = depth
+                if depth - 1 > limits.max_nesting_depth:
+                    raise ValueError(f"{node.action_name} would be nested in {depth - 1} actions, more than the limit of {limits.max_nesting_depth}")
+        for node in released:
+            variable_count -= node._budget[3]
+            definition_size -= node._budget[2]
+        if action_count > limits.max_actions:
+            raise ValueError(f"The flow would have {action_count} actions, more than the limit of {limits.max_actions}")
+        if variable_count > limits.max_variables:
+            raise ValueError(f"The flow would have {variable_count} variables, more than the limit of {limits.max_variables}")
+        if definition_size > limits.max_definition_size:
+            raise ValueError(f"The flow definition would take about {definition_size} bytes, more than the limit of {limits.max_definition_size}")
+
+        for node in released:
+            node._budget = None
+        for actions in released_actions:
+            actions.budget = None
+        for node, depth, size, variables in pending:
+            node._budget = (self, depth, size, variables)
+        for actions, depth in adopted:
+            actions.budget = self
+            actions.depth = depth
+        if deepest - 1 > self.max_depth:
+            self.max_depth = deepest - 1
+        if longest > self.longest_expression:
+            self.longest_expression = longest
+        self.action_count = action_count
+        self.variable_count = variable_count
+        self.definition_size = definition_size
+
+
+def _measured_attributes(cls: type) -> Tuple[str, ...]:
+    """
+    Lists the attributes of an action class that hold its exported parameters.
+    """
+    attributes = _measured_attributes_cache.get(cls)
+    if attributes is None:
+        attributes = tuple(name for name in _copied_attributes(cls) if name not in _UNMEASURED_ATTRIBUTES)
+        _measured_attributes_cache[cls] = attributes
+    return attributes
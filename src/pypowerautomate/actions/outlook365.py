@@ -2,9 +2,12 @@ from typing import Dict, cast
 
 from .expression import Expression
 from .base import BaseAction
+from .pagination import PaginatedAction
 
 
 class Outlook365SendAnEmailV2(BaseAction):
+    __slots__ = ("to", "subject", "body", "importance")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -43,13 +46,15 @@ class Outlook365SendAnEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365DeleteEmailV2(BaseAction):
+    __slots__ = ("messageid",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -73,13 +78,15 @@ class Outlook365DeleteEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365ExportEmailV2(BaseAction):
+    __slots__ = ("messageid",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -103,13 +110,15 @@ class Outlook365ExportEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365FindMeetingTimesV2(BaseAction):
+    __slots__ = ("activitydomain",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -133,13 +142,15 @@ class Outlook365FindMeetingTimesV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365FlagEmailV2(BaseAction):
+    __slots__ = ("messageid", "flagstatus")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -165,13 +176,15 @@ class Outlook365FlagEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365ForwardAnEmailV2(BaseAction):
+    __slots__ = ("message_id", "torecipients")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -197,13 +210,15 @@ class Outlook365ForwardAnEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365GetAttachmentV2(BaseAction):
+    __slots__ = ("messageid", "attachmentid")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -229,13 +244,15 @@ class Outlook365GetAttachmentV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365GetCalendarViewOfEventsV3(BaseAction):
+    __slots__ = ("calendarid", "startdatetimeutc", "enddatetimeutc")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -263,13 +280,15 @@ class Outlook365GetCalendarViewOfEventsV3(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365GetCalendarsV2(BaseAction):
+    __slots__ = ()
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -290,13 +309,15 @@ class Outlook365GetCalendarsV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365GetEmailV2(BaseAction):
+    __slots__ = ("messageid", "includeattachments")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -322,13 +343,15 @@ class Outlook365GetEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
-class Outlook365GetEmailsV3(BaseAction):
+class Outlook365GetEmailsV3(PaginatedAction):
+    __slots__ = ("folderpath", "to_email", "from_email", "fetch_only_unread", "mailbox_address", "include_attachments", "search_query", "top", "cc", "to_or_cc", "importance", "fetch_only_with_attachment", "subject_filter")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -404,13 +427,15 @@ class Outlook365GetEmailsV3(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
-        return d
+        return self.export_pagination(d)
 
 
 class Outlook365MarkAsReadOrUnreadV3(BaseAction):
+    __slots__ = ("messageid",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -434,13 +459,15 @@ class Outlook365MarkAsReadOrUnreadV3(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365MoveEmailV2(BaseAction):
+    __slots__ = ("messageid", "folderpath", "mailbox_address")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -476,13 +503,15 @@ class Outlook365MoveEmailV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365ReplyToEmailV3(BaseAction):
+    __slots__ = ("messageid", "body")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -508,13 +537,15 @@ class Outlook365ReplyToEmailV3(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365SendEmailWithOptions(BaseAction):
+    __slots__ = ("to", "subject", "options", "importance", "hidehtmlmessage", "showhtmlconfirmationdialog", "hidemicrosoftfooter")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -550,13 +581,15 @@ class Outlook365SendEmailWithOptions(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class Outlook365SetUpAutomaticRepliesV2(BaseAction):
+    __slots__ = ("status", "externalaudience")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_office365",
         "connectionName": "shared_office365",
@@ -582,7 +615,7 @@ class Outlook365SetUpAutomaticRepliesV2(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -0,0 +1,66 @@
+from typing import Dict
+
+from .base import BaseAction
+
+# The largest pagination threshold of the platform, for flows on the Medium or High performance profile (premium
+# licenses). Flows on the Low profile are capped at LOW_PROFILE_PAGINATION_THRESHOLD.
+MAX_PAGINATION_THRESHOLD = 100000
+LOW_PROFILE_PAGINATION_THRESHOLD = 5000
+
+
+class PaginatedAction(BaseAction):
+    """
+    Base class for list-style connector actions that support the pagination policy.
+
+    Without pagination, these actions only return the first page of results. With pagination, the platform keeps
+    fetching pages until at least `minimum_item_count` items (the "Threshold" setting of the designer) were
+    retrieved or there are no more pages, so large lists are read by a single action instead of a paging loop.
+
+    Attributes:
+        max_pagination_threshold (int): The largest threshold accepted by the connector. Subclasses lower it for
+            connectors with a lower cap. The effective limit also depends on the license of the flow owner
+            (see `LOW_PROFILE_PAGINATION_THRESHOLD`).
+        pagination_threshold (int|None): The pagination threshold, or None if pagination is off.
+    """
+
+    __slots__ = ("pagination_threshold",)
+
+    max_pagination_threshold: int = MAX_PAGINATION_THRESHOLD
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.pagination_threshold: int|None = None
+
+    def set_pagination(self, minimum_item_count: int):
+        """
+        Turns pagination on.
+
+        Args:
+            minimum_item_count (int): The number of items to retrieve at least, from 1 to `max_pagination_threshold`.
+
+        Raises:
+            ValueError: If the item count is not an integer in the accepted range.
+        """
+        if isinstance(minimum_item_count, bool) or not isinstance(minimum_item_count, int) or not 1 <= minimum_item_count <= self.max_pagination_threshold:
+            raise ValueError(f"The pagination threshold of {self.action_name} must be an integer from 1 to {self.max_pagination_threshold}: {minimum_item_count}")
+        self.pagination_threshold = minimum_item_count
+
+    def disable_pagination(self):
+        """
+        Turns pagination off, so that only the first page of results is returned.
+        """
+        self.pagination_threshold = None
+
+    def export_pagination(self, d: Dict) -> Dict:
+        """
+        Adds the pagination policy to an exported action, if pagination is on.
+
+        Args:
+            d (Dict): The exported action.
+
+        Returns:
+            Dict: The same dictionary.
+        """
+        if self.pagination_threshold is not None:
+            d["runtimeConfiguration"] = {"paginationPolicy": {"minimumItemCount": self.pagination_threshold}}
+        return d
@@ -12,6 +12,8 @@ class PowerAppsVariableType:
     date = {"name": "Date", "type": "string", "format": "date"}
 
 class PowerAppsRespondToPowerAppOrFlow(BaseAction):
+    __slots__ = ("kind", "body", "schema", "status_code")
+
 
     def __init__(self, name: str):
         super().__init__(name)
@@ -32,6 +34,7 @@ class PowerAppsRespondToPowerAppOrFlow(BaseAction):
 
         if "format" in type:
             self.schema["properties"][title]["format"] = type["format"]
+        self.mark_dirty()
 
     def export(self) -> Dict:
         d = {}
@@ -0,0 +1,147 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Set
+
+
+class ActionNameRegistry:
+    """
+    Keeps track of the action names used in a flow so that every action gets a unique name.
+
+    Names are stored in a hash set, and the next free suffix for each base name is remembered,
+    so resolving a duplicated name does not rescan the names that were already handed out.
+
+    Example:
+        registry = ActionNameRegistry()
+        registry.reserve("Compose")  # "Compose"
+        registry.reserve("Compose")  # "Compose_1"
+        registry.reserve("Compose")  # "Compose_2"
+
+    The registry also records which Actions instance holds each name of the Actions nested in a flow, so that
+    the actions that Actions composed from the same fragment with `+` share do not keep the same name in a flow.
+
+    Attributes:
+        used_names (Set[str]): The names reserved in this registry.
+    """
+
+    def __init__(self) -> None:
+        self.used_names: Set[str] = set()
+        self.__counters: Dict[str, int] = {}
+        self.__holders: Dict[str, object] = {}
+
+    def reserve(self, name: str) -> str:
+        """
+        Reserves a name, appending the next free `_{counter}` suffix if the name is already used.
+
+        Args:
+            name (str): The requested name.
+
+        Returns:
+            str: The reserved name, which may differ from the requested one.
+        """
+        if name not in self.used_names:
+            self.used_names.add(name)
+            return name
+
+        counter = self.__counters.get(name, 1)
+        new_name = f"{name}_{counter}"
+        while new_name in self.used_names:
+            counter += 1
+            new_name = f"{name}_{counter}"
+        self.__counters[name] = counter + 1
+        self.used_names.add(new_name)
+        return new_name
+
+    def reserve_many(self, names: Iterable[str]) -> List[str]:
+        """
+        Reserves several names at once, in order, as if `reserve` were called for each of them.
+
+        Args:
+            names (Iterable[str]): The requested names.
+
+        Returns:
+            List[str]: The reserved names.
+        """
+        used_names = self.used_names
+        counters = self.__counters
+        reserved = []
+        for name in names:
+            if name in used_names:
+                counter = counters.get(name, 1)
+                new_name = f"{name}_{counter}"
+                while new_name in used_names:
+                    counter += 1
+                    new_name = f"{name}_{counter}"
+                counters[name] = counter + 1
+                name = new_name
+            used_names.add(name)
+            reserved.append(name)
+        return reserved
+
+    def release(self, name: str):
+        """
+        Releases a reserved name so that it can be used again.
+
+        Args:
+            name (str): The name to release.
+        """
+        self.used_names.discard(name)
+        self.__holders.pop(name, None)
+
+    def claim(self, name: str, holder: object) -> bool:
+        """
+        Records that an Actions instance holds a reserved name, unless another one already holds it.
+
+        Args:
+            name (str): The action name.
+            holder (object): The Actions instance.
+
+        Returns:
+            bool: True if the name is held by `holder`, False if it is held by another Actions instance.
+        """
+        return self.__holders.setdefault(name, holder) is holder
+
+    def reset(self):
+        """
+        Releases every name reserved in this registry.
+        """
+        self.used_names.clear()
+        self.__counters.clear()
+        self.__holders.clear()
+
+    @contextmanager
+    def scope(self) -> Iterator['ActionNameRegistry']:
+        """
+        Makes this registry the default one while the context is active.
+        Actions and Flows created inside the context reserve their names in this registry, so that fragments
+        built for a flow get their final names right away instead of when they are added to the flow.
+
+        Example:
+            with ActionNameRegistry().scope():
+                flow = Flow()
+                ...
+        """
+        token = _scope_registry.set(self)
+        try:
+            yield self
+        finally:
+            _scope_registry.reset(token)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.used_names
+
+    def __len__(self) -> int:
+        return len(self.used_names)
+
+
+_scope_registry: ContextVar[ActionNameRegistry|None] = ContextVar("action_name_registry_scope", default=None)
+
+
+def scope_registry() -> ActionNameRegistry|None:
+    """
+    Returns the registry of the active `ActionNameRegistry.scope`, which new Actions and Flows use by default.
+    Outside of a scope, each Flow and each Actions instance created without a registry gets a new one.
+
+    Returns:
+        ActionNameRegistry|None: The registry, or None outside of a scope.
+    """
+    return _scope_registry.get()
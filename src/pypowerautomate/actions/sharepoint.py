@@ -3,9 +3,12 @@ from typing import Dict
 
 from .expression import Expression
 from .base import BaseAction
+from .pagination import PaginatedAction
 
 
 class SharepointCopyFileAsyncAction(BaseAction):
+    __slots__ = ("dataset", "sourceFileId", "destinationDataset", "destinationFolderPath", "nameConflictBehavior")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -47,13 +50,15 @@ class SharepointCopyFileAsyncAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetFileItemAction(BaseAction):
+    __slots__ = ("dataset", "table", "id")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -88,13 +93,15 @@ class SharepointGetFileItemAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetItemChangesAction(BaseAction):
+    __slots__ = ("dataset", "table", "id", "since", "includeDrafts")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -136,13 +143,15 @@ class SharepointGetItemChangesAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGrantAccessAction(BaseAction):
+    __slots__ = ("dataset", "table", "id", "recipients", "roleValue")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -184,13 +193,15 @@ class SharepointGrantAccessAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointMoveFileAsyncAction(BaseAction):
+    __slots__ = ("dataset", "sourceFileId", "destinationDataset", "destinationFolderPath", "nameConflictBehavior")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -232,13 +243,15 @@ class SharepointMoveFileAsyncAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointCreateFileAction(BaseAction):
+    __slots__ = ("dataset", "folderPath", "filename", "body")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -276,13 +289,15 @@ class SharepointCreateFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointCopyFolderAsyncAction(BaseAction):
+    __slots__ = ("dataset", "sourceFolderId", "destinationDataset", "destinationFolderPath", "nameConflictBehavior")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -325,13 +340,15 @@ class SharepointCopyFolderAsyncAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointMoveFolderAsyncAction(BaseAction):
+    __slots__ = ("dataset", "sourceFolderId", "destinationDataset", "destinationFolderPath", "nameConflictBehavior")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -373,13 +390,15 @@ class SharepointMoveFolderAsyncAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
-class SharepointListFolderAction(BaseAction):
+class SharepointListFolderAction(PaginatedAction):
+    __slots__ = ("dataset", "id")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -409,13 +428,15 @@ class SharepointListFolderAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
-        return d
+        return self.export_pagination(d)
 
 
 class SharepointCreateNewFolderAction(BaseAction):
+    __slots__ = ("dataset", "table", "path")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -449,13 +470,15 @@ class SharepointCreateNewFolderAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetFileContentByPathAction(BaseAction):
+    __slots__ = ("dataset", "path", "inferContentType")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -490,13 +513,15 @@ class SharepointGetFileContentByPathAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetFileMetadataByPathAction(BaseAction):
+    __slots__ = ("dataset", "path")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -526,13 +551,15 @@ class SharepointGetFileMetadataByPathAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetFileContentAction(BaseAction):
+    __slots__ = ("dataset", "id", "inferContentType")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -566,13 +593,15 @@ class SharepointGetFileContentAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetFileMetadataAction(BaseAction):
+    __slots__ = ("dataset", "id")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -602,13 +631,15 @@ class SharepointGetFileMetadataAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointUpdateFileAction(BaseAction):
+    __slots__ = ("dataset", "id", "body")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -642,13 +673,15 @@ class SharepointUpdateFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointDeleteFileAction(BaseAction):
+    __slots__ = ("dataset", "id")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -678,13 +711,15 @@ class SharepointDeleteFileAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetFolderMetadataAction(BaseAction):
+    __slots__ = ("dataset", "id")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -714,13 +749,15 @@ class SharepointGetFolderMetadataAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointGetTablesAction(BaseAction):
+    __slots__ = ("dataset",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -746,13 +783,15 @@ class SharepointGetTablesAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointListRootFolderAction(BaseAction):
+    __slots__ = ("dataset",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -778,13 +817,15 @@ class SharepointListRootFolderAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointExtractFolderV2Action(BaseAction):
+    __slots__ = ("dataset", "source", "destination", "overwrite")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -822,7 +863,7 @@ class SharepointExtractFolderV2Action(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -840,6 +881,8 @@ class SharepointHTTPRequestAction(BaseAction):
     Defines an action to send an HTTP request to Sharepoint. This is different to the other HTTP action as it does not require a premium license, but is only restricted to access Sharepoint sites.
     """
 
+    __slots__ = ("dataset", "method", "uri", "headers", "body")
+
     connection_host = {
         "connectionName": "shared_sharepointonline",
         "operationId": "HttpRequest",
@@ -907,13 +950,15 @@ class SharepointHTTPRequestAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
 
 
 class SharepointXxxxxxAction(BaseAction):
+    __slots__ = ("xxxxxx",)
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_sharepointonline",
         "connectionName": "shared_sharepointonline",
@@ -938,7 +983,7 @@ class SharepointXxxxxxAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = inputs
 
         return d
@@ -0,0 +1,180 @@
+import uuid
+from typing import Dict
+
+from ..metadata.allocator import DEFAULT_NAMESPACE
+from .actions import Actions
+from .registry import ActionNameRegistry
+from .dataoperation import SelectAction, ComposeAction, FilterArrayAction
+from .statements import ForeachStatement
+from .sharepoint import SharepointHTTPRequestAction
+
+MAX_SHAREPOINT_BATCH_SIZE = 1000
+SHAREPOINT_BATCH_OPERATIONS = ("create", "update", "delete")
+
+CRLF = "\r\n"
+
+
+def _quote(text: str) -> str:
+    """
+    Quotes a string literal for use in an expression.
+    """
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _reference(name: str) -> str:
+    """
+    Quotes an action name for use in an expression, where spaces become underscores.
+    """
+    return _quote(name.replace(" ", "_"))
+
+
+class SharepointBatchBuilder:
+    """
+    Builds the actions that create, update or delete SharePoint list items in bulk through the `$batch` endpoint,
+    instead of one connector action per item inside a Foreach.
+
+    The generated actions are:
+    - `{name} operations` (Select): one multipart `$batch` operation per item.
+    - `{name} chunks` (Compose): the operations split with `chunk()` into batches of `batch_size`.
+    - `{name} batches` (Foreach), which runs for each batch:
+        - `{name} batch body` (Compose): the multipart body of the batch, with all its operations in one changeset.
+        - `{name} request` (Send an HTTP request to SharePoint): POST to `_api/$batch`.
+        - `{name} results` (Select): the parsed response, one `{"status", "response"}` object per operation.
+        - `{name} failures` (Filter array): the results with a status of 400 or more.
+
+    The expressions reference the generated actions by the names they got in the name registry, so the actions
+    must not be renamed afterwards.
+
+    Attributes:
+        name (str): The prefix of the generated action names.
+        dataset (str): The URL of the SharePoint site.
+        list_name (str): The title of the list.
+        items (str): An expression that evaluates to the array of items.
+        operation (str): "create", "update" or "delete".
+        id_field (str): The property of the items that holds the list item ID, for updates and deletions.
+        fields (str|None): An expression, evaluated for each item with `item()`, that gives the JSON fields to
+            write. By default, the item itself for creations, and the item without `id_field` for updates.
+        batch_size (int): The number of operations per request.
+        concurrency (int|None): The number of batches sent in parallel, or None for the platform default.
+    """
+
+    __slots__ = ("name", "dataset", "list_name", "items", "operation", "id_field", "fields", "batch_size", "concurrency")
+
+    def __init__(self, name: str, dataset: str, list_name: str, items: str, operation: str = "update", id_field: str = "ID", fields: str|None = None, batch_size: int = MAX_SHAREPOINT_BATCH_SIZE, concurrency: int|None = None):
+        """
+        Initializes a new batch builder.
+
+        Args:
+            name (str): The prefix of the generated action names.
+            dataset (str): The URL of the SharePoint site.
+            list_name (str): The title of the list.
+            items (str): An expression that evaluates to the array of items, e.g. "@body('Get_items')?['value']".
+            operation (str): "create", "update" or "delete".
+            id_field (str): The property of the items that holds the list item ID, for updates and deletions.
+            fields (str, optional): An expression giving the JSON fields to write for `item()`, e.g. "string(item()?['fields'])".
+            batch_size (int): The number of operations per request, from 1 to 1000.
+            concurrency (int, optional): The number of batches sent in parallel, from 1 to 50.
+
+        Raises:
+            ValueError: If the operation or the batch size is invalid.
+        """
+        if operation not in SHAREPOINT_BATCH_OPERATIONS:
+            raise ValueError(f"operation must be one of {', '.join(SHAREPOINT_BATCH_OPERATIONS)}: {operation}")
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int) or not 1 <= batch_size <= MAX_SHAREPOINT_BATCH_SIZE:
+            raise ValueError(f"The batch size must be an integer from 1 to {MAX_SHAREPOINT_BATCH_SIZE}: {batch_size}")
+
+        self.name: str = name
+        self.dataset: str = dataset
+        self.list_name: str = list_name
+        self.items: str = items
+        self.operation: str = operation
+        self.id_field: str = id_field
+        self.fields: str|None = fields
+        self.batch_size: int = batch_size
+        self.concurrency: int|None = concurrency
+
+    def boundaries(self) -> Dict[str, str]:
+        """
+        Returns the multipart boundaries of the batch and of the changeset. They are derived from the builder
+        settings, so the same builder always produces the same flow definition.
+
+        Returns:
+            Dict[str, str]: The boundaries, keyed by "batch" and "changeset".
+        """
+        key = f"{self.dataset}/{self.list_name}/{self.operation}/{self.name}"
+        return {
+            "batch": f"batch_{uuid.uuid5(DEFAULT_NAMESPACE, 'batch/' + key)}",
+            "changeset": f"changeset_{uuid.uuid5(DEFAULT_NAMESPACE, 'changeset/' + key)}",
+        }
+
+    def operation_template(self) -> str:
+        """
+        Returns the multipart part of one operation, as a string template evaluated for each item with `item()`.
+
+        Returns:
+            str: The template.
+        """
+        items_uri = f"{self.dataset.rstrip('/')}/_api/web/lists/getByTitle({_quote(self.list_name)})/items"
+        item_id = f"@{{item()?[{_quote(self.id_field)}]}}"
+        if self.operation == "create":
+            request = [f"POST {items_uri} HTTP/1.1", "Content-Type: application/json;odata=nometadata"]
+            fields = self.fields or "string(item())"
+        elif self.operation == "update":
+            request = [f"PATCH {items_uri}({item_id}) HTTP/1.1", "Content-Type: application/json;odata=nometadata", "IF-MATCH: *"]
+            fields = self.fields or f"string(removeProperty(item(), {_quote(self.id_field)}))"
+        else:
+            request = [f"DELETE {items_uri}({item_id}) HTTP/1.1", "IF-MATCH: *"]
+            fields = None
+
+        lines = [f"--{self.boundaries()['changeset']}", "Content-Type: application/http", "Content-Transfer-Encoding: binary", ""]
+        lines += request
+        lines.append("")
+        lines.append("@{" + fields + "}" if fields else "")
+        return CRLF.join(lines) + CRLF
+
+    def build(self, name_registry: ActionNameRegistry|None = None) -> Actions:
+        """
+        Generates the actions. Compose the result with other Actions, e.g. `actions + builder.build()`.
+
+        Args:
+            name_registry (ActionNameRegistry, optional): The registry of the flow; the current registry by default.
+
+        Returns:
+            Actions: The generated actions.
+
+        Raises:
+            ValueError: If the concurrency is invalid.
+        """
+        boundaries = self.boundaries()
+        actions = Actions(name_registry=name_registry)
+
+        operations = SelectAction(f"{self.name} operations", self.items, select=self.operation_template())
+        actions.append(operations)
+        chunks = ComposeAction(f"{self.name} chunks", f"@chunk(body({_reference(operations.action_name)}), {self.batch_size})")
+        actions.append(chunks)
+        loop = ForeachStatement(f"{self.name} batches", f"@outputs({_reference(chunks.action_name)})")
+        if self.concurrency is not None:
+            loop.set_concurrency(self.concurrency)
+        actions.append(loop)
+
+        body = Actions(name_registry=actions.name_registry)
+        batch_body = ComposeAction(f"{self.name} batch body", CRLF.join([
+            f"--{boundaries['batch']}",
+            f"Content-Type: multipart/mixed; boundary=\"{boundaries['changeset']}\"",
+            "Content-Transfer-Encoding: binary",
+            "",
+            f"@{{join(items({_reference(loop.action_name)}), '')}}--{boundaries['changeset']}--",
+            "",
+            f"--{boundaries['batch']}--",
+            "",
+        ]))
+        body.append(batch_body)
+        headers = {"Content-Type": f"multipart/mixed; boundary={boundaries['batch']}", "Accept": "application/json;odata=nometadata"}
+        request = SharepointHTTPRequestAction(f"{self.name} request", self.dataset, "POST", "_api/$batch", headers, f"@outputs({_reference(batch_body.action_name)})")
+        body.append(request)
+        # Every operation answers with a status line; its response text runs up to the next one.
+        results = SelectAction(f"{self.name} results", f"@skip(split(base64ToString(body({_reference(request.action_name)})?['$content']), 'HTTP/1.1 '), 1)", select={"status": "@int(substring(item(), 0, 3))", "response": "@item()"})
+        body.append(results)
+        body.append(FilterArrayAction(f"{self.name} failures", f"@body({_reference(results.action_name)})", "@greaterOrEquals(item()?['status'], 400)"))
+        loop.set_actions(body)
+        return actions
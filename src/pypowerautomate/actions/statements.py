@@ -1,8 +1,13 @@
-from typing import Dict, cast
+import warnings
+from typing import Dict, List, cast
 from .base import BaseAction
-from .actions import Actions, RawActions
+from .actions import Actions, RawActions, export_nested
 from .condition import Condition
 from .expression import Expression
+from .variable import VARIABLE_WRITE_TYPES
+
+MAX_FOREACH_CONCURRENCY = 50
+RACE_CHECK_MODES = ("error", "warn", "ignore")
 
 
 class IfStatement(BaseAction):
@@ -14,6 +19,8 @@ class IfStatement(BaseAction):
         condition (Condition): The condition to be evaluated.
     """
 
+    __slots__ = ("condition", "true_actions", "false_actions")
+
     def __init__(self, name: str, condition: Condition|Expression):
         super().__init__(name)
         self.type: str = "If"
@@ -28,6 +35,7 @@ class IfStatement(BaseAction):
         Args:
             actions (Actions): The actions to be executed if the condition is true.
         """
+        self._replace_child_actions(self.true_actions, actions)
         self.true_actions = actions
 
     def set_false_actions(self, actions: Actions):
@@ -37,8 +45,18 @@ class IfStatement(BaseAction):
         Args:
             actions (Actions): The actions to be executed if the condition is false.
         """
+        self._replace_child_actions(self.false_actions, actions)
         self.false_actions = actions
 
+    def get_child_actions(self) -> List[Actions]:
+        """
+        Returns the true and false branches that are set.
+
+        Returns:
+            List[Actions]: The branches.
+        """
+        return [actions for actions in (self.true_actions, self.false_actions) if actions is not None]
+
     def export(self) -> Dict:
         """
         Exports the If statement as a dictionary.
@@ -49,7 +67,7 @@ class IfStatement(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
 
         if type(self.condition) is Condition:
             d["expression"] = self.condition.export()
@@ -57,12 +75,12 @@ class IfStatement(BaseAction):
             d["expression"] = self.condition.export_in_if()
 
         if self.true_actions:
-            d["actions"] = self.true_actions.export()
+            d["actions"] = export_nested(self.true_actions)
         else:
             d["actions"] = {}
 
         if self.false_actions:
-            d["else"] = {"actions": self.false_actions.export()}
+            d["else"] = {"actions": export_nested(self.false_actions)}
 
         return d
 
@@ -76,6 +94,8 @@ class ForeachStatement(BaseAction):
         foreach (str): The variable to iterate over.
     """
 
+    __slots__ = ("foreach", "actions", "concurrency", "race_check")
+
     def __init__(self, name: str, foreach: str|Expression):
         super().__init__(name)
         self.type: str = "Foreach"
@@ -85,6 +105,8 @@ class ForeachStatement(BaseAction):
 
         self.foreach: str = foreach
         self.actions: Actions|None = None
+        self.concurrency: int|None = None
+        self.race_check: str = "error"
 
     def set_actions(self, actions: Actions):
         """
@@ -93,8 +115,78 @@ class ForeachStatement(BaseAction):
         Args:
             actions (Actions): The actions to be executed for each iteration.
         """
+        self._replace_child_actions(self.actions, actions)
         self.actions = actions
 
+    def set_concurrency(self, repetitions: int, race_check: str = "error"):
+        """
+        Sets how many iterations may run in parallel. Without this setting the platform default is used.
+
+        Running iterations in parallel is unsafe when the loop body modifies variables, since the iterations then
+        race on them. Such loops are checked when the concurrency is set and again on export (see `variable_races`).
+
+        Args:
+            repetitions (int): The degree of parallelism, from 1 to 50. 1 runs the iterations one at a time.
+            race_check (str): What to do when iterations could race on variables: "error" raises a ValueError,
+                "warn" emits a RuntimeWarning, and "ignore" does nothing.
+
+        Raises:
+            ValueError: If the degree of parallelism or the race check mode is invalid, or if the race check mode
+                is "error" and the loop body modifies variables.
+        """
+        if isinstance(repetitions, bool) or not isinstance(repetitions, int) or not 1 <= repetitions <= MAX_FOREACH_CONCURRENCY:
+            raise ValueError(f"The concurrency of {self.action_name} must be an integer from 1 to {MAX_FOREACH_CONCURRENCY}: {repetitions}")
+        if race_check not in RACE_CHECK_MODES:
+            raise ValueError(f"race_check must be one of {', '.join(RACE_CHECK_MODES)}: {race_check}")
+        self.concurrency = repetitions
+        self.race_check = race_check
+        self.check_races()
+
+    def variable_races(self) -> List[BaseAction]:
+        """
+        Finds the actions in the loop body, at any nesting depth, that modify a variable
+        (set, increment, decrement or append). Parallel iterations would race on these variables.
+
+        Returns:
+            List[BaseAction]: The actions that modify variables.
+        """
+        races = []
+        stack = list(self.get_child_actions())
+        while stack:
+            actions = stack.pop()
+            for node in actions._node_table().values():
+                if node.type in VARIABLE_WRITE_TYPES:
+                    races.append(node)
+                stack.extend(node.get_child_actions())
+        return races
+
+    def check_races(self):
+        """
+        Applies the race check mode when iterations run in parallel and the loop body modifies variables.
+
+        Raises:
+            ValueError: If the race check mode is "error" and iterations could race on variables.
+        """
+        if self.concurrency is None or self.concurrency == 1 or self.race_check == "ignore":
+            return
+        races = self.variable_races()
+        if not races:
+            return
+        names = ", ".join(node.action_name for node in races)
+        message = f"{self.action_name} runs {self.concurrency} iterations in parallel, but its body modifies variables: {names}"
+        if self.race_check == "error":
+            raise ValueError(message)
+        warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+    def get_child_actions(self) -> List[Actions]:
+        """
+        Returns the actions executed for each iteration, if they are set.
+
+        Returns:
+            List[Actions]: The loop body.
+        """
+        return [self.actions] if self.actions is not None else []
+
     def export(self) -> Dict:
         """
         Exports the Foreach statement as a dictionary.
@@ -105,11 +197,14 @@ class ForeachStatement(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
 
         d["foreach"] = self.foreach
         if self.actions != None:
-            d["actions"] = self.actions.export()
+            d["actions"] = export_nested(self.actions)
+        if self.concurrency is not None:
+            self.check_races()
+            d["runtimeConfiguration"] = {"concurrency": {"repetitions": self.concurrency}}
         return d
 
 
@@ -122,12 +217,23 @@ class ScopeStatement(BaseAction):
         actions (Actions | RawActions): The actions to be executed within the scope.
     """
 
+    __slots__ = ("actions",)
+
     def __init__(self, name: str, actions: Actions | RawActions):
         super().__init__(name)
         self.type: str = "Scope"
 
         self.actions: Actions | RawActions = actions
 
+    def get_child_actions(self) -> List[Actions]:
+        """
+        Returns the actions of the scope. RawActions are not included since they are already exported.
+
+        Returns:
+            List[Actions]: The scope body.
+        """
+        return [self.actions] if isinstance(self.actions, Actions) else []
+
     def export(self) -> Dict:
         """
         Exports the Scope statement as a dictionary.
@@ -138,8 +244,8 @@ class ScopeStatement(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
-        d["actions"] = self.actions.export()
+        d["runAfter"] = self.export_runafter()
+        d["actions"] = export_nested(self.actions)
         return d
 
 
@@ -154,6 +260,8 @@ class DoUntilStatement(BaseAction):
         limit_count (int, optional): The maximum number of iterations to perform. Defaults to 60.
     """
 
+    __slots__ = ("actions", "limit", "expression")
+
     def __init__(self, name: str, actions: Actions, expression: str|Expression, limit_count: int = 60):
         super().__init__(name)
         self.type: str = "Until"
@@ -168,6 +276,15 @@ class DoUntilStatement(BaseAction):
         }
         self.expression = expression
 
+    def get_child_actions(self) -> List[Actions]:
+        """
+        Returns the actions of the loop.
+
+        Returns:
+            List[Actions]: The loop body.
+        """
+        return [self.actions]
+
     def export(self) -> Dict:
         """
         Exports the Do Until statement as a dictionary.
@@ -178,8 +295,8 @@ class DoUntilStatement(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
-        d["actions"] = self.actions.export()
+        d["runAfter"] = self.export_runafter()
+        d["actions"] = export_nested(self.actions)
 
         d["expression"] = self.expression
         d["limit"] = self.limit
@@ -194,6 +311,8 @@ class SwitchStatement(BaseAction):
         expression (str): The expression to be evaluated to determine which path to take.
     """
 
+    __slots__ = ("expression", "cases", "used_names", "used_cases", "default_case")
+
     def __init__(self, name: str, expression: str|Expression):
         super().__init__(name)
 
@@ -212,22 +331,37 @@ class SwitchStatement(BaseAction):
         if case_statement.expression in self.used_cases:
             raise ValueError(f"Expressions in case statements must be distinct values. {case_statement.action_name} in switch statement {self.action_name}")
 
+        self._replace_child_actions(None, case_statement.actions)
         self.used_cases.append(case_statement.expression)
 
         self.cases.append(case_statement)
 
     def set_default_case(self, case_statement: 'DefaultCaseStatement'):
+        self._replace_child_actions(self.default_case.actions, case_statement.actions)
         self.default_case = case_statement
 
+    def get_child_actions(self) -> List[Actions]:
+        """
+        Returns the actions of each case, followed by the actions of the default case.
+
+        Returns:
+            List[Actions]: The case bodies.
+        """
+        cases = [case.actions for case in self.cases.nodes.values() if isinstance(case, CaseStatement)]
+        return cases + [self.default_case.actions]
+
+    def _exported_children(self) -> List[Actions|BaseAction]:
+        return [self.cases, self.default_case]
+
     def export(self):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
-        d["cases"] = self.cases.export()
+        d["runAfter"] = self.export_runafter()
+        d["cases"] = export_nested(self.cases)
         d["expression"] = self.expression
 
-        d["default"] = self.default_case.export()
+        d["default"] = self.default_case.cached_export()
 
         return d
 
@@ -240,6 +374,9 @@ class CaseStatement(BaseAction):
         expression (int|str): The expression to test against the parent Switch statement
         actions (Actions): The actions to take if this case is used
     """
+
+    __slots__ = ("expression", "actions")
+
     def __init__(self, name: str, expression: int|str|Expression, actions: Actions):
         super().__init__(name)
         if isinstance(expression, Expression):
@@ -247,11 +384,20 @@ class CaseStatement(BaseAction):
         self.expression = expression
         self.actions = actions
 
+    def get_child_actions(self) -> List[Actions]:
+        """
+        Returns the actions of the case.
+
+        Returns:
+            List[Actions]: The case body.
+        """
+        return [self.actions]
+
     def export(self):
         d = {}
 
         d["case"] = self.expression
-        d["actions"] = self.actions.export()
+        d["actions"] = export_nested(self.actions)
 
         return d
 
@@ -262,12 +408,15 @@ class DefaultCaseStatement(CaseStatement):
     Args:
         expression (int|str): The expression to test against the parent Switch statement
     """
+
+    __slots__ = ()
+
     def __init__(self, actions: Actions):
         super().__init__("default", None, actions) # type: ignore
 
     def export(self):
         d = {}
 
-        d["actions"] = self.actions.export()
+        d["actions"] = export_nested(self.actions)
 
         return d
\ No newline at end of file
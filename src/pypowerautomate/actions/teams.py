@@ -2,6 +2,7 @@ from .expression import Expression
 import uuid
 from typing import List, Dict
 from .base import BaseAction
+from .pagination import PaginatedAction
 
 
 class GetAllTeamsAction(BaseAction):
@@ -22,6 +23,8 @@ class GetAllTeamsAction(BaseAction):
             Exports the action as a dictionary.
     """
 
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_teams",
         "connectionName": "shared_teams",
@@ -40,7 +43,7 @@ class GetAllTeamsAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -64,6 +67,8 @@ class GetTeamAction(BaseAction):
             Exports the action as a dictionary.
     """
 
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_teams",
         "connectionName": "shared_teams",
@@ -86,7 +91,7 @@ class GetTeamAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -110,6 +115,8 @@ class GetChannelsForGroupAction(BaseAction):
             Exports the action as a dictionary.
     """
 
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_teams",
         "connectionName": "shared_teams",
@@ -130,12 +137,12 @@ class GetChannelsForGroupAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
 
-class GetMessagesFromChannelAction(BaseAction):
+class GetMessagesFromChannelAction(PaginatedAction):
     """
     An action to retrieve the messages from a specific channel in Microsoft Teams.
 
@@ -155,6 +162,8 @@ class GetMessagesFromChannelAction(BaseAction):
             Exports the action as a dictionary.
     """
 
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_teams",
         "connectionName": "shared_teams",
@@ -180,9 +189,9 @@ class GetMessagesFromChannelAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
-        return d
+        return self.export_pagination(d)
 
 
 class GetChatsAction(BaseAction):
@@ -205,6 +214,8 @@ class GetChatsAction(BaseAction):
             Exports the action as a dictionary.
     """
 
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_teams",
         "connectionName": "shared_teams",
@@ -230,7 +241,7 @@ class GetChatsAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -255,6 +266,8 @@ class ListMembersAction(BaseAction):
             Exports the action as a dictionary.
     """
 
+    __slots__ = ("inputs", "parameters")
+
     connection_host = {
         "apiId": "/providers/Microsoft.PowerApps/apis/shared_teams",
         "connectionName": "shared_teams",
@@ -280,6 +293,6 @@ class ListMembersAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
\ No newline at end of file
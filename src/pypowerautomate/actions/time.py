@@ -14,6 +14,8 @@ class AddToTimeAction(BaseAction):
         inputs (dict): Dictionary storing input parameters for the action.
     """
 
+    __slots__ = ("kind", "inputs")
+
     def __init__(self, name: str, timeUnit: str|Expression, interval: int|str|Expression, baseTime: str|Expression = "@{utcNow()}"):
         """
         Initializes a new instance of AddToTimeAction.
@@ -51,7 +53,7 @@ class AddToTimeAction(BaseAction):
         d["metadata"] = self.metadata
         d["type"] = self.type
         d["kind"] = self.kind
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -66,6 +68,8 @@ class WaitAction(BaseAction):
         inputs (dict): Dictionary storing input parameters for the action.
     """
 
+    __slots__ = ("interval", "inputs")
+
     def __init__(self, name: str, count: int|str|Expression, unit: str|Expression):
         """
         Initializes a new instance of WaitAction.
@@ -98,6 +102,6 @@ class WaitAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
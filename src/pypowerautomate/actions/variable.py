@@ -4,6 +4,10 @@ from .expression import Expression
 from .base import BaseAction
 
 
+# Types of the actions that modify an existing variable.
+VARIABLE_WRITE_TYPES = frozenset(["SetVariable", "IncrementVariable", "DecrementVariable", "AppendToStringVariable", "AppendToArrayVariable"])
+
+
 class VariableTypes:
     """
     Defines constants for common variable types used in workflow actions.
@@ -21,6 +25,8 @@ class InitVariableAction(BaseAction):
     Class to define an action for initializing a variable. This action sets up a new variable with a specified type and an optional initial value.
     """
 
+    __slots__ = ("inputs", "variables")
+
     def __init__(self, name: str, var_name: str, var_type: str, value=None):
         """
         Initializes a new instance of InitVariableAction.
@@ -57,7 +63,7 @@ class InitVariableAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
 
         return d
@@ -68,6 +74,8 @@ class SetVariableAction(BaseAction):
     Class to define an action for setting or updating the value of an existing variable.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, var_name: str, value):
         """
         Initializes a new instance of SetVariableAction.
@@ -98,7 +106,7 @@ class SetVariableAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -108,6 +116,8 @@ class AppendStringToVariableAction(BaseAction):
     Class to define an action that appends a string to the existing string variable.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, var_name: str, value):
         """
         Initializes a new instance of AppendStringToVariableAction.
@@ -137,7 +147,7 @@ class AppendStringToVariableAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -146,6 +156,8 @@ class AppendToArrayVariableAction(BaseAction):
     Class to define an action that appends a value to the existing array variable.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, var_name: str, value):
         """
         Initializes a new instance of AppendToArrayVariableAction.
@@ -175,7 +187,7 @@ class AppendToArrayVariableAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -190,6 +202,8 @@ class IncrementVariableAction(BaseAction):
         value (Any): The value to be added to the variable.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, var_name: str, value):
         super().__init__(name)
         if isinstance(value, Expression):
@@ -210,7 +224,7 @@ class IncrementVariableAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
 
@@ -225,6 +239,8 @@ class DecrementVariableAction(BaseAction):
         value (str): The value to be subtracted from the variable.
     """
 
+    __slots__ = ("inputs",)
+
     def __init__(self, name: str, var_name: str, value):
         super().__init__(name)
         self.type = "DecrementVariable"
@@ -245,6 +261,6 @@ class DecrementVariableAction(BaseAction):
         d = {}
         d["metadata"] = self.metadata
         d["type"] = self.type
-        d["runAfter"] = self.runafter
+        d["runAfter"] = self.export_runafter()
         d["inputs"] = self.inputs
         return d
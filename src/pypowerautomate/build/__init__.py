@@ -0,0 +1,2 @@
+from .canonical import CanonicalBuild, ZIP_EPOCH, zip_entry
+from .cache import BuildCache
@@ -0,0 +1,217 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, List, Tuple
+
+# Changes whenever the zip files built from the same inputs change, so that older entries are not reused.
+CACHE_FORMAT = b"pypowerautomate-build-cache/1\n"
+
+ARTIFACT_SUFFIX = ".zip"
+
+
+class BuildCache:
+    """
+    A content-addressed cache of the zip files built by `Package.export_zipfile` and `Solution.export_zipfile`.
+
+    Entries are keyed by a hash of everything written to the zip file (see `Package.cache_key`), so only canonical
+    builds (see `CanonicalBuild`), whose zip files do not change when they are rebuilt, can be cached. On a hit the
+    stored zip file is hard-linked, or copied, to the output path instead of being built again.
+
+    Entries are stored as files in the cache directory, which can be shared by several processes. The least
+    recently used entries are evicted when the number of entries or their total size exceeds the caps.
+
+    Attributes:
+        directory (str): The cache directory.
+        max_entries (int): The number of entries kept at most.
+        max_size (int): The total size of the entries kept at most, in bytes.
+        link (bool): Whether hits are hard-linked to the output path rather than copied. A hard-linked output must
+            not be modified in place, as that would modify the cached entry.
+        hits (int): The number of lookups that found an entry.
+        misses (int): The number of lookups that found none.
+        stores (int): The number of entries stored.
+        evictions (int): The number of entries evicted.
+    """
+
+    __slots__ = ("directory", "max_entries", "max_size", "link", "hits", "misses", "stores", "evictions")
+
+    def __init__(self, directory: str, max_entries: int = 1000, max_size: int = 1 << 30, link: bool = True):
+        """
+        Initializes a cache, creating its directory if needed.
+
+        Args:
+            directory (str): The cache directory.
+            max_entries (int): The number of entries kept at most.
+            max_size (int): The total size of the entries kept at most, in bytes.
+            link (bool): Whether hits are hard-linked to the output path rather than copied.
+
+        Raises:
+            ValueError: If a cap is not a positive integer.
+        """
+        for name, value in (("max_entries", max_entries), ("max_size", max_size)):
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer: {value}")
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory: str = directory
+        self.max_entries: int = max_entries
+        self.max_size: int = max_size
+        self.link: bool = link
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stores: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def key(chunks: Iterable[bytes]) -> str:
+        """
+        Computes the key of an entry from the content it is built from.
+
+        Args:
+            chunks (Iterable[bytes]): The content, in chunks.
+
+        Returns:
+            str: The key, a SHA-256 hex digest.
+        """
+        digest = hashlib.sha256(CACHE_FORMAT)
+        for chunk in chunks:
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Returns the path of the entry of a key.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            str: The path, whether or not the entry exists.
+        """
+        return os.path.join(self.directory, key + ARTIFACT_SUFFIX)
+
+    def get(self, key: str, destination: str) -> bool:
+        """
+        Hard-links or copies the entry of a key to a path, replacing the file at that path.
+
+        Args:
+            key (str): The key.
+            destination (str): The output path.
+
+        Returns:
+            bool: True on a hit, False if there is no entry.
+        """
+        entry = self.path(key)
+        try:
+            # Marks the entry as used, for the eviction order.
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        if os.path.lexists(destination):
+            if os.path.samefile(entry, destination):
+                self.hits += 1
+                return True
+            os.remove(destination)
+        try:
+            if not self.link:
+                raise OSError
+            os.link(entry, destination)
+        except OSError:
+            try:
+                shutil.copyfile(entry, destination)
+            except FileNotFoundError:
+                # Evicted by another process in the meantime.
+                self.misses += 1
+                return False
+        self.hits += 1
+        return True
+
+    def put(self, key: str, source: str):
+        """
+        Stores a copy of a file as the entry of a key, then evicts the least recently used entries beyond the caps.
+
+        Args:
+            key (str): The key.
+            source (str): The path of the zip file.
+        """
+        descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        os.close(descriptor)
+        try:
+            shutil.copyfile(source, temporary)
+            # Atomic, so that other processes never read a partial entry.
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+        self.stores += 1
+        self.evict()
+
+    def entries(self) -> List[Tuple[str, int, float]]:
+        """
+        Lists the entries, least recently used first.
+
+        Returns:
+            List[Tuple[str, int, float]]: The key, size and last use time of each entry.
+        """
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(ARTIFACT_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.name[:-len(ARTIFACT_SUFFIX)], stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the number of entries and their total size are within the caps.
+        """
+        entries = self.entries()
+        count = len(entries)
+        size = sum(entry[1] for entry in entries)
+        for key, entry_size, _ in entries:
+            if count <= self.max_entries and size <= self.max_size:
+                break
+            try:
+                os.remove(self.path(key))
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            count -= 1
+            size -= entry_size
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        for key, _, _ in self.entries():
+            try:
+                os.remove(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int|float]:
+        """
+        Returns the statistics of the cache.
+
+        Returns:
+            Dict[str, int|float]: The hits, misses, stores and evictions of this instance, its hit rate, and the
+                number of entries and total size of the directory.
+        """
+        entries = self.entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "size": sum(entry[1] for entry in entries),
+        }
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import string
+import time
+import zipfile
+from datetime import datetime, timezone
+
+from ..metadata import DeterministicIdAllocator
+from ..serialization import JsonSerializer
+
+# The earliest time a zip entry can hold.
+ZIP_EPOCH = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+RANDOM_ID_ALPHABET = string.ascii_uppercase + string.digits + string.ascii_lowercase
+
+
+def _default_timestamp() -> datetime:
+    """
+    Returns the time given by the SOURCE_DATE_EPOCH environment variable, the convention of reproducible builds,
+    or `ZIP_EPOCH`.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return max(datetime.fromtimestamp(int(epoch), timezone.utc), ZIP_EPOCH)
+    return ZIP_EPOCH
+
+
+class CanonicalBuild:
+    """
+    The settings of a canonical build, which makes `Package` and `Solution` zips byte-identical when they are
+    rebuilt from unchanged inputs, so that artifacts can be deduplicated and builds cached.
+
+    Everything a build normally draws at random or reads from the clock is derived from the seed and the timestamp:
+    - the UUIDs of packages and of their resources, and the package telemetry ID;
+    - the operationMetadataIds of actions and triggers, unless an allocator is given explicitly;
+    - the random suffixes of connection reference names in solutions;
+    - the creation time of packages and the timestamps of zip entries.
+
+    JSON files are written with the standard library serializer, so the output does not depend on the JSON
+    libraries installed, and zip entries are written in sorted order with fixed attributes.
+
+    IDs are derived from names: the display name of a package, and the type and display name of a resource.
+    Packages built with the same seed need different display names.
+
+    Attributes:
+        seed (str): The seed of the derived IDs. Builds with different seeds get different IDs.
+        timestamp (datetime): The time used for creation times and zip entries.
+        id_allocator (DeterministicIdAllocator): The allocator of the derived IDs.
+        serializer (JsonSerializer): The serializer of the JSON files.
+    """
+
+    __slots__ = ("seed", "timestamp", "id_allocator", "serializer")
+
+    def __init__(self, seed: str = "", timestamp: datetime|None = None):
+        """
+        Initializes the settings of a canonical build.
+
+        Args:
+            seed (str, optional): The seed of the derived IDs.
+            timestamp (datetime, optional): The time of the build. Naive times are taken as UTC. Defaults to the
+                SOURCE_DATE_EPOCH environment variable, or to 1980-01-01, the earliest time a zip entry can hold.
+
+        Raises:
+            ValueError: If the timestamp is before 1980.
+        """
+        if timestamp is None:
+            timestamp = _default_timestamp()
+        elif timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        if timestamp < ZIP_EPOCH:
+            raise ValueError(f"The timestamp of a canonical build must not be before 1980: {timestamp}")
+
+        self.seed: str = seed
+        self.timestamp: datetime = timestamp.astimezone(timezone.utc)
+        self.id_allocator: DeterministicIdAllocator = DeterministicIdAllocator(seed)
+        self.serializer: JsonSerializer = JsonSerializer("json")
+
+    def uuid(self, kind: str, name: str) -> str:
+        """
+        Derives a UUID.
+
+        Args:
+            kind (str): The kind of object, e.g. "packages".
+            name (str): A name that identifies the object among those of its kind.
+
+        Returns:
+            str: The UUID.
+        """
+        return self.id_allocator.allocate(kind, name)
+
+    def random_id(self, name: str, length: int = 5, alphabet: str = RANDOM_ID_ALPHABET) -> str:
+        """
+        Derives a string that stands in for a random one.
+
+        Args:
+            name (str): A name that identifies the string.
+            length (int): The number of characters.
+            alphabet (str): The characters to draw from.
+
+        Returns:
+            str: The string.
+        """
+        digest = hashlib.sha256(f"{self.id_allocator.namespace}/{name}".encode("utf-8")).digest()
+        while len(digest) < length:
+            digest += hashlib.sha256(digest).digest()
+        return "".join(alphabet[byte % len(alphabet)] for byte in digest[:length])
+
+    def zip_info(self, name: str) -> zipfile.ZipInfo:
+        """
+        Creates the header of a zip entry with the timestamp of the build and fixed attributes.
+
+        Args:
+            name (str): The path of the entry in the zip file, with "/" separators.
+
+        Returns:
+            zipfile.ZipInfo: The header, for `zipfile.ZipFile.writestr` or `zipfile.ZipFile.open`.
+        """
+        info = zipfile.ZipInfo(name, self.timestamp.timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.create_system = 3
+        info.external_attr = 0o100644 << 16
+        return info
+
+
+def zip_entry(name: str, canonical: CanonicalBuild|None = None) -> zipfile.ZipInfo:
+    """
+    Creates the header of a zip entry for a file of a package or solution, dated now, or with the fixed attributes
+    of a canonical build.
+
+    Args:
+        name (str): The path of the entry in the zip file, with "/" separators.
+        canonical (CanonicalBuild, optional): The settings of a canonical build.
+
+    Returns:
+        zipfile.ZipInfo: The header, for `zipfile.ZipFile.writestr` or `zipfile.ZipFile.open`.
+    """
+    if canonical is not None:
+        return canonical.zip_info(name)
+    info = zipfile.ZipInfo(name, time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o100644 << 16
+    return info
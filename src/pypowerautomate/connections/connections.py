@@ -1,6 +1,5 @@
 from . import connectors
 import re
-import json
 
 uuid4_pattern = r"-[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}"
 
@@ -75,9 +74,10 @@ class Connections:
         Returns:
             int: The number of connections added to the list.
         """
+        from ..serialization import current_serializer  # Lazy Import(to avoid circular import)
         data = {}
-        with open(path, "r") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = current_serializer().load(f)
         return self.set_connections_from_dict(data)
 
     def add_connection(self, connection_name: str, id: str|None = None):
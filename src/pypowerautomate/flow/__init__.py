@@ -1 +1,2 @@
 from .flow import Flow
+from .analysis import FlowAnalysis, analyze_actions
@@ -0,0 +1,161 @@
+from typing import Dict, List, Mapping
+
+from ..actions import Actions, BaseAction
+
+
+def action_latency(action: BaseAction, latencies: Mapping[str, float], default_latency: float = 1.0) -> float:
+    """
+    Looks up the estimated latency of a single action, not including its nested actions.
+
+    Connector actions are looked up by "<connectionName>/<operationId>" (e.g. "shared_sharepointonline/GetItems"),
+    then by connection name (e.g. "shared_sharepointonline"). All actions are then looked up by type
+    (e.g. "OpenApiConnection", "Http", "Compose").
+
+    Args:
+        action (BaseAction): The action.
+        latencies (Mapping[str, float]): The latency table.
+        default_latency (float): The latency of actions that are not in the table.
+
+    Returns:
+        float: The estimated latency.
+    """
+    host = getattr(action, "connection_host", None)
+    if isinstance(host, dict):
+        connection_name = host.get("connectionName")
+        operation = f"{connection_name}/{host.get('operationId')}"
+        if operation in latencies:
+            return latencies[operation]
+        if connection_name in latencies:
+            return latencies[connection_name]
+    return latencies.get(action.type, default_latency)
+
+
+class FlowAnalysis:
+    """
+    A report on the runAfter graph of an Actions set, built by `analyze_actions` or `Flow.analyze`.
+
+    Levels are counted in actions: an action is on level N if the longest dependency chain before it has N actions,
+    so all the actions on the same level can run in parallel. Durations use the latency table given to the analysis;
+    a nested action set adds the estimated duration of its longest branch to its container. Loop bodies are counted
+    once, since the number of iterations is not known before the flow runs.
+
+    Attributes:
+        action_count (int): The number of actions in the set, not including nested actions.
+        critical_path (List[str]): The names of the actions on the chain with the longest estimated duration.
+        estimated_duration (float): The estimated duration of the critical path.
+        levels (List[List[str]]): The names of the actions on each level.
+        parallel_widths (List[int]): The number of actions on each level.
+        max_parallel_width (int): The largest number of actions on the same level.
+        path_lengths (Dict[str, int]): For each final action (one that no action runs after), the number of actions
+            on the longest chain ending with it.
+        nested (Dict[str, List[FlowAnalysis]]): The reports on the nested action sets of each container action.
+    """
+
+    def __init__(self) -> None:
+        self.action_count: int = 0
+        self.critical_path: List[str] = []
+        self.estimated_duration: float = 0.0
+        self.levels: List[List[str]] = []
+        self.parallel_widths: List[int] = []
+        self.max_parallel_width: int = 0
+        self.path_lengths: Dict[str, int] = {}
+        self.nested: Dict[str, List['FlowAnalysis']] = {}
+
+    @property
+    def longest_chain(self) -> int:
+        """
+        int: The number of actions on the longest dependency chain.
+        """
+        return len(self.levels)
+
+    def export(self) -> Dict:
+        """
+        Exports the report as a dictionary.
+
+        Returns:
+            Dict: A dictionary representation of the report, including the reports on nested action sets.
+        """
+        d = {}
+        d["actionCount"] = self.action_count
+        d["criticalPath"] = self.critical_path
+        d["estimatedDuration"] = self.estimated_duration
+        d["longestChain"] = self.longest_chain
+        d["parallelWidths"] = self.parallel_widths
+        d["maxParallelWidth"] = self.max_parallel_width
+        d["levels"] = self.levels
+        d["pathLengths"] = self.path_lengths
+        d["nested"] = {name: [analysis.export() for analysis in analyses] for name, analyses in self.nested.items()}
+        return d
+
+
+def analyze_actions(actions: Actions, latencies: Mapping[str, float]|None = None, default_latency: float = 1.0) -> FlowAnalysis:
+    """
+    Analyzes the runAfter graph of an Actions set, including its nested action sets, in a single pass
+    over the actions in topological order.
+
+    Args:
+        actions (Actions): The actions to analyze.
+        latencies (Mapping[str, float], optional): Estimated latencies keyed as described in `action_latency`.
+        default_latency (float): The latency of actions that are not in the table. With the default of 1.0 and
+            no table, durations count actions.
+
+    Returns:
+        FlowAnalysis: The report.
+
+    Raises:
+        ValueError: If the actions contain a cycle or a run-after condition on an unknown action.
+    """
+    if latencies is None:
+        latencies = {}
+    order = actions.topological_order()
+    index_by_name = {node.action_name: index for index, node in enumerate(order)}
+    index_by_id = {id(node): index for index, node in enumerate(order)}
+    predecessors: List[set] = [{index_by_name[name] for name in actions.runafter_of(node)} for node in order]
+    has_followers = [False] * len(order)
+    for index, node in enumerate(order):
+        for next_node in actions.successors(node):
+            predecessors[index_by_id[id(next_node)]].add(index)
+        for predecessor in predecessors[index]:
+            has_followers[predecessor] = True
+
+    report = FlowAnalysis()
+    report.action_count = len(order)
+    depths: List[int] = []
+    finish_times: List[float] = []
+    critical_predecessors: List[int|None] = []
+    for index, node in enumerate(order):
+        duration = action_latency(node, latencies, default_latency)
+        children = [analyze_actions(child, latencies, default_latency) for child in node.get_child_actions()]
+        if children:
+            report.nested[node.action_name] = children
+            duration += max(child.estimated_duration for child in children)
+
+        depth = 0
+        start_time = 0.0
+        critical_predecessor = None
+        for predecessor in predecessors[index]:
+            depth = max(depth, depths[predecessor] + 1)
+            if critical_predecessor is None or finish_times[predecessor] > start_time:
+                start_time = finish_times[predecessor]
+                critical_predecessor = predecessor
+        depths.append(depth)
+        finish_times.append(start_time + duration)
+        critical_predecessors.append(critical_predecessor)
+
+        if depth == len(report.levels):
+            report.levels.append([])
+        report.levels[depth].append(node.action_name)
+        if not has_followers[index]:
+            report.path_lengths[node.action_name] = depth + 1
+
+    report.parallel_widths = [len(level) for level in report.levels]
+    report.max_parallel_width = max(report.parallel_widths, default=0)
+    if order:
+        last: int|None = max(range(len(order)), key=finish_times.__getitem__)
+        report.estimated_duration = finish_times[last]
+        path = []
+        while last is not None:
+            path.append(order[last].action_name)
+            last = critical_predecessors[last]
+        report.critical_path = path[::-1]
+    return report
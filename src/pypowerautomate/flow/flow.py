@@ -1,11 +1,35 @@
-import json
-from typing import Dict, List
+import io
+from contextlib import nullcontext
+from types import MappingProxyType
+from typing import IO, ContextManager, Dict, Iterable, List, Mapping
 
 from ..environment_variable import EnvironmentVariable
-from ..actions import BaseAction, Actions
+from ..metadata import IdAllocator, use_allocator
+from ..actions import BaseAction, Actions, ActionNameRegistry, scope_registry, PlatformLimits, LimitBudget, cache_exports
 from ..triggers import BaseTrigger, Triggers
+from ..serialization import iter_json, iter_json_bytes, write_json, iter_xor_encode
+from .analysis import FlowAnalysis, analyze_actions
 
-DEFAULT_PARAMETER = {
+def _freeze(value: object) -> object:
+    """
+    Returns a read-only view of nested dictionaries.
+    """
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    return value
+
+
+def _thaw(value: object) -> object:
+    """
+    Returns nested mappings as new dictionaries, which can be modified and serialized.
+    """
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+# The parameters of every flow, which cannot be modified. Each export builds its own dictionaries from them.
+DEFAULT_PARAMETER: Mapping[str, Mapping] = _freeze({
     "$connections": {
         "defaultValue": {},
         "type": "Object"
@@ -14,7 +38,7 @@ DEFAULT_PARAMETER = {
         "defaultValue": {},
         "type": "SecureObject"
     }
-}
+})
 
 DEFAULT_SCHEMA = "https://schema.management.azure.com/providers/Microsoft.Logic/schemas/2016-06-01/workflowdefinition.json#"
 DEFAULT_VERSION = "1.0.0.0"
@@ -28,25 +52,59 @@ class Flow:
     Attributes:
         schema (str): The default schema for the flow.
         contentVersion (str): The version of the content used in the flow.
-        parameters (dict): Default parameters for the flow.
+        parameters (Mapping): The base parameters of the flow, shared by default with every other flow as a read-only
+            mapping. Each export builds new dictionaries from them and adds the environment variables of the flow,
+            so exports do not leak variables into each other and can run from several threads.
     """
     schema: str = DEFAULT_SCHEMA
     contentVersion: str = DEFAULT_VERSION
-    parameters: dict = DEFAULT_PARAMETER
+    parameters: Mapping[str, Mapping] = DEFAULT_PARAMETER
 
-    def __init__(self):
+    def __init__(self, name_registry: ActionNameRegistry|None = None, id_allocator: IdAllocator|None = None, limits: PlatformLimits|None = None, cache_exports: bool = False):
         """
         Initializes the Flow with default triggers and actions.
+
+        Args:
+            name_registry (ActionNameRegistry, optional): The registry used to keep action names unique in this flow.
+                Defaults to the registry of the active `ActionNameRegistry.scope`, or to a new registry, so the names
+                of independent flows do not interfere. Nested actions built with another registry, such as Actions
+                created outside of the scope or for another flow, are bound to this registry when they are added
+                to the flow, and renamed where needed. To give them their final names right away, create them
+                inside `with flow.name_registry.scope():`.
+            id_allocator (IdAllocator, optional): The allocator of the operationMetadataIds assigned while exporting.
+                Defaults to the current allocator, which draws random IDs. Use a DeterministicIdAllocator for reproducible exports.
+            limits (PlatformLimits, optional): If given, the actions are counted as they are added, and adding an action
+                fails with a ValueError as soon as the flow would exceed one of these limits (see `LimitBudget`).
+            cache_exports (bool, optional): If True, the flow is exported inside `pypowerautomate.actions.cache_exports`,
+                so exporting it again only rebuilds the actions that changed. The exported actions are then shared
+                between exports and must not be modified, and actions whose parameters are modified in place must
+                be marked with `BaseAction.mark_dirty`.
         """
+        if name_registry is None:
+            name_registry = scope_registry()
+            if name_registry is None:
+                name_registry = ActionNameRegistry()
+        self.name_registry: ActionNameRegistry = name_registry
+        self.id_allocator: IdAllocator|None = id_allocator
+        self.cache_exports: bool = cache_exports
         self.triggers: Triggers = Triggers()
-        self.root_actions: Actions = Actions(True)
+        self.root_actions: Actions = Actions(True, self.name_registry)
+        if limits is not None:
+            self.root_actions.set_budget(LimitBudget(limits))
         self.__environment_variables: Dict[str, EnvironmentVariable] = {}
 
+    @property
+    def budget(self) -> LimitBudget|None:
+        """
+        The limit budget counting the actions of the flow, if the flow was created with limits.
+        """
+        return self.root_actions.budget
+
     def has_actions(self):
         return self.action_count() != 0
 
     def action_count(self):
-        return len(self.root_actions.nodes.items()) - 1
+        return len(self.root_actions.node_ids) - 1
 
     def set_trigger(self, trigger: BaseTrigger):
         """
@@ -72,6 +130,18 @@ class Flow:
         else:
             self.root_actions.append(action, force_exec, exec_if_failed)
 
+    def append_actions(self, actions: Iterable[BaseAction], prev_action: List[BaseAction|None]|BaseAction|None = None, force_exec: bool = False, exec_if_failed: bool = False):
+        """
+        Appends a chain of actions to the flow in one batch, each action running after the one before it.
+
+        Args:
+            actions (Iterable[BaseAction]): The actions to append, in execution order.
+            prev_action (BaseAction, optional): The action after which the first action should be placed.
+            force_exec (bool, optional): If True, each action will execute even if the previous action fails.
+            exec_if_failed (bool, optional): If True, each action will execute only if the previous action fails.
+        """
+        self.root_actions.extend(actions, prev_action or None, force_exec, exec_if_failed)
+
     def add_environment_variable(self, variable: EnvironmentVariable):
         self.__environment_variables[variable.normalized_name] = variable
 
@@ -84,19 +154,85 @@ class Flow:
         """
         self.root_actions.add_top(action)
 
-    def export(self):
+    def analyze(self, latencies: Mapping[str, float]|None = None, default_latency: float = 1.0) -> FlowAnalysis:
+        """
+        Analyzes the runAfter graph of the flow's actions: the critical path, the parallel width of each level
+        and the length of each path, with an estimated end-to-end duration.
+
+        Example:
+            report = flow.analyze({"Http": 0.8, "shared_sharepointonline": 1.5, "Compose": 0.05})
+            print(report.critical_path, report.estimated_duration, report.parallel_widths)
+
+        Args:
+            latencies (Mapping[str, float], optional): Estimated latencies keyed by "<connectionName>/<operationId>",
+                connection name or action type.
+            default_latency (float, optional): The latency of actions that are not in the table.
+
+        Returns:
+            FlowAnalysis: The report.
+        """
+        return analyze_actions(self.root_actions, latencies, default_latency)
+
+    def export(self, id_allocator: IdAllocator|None = None, streaming: bool = False):
         """
         Exports the flow configuration as a dictionary.
 
+        Actions and triggers that have no operationMetadataId yet get one from `id_allocator`,
+        falling back to the allocator of the flow and then to the current allocator.
+
+        Args:
+            id_allocator (IdAllocator, optional): The allocator used for this export.
+            streaming (bool, optional): If True, "triggers" and "actions" hold the Triggers and Actions objects,
+                to be exported while they are written by `pypowerautomate.serialization.write_json`. No
+                operationMetadataId is assigned by this call then; pass the allocator to the writer instead.
+
         Returns:
             dict: A dictionary representing the complete flow configuration.
         """
+        if streaming:
+            return self.__export(True)
+        if id_allocator is None:
+            id_allocator = self.id_allocator
+        with self.caching():
+            if id_allocator is not None:
+                with use_allocator(id_allocator):
+                    return self.__export(False)
+            return self.__export(False)
+
+    def caching(self) -> ContextManager:
+        """
+        Returns the context in which the flow is exported: `cache_exports` if the flow was created with
+        `cache_exports=True`, or a context that changes nothing. Writers of streamed exports enter it.
+
+        Returns:
+            ContextManager: The context.
+        """
+        return cache_exports() if self.cache_exports else nullcontext()
+
+    def __export(self, streaming: bool):
         d = {}
-        d["$schema"] = Flow.schema
-        d["contentVersion"] = Flow.contentVersion
-        d["parameters"] = Flow.parameters
+        d["$schema"] = self.schema
+        d["contentVersion"] = self.contentVersion
+        d["parameters"] = self.export_parameters()
+
+        if streaming:
+            d["triggers"] = self.triggers
+            d["actions"] = self.root_actions
+        else:
+            d["triggers"] = self.triggers.export()
+            d["actions"] = self.root_actions.export()
+        return d
 
-        for name, variable in self.__environment_variables.items():
+    def export_parameters(self) -> Dict:
+        """
+        Exports the parameters of the flow: the base parameters, followed by the environment variables of the flow.
+        The result is made of new dictionaries, so it can be modified without affecting other exports or flows.
+
+        Returns:
+            Dict: The parameters.
+        """
+        parameters = _thaw(self.parameters)
+        for name, variable in list(self.__environment_variables.items()):
             var = {}
             var["defaultValue"] = variable.default_value
             var["type"] = variable.type["literal"]
@@ -104,26 +240,45 @@ class Flow:
             var["metadata"]["schemaName"] = f"{variable.prefix}_{variable.normalized_name}"
             var["metadata"]["description"] = variable.description
 
-            d["parameters"][name] = var
+            parameters[name] = var
+        return parameters
 
-        d["triggers"] = self.triggers.export()
-        d["actions"] = self.root_actions.export()
-        return d
+    def write_json(self, fp: IO, id_allocator: IdAllocator|None = None, xor_key=None):
+        """
+        Writes the flow configuration as JSON to a file-like object, exporting the actions while they are written
+        so that the exported dictionary is never held in memory. The text is the same as `export_json()`.
 
-    def export_json(self, xor_key=None):
+        Args:
+            fp (IO): A text stream, or a binary stream such as a zip file entry (see `pypowerautomate.serialization.write_json`).
+            id_allocator (IdAllocator, optional): The allocator of operationMetadataIds used for this export.
+            xor_key (str, optional): A comma-separated string of integers used as the key for XOR encryption.
+        """
+        if id_allocator is None:
+            id_allocator = self.id_allocator
+        with self.caching():
+            if not xor_key:
+                write_json(self.export(streaming=True), fp, id_allocator)
+                return
+
+            binary = not isinstance(fp, io.TextIOBase)
+            for chunk in iter_xor_encode(iter_json_bytes(self.export(streaming=True), id_allocator), xor_key):
+                fp.write(chunk.encode("ascii") if binary else chunk)
+
+    def export_json(self, xor_key=None, id_allocator: IdAllocator|None = None):
         """
-        Exports the flow configuration as a JSON string, optionally encoding it with an XOR key.
+        Exports the flow configuration as a JSON string, optionally encoding it with an XOR key. The JSON is
+        encoded by the current serializer (see `pypowerautomate.serialization.use_serializer`). Encoded strings are decoded by `pypowerautomate.serialization.xor_decode`.
 
         Args:
             xor_key (str, optional): A comma-separated string of integers used as the key for XOR encryption.
+            id_allocator (IdAllocator, optional): The allocator of operationMetadataIds used for this export.
 
         Returns:
             str: A JSON string representation of the flow, potentially XOR encrypted.
         """
-        json_str = json.dumps(self.export())
-        if xor_key:
-            xor_key = [int(x) for x in xor_key.split(",")]
-            json_str = ",".join(
-                [str(ord(json_str[i]) ^ xor_key[i % len(xor_key)]) for i in range(len(json_str))])
-
-        return json_str
+        if id_allocator is None:
+            id_allocator = self.id_allocator
+        with self.caching():
+            if xor_key:
+                return "".join(iter_xor_encode(iter_json_bytes(self.export(streaming=True), id_allocator), xor_key))
+            return "".join(iter_json(self.export(streaming=True), id_allocator))
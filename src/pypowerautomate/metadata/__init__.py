@@ -0,0 +1 @@
+from .allocator import IdAllocator, DeterministicIdAllocator, current_allocator, use_allocator, assign_id
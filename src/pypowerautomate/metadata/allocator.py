@@ -0,0 +1,125 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Tuple
+import uuid
+
+# Namespace used by DeterministicIdAllocator when neither a namespace nor a seed is given.
+DEFAULT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/NTT-Security-Japan/PyPowerAutomate")
+
+
+class IdAllocator:
+    """
+    Allocates the operationMetadataId of actions and triggers.
+
+    IDs are not drawn when an action or trigger is created but when its metadata is read, which normally happens
+    while the flow is exported (see `assign_id`). The base allocator returns random UUIDs (uuid4).
+    """
+
+    def allocate(self, kind: str, name: str) -> str:
+        """
+        Allocates an operationMetadataId.
+
+        Args:
+            kind (str): The kind of node, either "actions" or "triggers".
+            name (str): The name of the action or trigger.
+
+        Returns:
+            str: The allocated ID.
+        """
+        return str(uuid.uuid4())
+
+
+class DeterministicIdAllocator(IdAllocator):
+    """
+    Allocates operationMetadataIds as uuid5 over the path of the node (for example "actions/Compose_1"),
+    so that rebuilding an unchanged flow produces the same IDs.
+
+    Action names are unique within a flow, so the path identifies the node.
+
+    Example:
+        flow.export(DeterministicIdAllocator("my-build-seed"))
+    """
+
+    def __init__(self, namespace: uuid.UUID|str|None = None):
+        """
+        Initializes the allocator.
+
+        Args:
+            namespace (uuid.UUID|str, optional): The UUID namespace of the generated IDs, or a seed string from which
+                the namespace is derived. Defaults to a namespace fixed for PyPowerAutomate.
+        """
+        if namespace is None:
+            namespace = DEFAULT_NAMESPACE
+        elif isinstance(namespace, str):
+            namespace = uuid.uuid5(DEFAULT_NAMESPACE, namespace)
+        self.namespace: uuid.UUID = namespace
+
+    def allocate(self, kind: str, name: str) -> str:
+        return str(uuid.uuid5(self.namespace, f"{kind}/{name}"))
+
+
+DEFAULT_ALLOCATOR = IdAllocator()
+_current_allocator: ContextVar[IdAllocator] = ContextVar("id_allocator", default=DEFAULT_ALLOCATOR)
+
+
+def current_allocator() -> IdAllocator:
+    """
+    Returns the allocator used for IDs allocated at this point, `DEFAULT_ALLOCATOR` unless `use_allocator` is active.
+
+    Returns:
+        IdAllocator: The current allocator.
+    """
+    return _current_allocator.get()
+
+
+@contextmanager
+def use_allocator(allocator: IdAllocator) -> Iterator[IdAllocator]:
+    """
+    Makes the given allocator the current one while the context is active.
+
+    Args:
+        allocator (IdAllocator): The allocator to use.
+    """
+    token = _current_allocator.set(allocator)
+    try:
+        yield allocator
+    finally:
+        _current_allocator.reset(token)
+
+
+# The allocator, the name and the ID of the last operationMetadataId allocated for an action or trigger.
+Allocation = Tuple[IdAllocator, str, str]
+
+
+def assign_id(metadata: Dict, allocation: Allocation|None, kind: str, name: str) -> Tuple[Dict, Allocation|None]:
+    """
+    Sets the operationMetadataId of an action or trigger from the current allocator, unless it was set explicitly.
+
+    The ID allocated last is kept while the current allocator and the name are the same as when it was allocated,
+    so that exporting twice gives the same IDs. Otherwise a new ID is allocated: a DeterministicIdAllocator made
+    current after an earlier export still gives its IDs. A reallocated ID is set in a copy of the metadata, so
+    the metadata held by earlier exports, possibly from other threads, is not changed.
+
+    Args:
+        metadata (Dict): The metadata of the action or trigger. An ID allocated for the first time is set in place.
+        allocation (Allocation|None): The last allocation for the action or trigger, or None.
+        kind (str): The kind of node, either "actions" or "triggers".
+        name (str): The name of the action or trigger.
+
+    Returns:
+        Tuple[Dict, Allocation|None]: The metadata to keep for the action or trigger, and the allocation to remember.
+    """
+    allocator = current_allocator()
+    current_id = metadata.get("operationMetadataId")
+    if current_id is not None:
+        if allocation is None or current_id != allocation[2]:
+            return metadata, allocation
+        if allocation[0] is allocator and allocation[1] == name:
+            return metadata, allocation
+    new_id = allocator.allocate(kind, name)
+    if current_id is None:
+        # setdefault keeps the first ID if flows sharing the node are exported from several threads.
+        new_id = metadata.setdefault("operationMetadataId", new_id)
+    else:
+        metadata = {**metadata, "operationMetadataId": new_id}
+    return metadata, (allocator, name, new_id)
@@ -0,0 +1,6 @@
+from .report import OptimizationReport
+from .references import ActionAccesses, scan_action
+from .parallelize import parallelize
+from .deadcode import eliminate_dead_code
+from .hoist import hoist_common_calls, is_read_only_call
+from .flatten import flatten, action_count, nesting_depth
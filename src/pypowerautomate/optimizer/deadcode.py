@@ -0,0 +1,221 @@
+from typing import Dict, List, Set, Tuple
+
+from ..actions import Actions, BaseAction, ComposeAction, Condition, IfStatement, InitVariableAction, ScopeStatement, SwitchStatement, CaseStatement
+from ..flow import Flow
+from .references import VARIABLE_WRITE_TYPES, handles_errors, handles_errors_inside, is_referenced, iter_action_sets, iter_actions, reference_key, scan_action
+from .report import OptimizationReport
+
+_UNKNOWN = object()
+
+_COMPARISONS = {
+    "equals": lambda a, b: a == b,
+    "greater": lambda a, b: a > b,
+    "greaterOrEquals": lambda a, b: a >= b,
+    "less": lambda a, b: a < b,
+    "lessOrEquals": lambda a, b: a <= b,
+    "contains": lambda a, b: b in a,
+    "startsWith": lambda a, b: a.startswith(b),
+    "endsWith": lambda a, b: a.endswith(b),
+}
+
+
+def constant_value(expression: object) -> object:
+    """
+    Evaluates an If condition, as exported for the "expression" field, when it does not depend on run-time values.
+
+    Args:
+        expression (object): The exported condition.
+
+    Returns:
+        object: The value of the condition, or `_UNKNOWN` if it depends on run-time values.
+    """
+    if isinstance(expression, str):
+        if expression in ("@true", "@true()", "@{true}"):
+            return True
+        if expression in ("@false", "@false()", "@{false}"):
+            return False
+        # Expressions, including those interpolated into a string with @{...}, are evaluated at run time.
+        return _UNKNOWN if expression.startswith("@") or "@{" in expression else expression
+    if expression is None or isinstance(expression, (bool, int, float)):
+        return expression
+    if not isinstance(expression, dict) or len(expression) != 1:
+        return _UNKNOWN
+
+    operator, operands = next(iter(expression.items()))
+    if operator == "not":
+        value = constant_value(operands[0] if isinstance(operands, list) else operands)
+        return _UNKNOWN if value is _UNKNOWN else not value
+    if not isinstance(operands, list):
+        return _UNKNOWN
+    values = [constant_value(operand) for operand in operands]
+    if operator == "and":
+        if any(value is not _UNKNOWN and not value for value in values):
+            return False
+        return _UNKNOWN if _UNKNOWN in values else True
+    if operator == "or":
+        if any(value is not _UNKNOWN and value for value in values):
+            return True
+        return _UNKNOWN if _UNKNOWN in values else False
+    if operator in _COMPARISONS and len(values) == 2 and _UNKNOWN not in values:
+        try:
+            return _COMPARISONS[operator](*values)
+        except TypeError:
+            return _UNKNOWN
+    return _UNKNOWN
+
+
+def _condition_value(statement: IfStatement) -> object:
+    condition = statement.condition
+    if isinstance(condition, Condition):
+        return constant_value(condition.export())
+    return constant_value(condition.export_in_if())
+
+
+def _is_empty(actions: object) -> bool:
+    return actions is None or (isinstance(actions, Actions) and len(actions.nodes) == 1)
+
+
+def _inline(actions_set: Actions, node: BaseAction, body: Actions|None) -> bool:
+    """
+    Replaces a container action by its actions, or removes it if there are none. Nothing is changed if an action name clashes.
+    """
+    try:
+        actions_set.splice(node, body)
+    except ValueError:
+        return False
+    return True
+
+
+def _fold_if(actions: Actions, actions_set: Actions, node: IfStatement, report: OptimizationReport) -> bool:
+    """
+    Removes an If statement with no actions, or replaces an If statement with a constant condition by its taken
+    branch. The statement is kept if an expression references it, or if the taken branch handles errors.
+
+    Args:
+        actions (Actions): The outermost Actions set, scanned for references to the statement.
+        actions_set (Actions): The Actions set that holds the statement.
+        node (IfStatement): The statement.
+        report (OptimizationReport): The report the change is recorded in.
+
+    Returns:
+        bool: True if the statement was removed or replaced.
+    """
+    if _is_empty(node.true_actions) and _is_empty(node.false_actions):
+        if is_referenced(actions, node) or not _inline(actions_set, node, None):
+            return False
+        report.record(node.action_name, "removed If statement with no actions")
+        return True
+    value = _condition_value(node)
+    if value is _UNKNOWN:
+        return False
+    branch = node.true_actions if value else node.false_actions
+    body = branch if isinstance(branch, Actions) else None
+    if (body is not None and handles_errors_inside(body)) or is_referenced(actions, node):
+        return False
+    if not _inline(actions_set, node, body):
+        return False
+    report.record(node.action_name, f"replaced If statement with a constant condition by its {'true' if value else 'false'} branch")
+    return True
+
+
+def eliminate_dead_code(target: Flow|Actions) -> OptimizationReport:
+    """
+    Removes actions that have no effect on the run, at every nesting level, repeating until nothing changes:
+
+    - Compose actions whose outputs are never referenced.
+    - If statements whose condition is constant; the taken branch is inlined in their place.
+    - If statements with no actions in either branch, and Scope statements with no actions.
+    - Switch cases with no actions, when the default case has no actions either (otherwise the default case
+      would run instead), and Switch statements left with no actions at all.
+    - Variables that are never read, together with the actions that initialize or modify them.
+
+    Actions that take part in error handling (run-after conditions on states other than Succeeded, towards them
+    or from them) are kept, since removing them would change when those handlers run. Statements that an
+    expression references, e.g. through actions() or result(), are kept too, as are constant If statements whose
+    taken branch handles errors. The pass is opt-in: call it before exporting.
+
+    Args:
+        target (Flow|Actions): The flow or the actions to optimize.
+
+    Returns:
+        OptimizationReport: The removed and folded actions.
+    """
+    actions = target.root_actions if isinstance(target, Flow) else target
+    report = OptimizationReport("eliminate_dead_code")
+    changed = True
+    while changed:
+        changed = False
+        for actions_set in list(iter_action_sets(actions)):
+            changed |= _fold_statements(actions, actions_set, report)
+        changed |= _remove_unreferenced_compose(actions, report)
+        changed |= _remove_unread_variables(actions, report)
+    return report
+
+
+def _fold_statements(actions: Actions, actions_set: Actions, report: OptimizationReport) -> bool:
+    changed = False
+    for node in list(actions_set.nodes.values()):
+        if node is actions_set.root_node or handles_errors(actions_set, node):
+            continue
+        if isinstance(node, IfStatement):
+            changed |= _fold_if(actions, actions_set, node, report)
+        elif isinstance(node, ScopeStatement) and _is_empty(node.actions):
+            if not is_referenced(actions, node) and _inline(actions_set, node, None):
+                report.record(node.action_name, "removed Scope statement with no actions")
+                changed = True
+        elif isinstance(node, SwitchStatement) and _is_empty(node.default_case.actions):
+            for case in list(node.cases.nodes.values()):
+                if isinstance(case, CaseStatement) and _is_empty(case.actions):
+                    node.cases.remove(case)
+                    node.used_cases.remove(case.expression)
+                    report.record(case.action_name, f"removed empty case of Switch statement {node.action_name}")
+                    changed = True
+            if len(node.cases.nodes) == 1 and not is_referenced(actions, node) and _inline(actions_set, node, None):
+                report.record(node.action_name, "removed Switch statement with no actions")
+                changed = True
+    return changed
+
+
+def _remove_unreferenced_compose(actions: Actions, report: OptimizationReport) -> bool:
+    all_actions = iter_actions(actions)
+    referenced: Set[str] = set()
+    for _, node in all_actions:
+        references = scan_action(node, nested=False).actions
+        references.discard(reference_key(node.action_name))
+        referenced |= references
+
+    changed = False
+    for actions_set, node in all_actions:
+        if isinstance(node, ComposeAction) and reference_key(node.action_name) not in referenced and not handles_errors(actions_set, node):
+            actions_set.remove(node)
+            report.record(node.action_name, "removed Compose action whose outputs are never referenced")
+            changed = True
+    return changed
+
+
+def _remove_unread_variables(actions: Actions, report: OptimizationReport) -> bool:
+    all_actions = iter_actions(actions)
+    reads: Set[str] = set()
+    writers: Dict[str, List[Tuple[Actions, BaseAction]]] = {}
+    for actions_set, node in all_actions:
+        accesses = scan_action(node, nested=False)
+        # A variable action reading the variable it modifies (e.g. an increment) does not make the variable used.
+        reads |= accesses.reads - accesses.writes if node.type in VARIABLE_WRITE_TYPES else accesses.reads
+        for variable in accesses.writes:
+            writers.setdefault(variable, []).append((actions_set, node))
+
+    changed = False
+    for variable, variable_writers in writers.items():
+        if variable in reads:
+            continue
+        if not any(isinstance(node, InitVariableAction) for _, node in variable_writers):
+            continue
+        if any(len(node.inputs.get("variables", [])) > 1 for _, node in variable_writers if isinstance(node, InitVariableAction)):
+            continue
+        if any(handles_errors(actions_set, node) for actions_set, node in variable_writers):
+            continue
+        for actions_set, node in variable_writers:
+            actions_set.remove(node)
+            report.record(node.action_name, f"removed action on variable {variable}, which is never read")
+        changed = True
+    return changed
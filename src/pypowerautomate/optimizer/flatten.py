@@ -0,0 +1,228 @@
+import json
+import re
+from typing import List, Tuple
+
+from ..actions import Actions, ComposeAction, IfStatement, ScopeStatement, SwitchStatement, CaseStatement
+from ..flow import Flow
+from .deadcode import _fold_if, _inline
+from .references import ACTION_REFERENCE_PATTERN, VARIABLE_REFERENCE_PATTERN, handles_errors, handles_errors_inside, is_referenced, iter_action_sets, iter_actions, reference_key, scan_action
+from .report import OptimizationReport
+
+OUTPUTS_REFERENCE_PATTERN = re.compile(r"\boutputs\(\s*'((?:[^']|'')+)'\s*\)")
+
+# Functions that return a different value on each call, so their expressions must not be evaluated more often.
+_VOLATILE_FUNCTIONS = re.compile(r"\b(?:utcNow|guid|rand)\(")
+
+
+def action_count(actions: Actions) -> int:
+    """
+    Counts the actions of an Actions set and of the Actions sets nested in it. Switch cases are not counted,
+    as they are not actions of the flow.
+
+    Args:
+        actions (Actions): The outermost Actions set.
+
+    Returns:
+        int: The number of actions.
+    """
+    return len(iter_actions(actions))
+
+
+def nesting_depth(actions: Actions) -> int:
+    """
+    Measures the nesting depth of an Actions set: 1 for a set of plain actions, plus one for each level of
+    If, Switch, Foreach, Until or Scope actions. An empty set has a depth of 0.
+
+    Args:
+        actions (Actions): The outermost Actions set.
+
+    Returns:
+        int: The nesting depth.
+    """
+    depth = 0
+    stack = [(actions, 1)]
+    while stack:
+        actions_set, level = stack.pop()
+        for node in actions_set.nodes.values():
+            if node is actions_set.root_node:
+                continue
+            depth = max(depth, level)
+            stack.extend((child, level + 1) for child in node.get_child_actions())
+    return depth
+
+
+def flatten(target: Flow|Actions) -> OptimizationReport:
+    """
+    Reduces the number of actions and the nesting depth of a flow, which Power Automate both limits, without
+    changing what the flow does. Repeats until nothing changes:
+
+    - Scope statements are replaced by their actions, when they take no part in error handling (neither the
+      Scope nor the actions directly in it have run-after conditions on states other than Succeeded) and no
+      expression references them, e.g. through result().
+    - Switch statements with no case are replaced by the actions of their default case, under the same conditions.
+    - If statements with no actions in either branch are removed, and those with a constant condition are
+      replaced by the taken branch.
+    - A Compose action used only by the Compose action that runs after it is merged into it: its inputs are
+      substituted for the outputs() references. Inputs that read variables, or that call utcNow(), guid() or
+      rand() when they are referenced more than once, are not substituted, since they would be evaluated at a
+      different time or more often.
+
+    The report holds the action counts and nesting depths before and after the pass, as the metrics
+    "actions_before", "actions_after", "depth_before" and "depth_after". Actions are modified in place.
+
+    Args:
+        target (Flow|Actions): The flow or the actions to flatten.
+
+    Returns:
+        OptimizationReport: The flattened and merged actions.
+    """
+    actions = target.root_actions if isinstance(target, Flow) else target
+    report = OptimizationReport("flatten")
+    report.set_metric("actions_before", action_count(actions))
+    report.set_metric("depth_before", nesting_depth(actions))
+    changed = True
+    while changed:
+        changed = False
+        for actions_set in list(iter_action_sets(actions)):
+            changed |= _inline_containers(actions, actions_set, report)
+        changed |= _merge_compose_chains(actions, report)
+    report.set_metric("actions_after", action_count(actions))
+    report.set_metric("depth_after", nesting_depth(actions))
+    return report
+
+
+def _inline_containers(actions: Actions, actions_set: Actions, report: OptimizationReport) -> bool:
+    changed = False
+    for node in list(actions_set.nodes.values()):
+        if node is actions_set.root_node or handles_errors(actions_set, node):
+            continue
+        if isinstance(node, IfStatement):
+            changed |= _fold_if(actions, actions_set, node, report)
+        elif isinstance(node, ScopeStatement):
+            body = node.actions
+            if not isinstance(body, Actions) or handles_errors_inside(body) or is_referenced(actions, node):
+                continue
+            if _inline(actions_set, node, body):
+                report.record(node.action_name, "replaced Scope statement by its actions")
+                changed = True
+        elif isinstance(node, SwitchStatement):
+            if any(isinstance(case, CaseStatement) for case in node.cases.nodes.values()):
+                continue
+            body = node.default_case.actions
+            if handles_errors_inside(body) or is_referenced(actions, node):
+                continue
+            if _inline(actions_set, node, body):
+                report.record(node.action_name, "replaced Switch statement with no case by its default actions")
+                changed = True
+    return changed
+
+
+def _substitute(value: object, name: str, inputs: object) -> Tuple[object, int]:
+    """
+    Returns a copy of a parameter value with the outputs() references to a Compose action replaced by its inputs,
+    and the number of replaced references. The count is -1 if a reference cannot be replaced.
+    """
+    if isinstance(value, str):
+        if "(" not in value:
+            return value, 0
+        matches = [match for match in OUTPUTS_REFERENCE_PATTERN.finditer(value) if reference_key(match.group(1).replace("''", "'")) == name]
+        if not matches:
+            return value, 0
+        if len(matches) == 1 and value == "@" + matches[0].group(0):
+            return inputs, 1
+        if len(matches) == 1 and value == "@{" + matches[0].group(0) + "}" and isinstance(inputs, str) and not (inputs.startswith("@") and not inputs.startswith(("@@", "@{"))):
+            # String interpolation of a string: the string itself.
+            return inputs, 1
+        if not (value.startswith("@") and not value.startswith(("@@", "@{"))):
+            # Only references inside @{...} are expressions; elsewhere the text is literal.
+            if any(value.rfind("@{", 0, match.start()) <= value.rfind("}", 0, match.start()) for match in matches):
+                return value, -1
+        if isinstance(inputs, str) and inputs.startswith("@") and not inputs.startswith(("@@", "@{")):
+            text = inputs[1:]
+        elif isinstance(inputs, str) and "@" not in inputs:
+            text = "'" + inputs.replace("'", "''") + "'"
+        elif isinstance(inputs, (bool, int)) or inputs is None:
+            text = json.dumps(inputs)
+        else:
+            return value, -1
+        parts = []
+        position = 0
+        for match in matches:
+            parts.append(value[position:match.start()])
+            parts.append(text)
+            position = match.end()
+        parts.append(value[position:])
+        return "".join(parts), len(matches)
+    if isinstance(value, dict):
+        items = {}
+        total = 0
+        for key, item in value.items():
+            new_key, count = _substitute(key, name, inputs)
+            if count < 0 or not isinstance(new_key, str):
+                return value, -1
+            new_item, item_count = _substitute(item, name, inputs)
+            if item_count < 0:
+                return value, -1
+            items[new_key] = new_item
+            total += count + item_count
+        return (items if total else value), total
+    if isinstance(value, (list, tuple)):
+        values = []
+        total = 0
+        for item in value:
+            new_item, count = _substitute(item, name, inputs)
+            if count < 0:
+                return value, -1
+            values.append(new_item)
+            total += count
+        return (type(value)(values) if total else value), total
+    return value, 0
+
+
+def _merge_compose_chains(actions: Actions, report: OptimizationReport) -> bool:
+    all_actions = iter_actions(actions)
+    users = {}
+    for _, node in all_actions:
+        for key in scan_action(node, nested=False).actions:
+            if key != reference_key(node.action_name):
+                users.setdefault(key, []).append(node)
+
+    changed = False
+    removed = set()
+    for actions_set, node in all_actions:
+        if not isinstance(node, ComposeAction) or id(node) in removed or handles_errors(actions_set, node):
+            continue
+        key = reference_key(node.action_name)
+        node_users = users.get(key, [])
+        if len(node_users) != 1 or id(node_users[0]) in removed:
+            continue
+        user = node_users[0]
+        if not isinstance(user, ComposeAction) or actions_set.get(user.action_name) is not user or node.action_name not in actions_set.runafter_of(user):
+            continue
+        # Every reference must go through outputs(), which the substitution replaces.
+        references = sum(1 for text in _strings(user.inputs) for match in ACTION_REFERENCE_PATTERN.finditer(text) if reference_key(match.group(1).replace("''", "'")) == key)
+        inputs = node.inputs
+        expressions = list(_strings(inputs))
+        if any(VARIABLE_REFERENCE_PATTERN.search(text) for text in expressions):
+            continue
+        new_inputs, count = _substitute(user.inputs, key, inputs)
+        if count != references or count < 1:
+            continue
+        if count > 1 and any(_VOLATILE_FUNCTIONS.search(text) for text in expressions):
+            continue
+        user.inputs = new_inputs
+        actions_set.remove(node)
+        removed.add(id(node))
+        report.record(node.action_name, f"merged into Compose action {user.action_name}")
+        changed = True
+    return changed
+
+
+def _strings(value: object) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [text for key, item in value.items() for text in _strings(key) + _strings(item)]
+    if isinstance(value, (list, tuple)):
+        return [text for item in value for text in _strings(item)]
+    return []
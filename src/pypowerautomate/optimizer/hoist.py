@@ -0,0 +1,190 @@
+import json
+from typing import Callable, Dict, List, Set, Tuple
+
+from ..actions import Actions, BaseAction, InitVariableAction, ScopeStatement
+from ..actions.base import RUN_AFTER_SUCCEEDED
+from ..flow import Flow
+from .references import handles_errors, iter_action_sets, iter_actions, reference_key, rewrite_references, scan_action, scan_objects
+from .report import OptimizationReport
+
+READ_ONLY_OPERATION_PREFIXES = ("Get", "List")
+
+
+def is_read_only_call(action: BaseAction) -> bool:
+    """
+    Checks whether an action is a connector call that only reads data, judging by its operationId
+    (operations starting with "Get" or "List").
+
+    Args:
+        action (BaseAction): The action.
+
+    Returns:
+        bool: True if the action is a read-only connector call.
+    """
+    host = getattr(action, "connection_host", None)
+    return isinstance(host, dict) and str(host.get("operationId", "")).startswith(READ_ONLY_OPERATION_PREFIXES)
+
+
+def _call_key(action: BaseAction) -> str|None:
+    """
+    Hashes the exported inputs of a connector call, which come from the class-level `connection_host` and the parameters,
+    together with its runtime configuration (e.g. pagination). The metadata of the action is left as it was, so no
+    operationMetadataId is allocated.
+    """
+    metadata, allocation = action._metadata, action._allocation
+    action._metadata = dict(metadata) if metadata is not None else None
+    try:
+        exported = action.export()
+    finally:
+        action._metadata, action._allocation = metadata, allocation
+    inputs = exported.get("inputs")
+    if inputs is None:
+        return None
+    return json.dumps([action.type, inputs, exported.get("runtimeConfiguration")], sort_keys=True, default=str)
+
+
+def hoist_common_calls(target: Flow|Actions, read_only: Callable[[BaseAction], bool] = is_read_only_call) -> OptimizationReport:
+    """
+    Replaces duplicate connector calls, with identical inputs, by a single call at the top of the flow.
+
+    The calls are grouped by their exported inputs. A group is hoisted when it has at least two calls, all of
+    them read-only (see `is_read_only_call`), none of them taking part in error handling, and their inputs do
+    not depend on values local to a branch or a loop (other actions, variables or loop items). At least one of
+    the calls must be unconditional, i.e. at the top level or nested only in Scope statements, so that every run
+    that completes already made the call: calls that are all inside If or Switch branches, or loop bodies, are
+    left alone, since hoisting them would make the call on paths that did not make it before.
+
+    The unconditional call that runs first is kept, and the references to the other calls are rewritten to point at it.
+    If it is at the top level and the other calls run after it, it stays where it is. Otherwise it is moved to
+    the top level, where the top-level action holding it was: after the nearest actions that all the calls run
+    after, with the run-after states of that action, so that it still runs after any write that preceded the
+    calls. Top-level actions that use the call, directly or in their nested actions, run after it.
+
+    A group is left as it is if a reference to one of its calls is held by an Expression or Condition object,
+    which cannot be rewritten, or by a variable initialization. Actions are modified in place.
+
+    Args:
+        target (Flow|Actions): The flow or the actions to optimize.
+        read_only (Callable[[BaseAction], bool]): Selects the calls that may be hoisted.
+
+    Returns:
+        OptimizationReport: The hoisted and removed calls.
+    """
+    actions = target.root_actions if isinstance(target, Flow) else target
+    report = OptimizationReport("hoist_common_calls")
+    all_actions = iter_actions(actions)
+
+    unconditional = _unconditional_sets(actions)
+    groups: Dict[str, List[Tuple[Actions, BaseAction]]] = {}
+    for actions_set, node in all_actions:
+        if not read_only(node) or handles_errors(actions_set, node):
+            continue
+        accesses = scan_action(node)
+        if accesses.actions or accesses.reads or accesses.writes:
+            continue
+        key = _call_key(node)
+        if key is not None:
+            groups.setdefault(key, []).append((actions_set, node))
+
+    for calls in groups.values():
+        if len(calls) < 2 or not any(id(actions_set) in unconditional for actions_set, _ in calls):
+            continue
+        names = {reference_key(node.action_name) for _, node in calls}
+        if any(scan_objects(node) & names for _, node in all_actions):
+            continue
+        top_level = actions.topological_order()
+        initializations = [node for node in top_level if isinstance(node, InitVariableAction)]
+        if any(scan_action(node).actions & names for node in initializations):
+            continue
+        _hoist(actions, calls, names, unconditional, top_level, initializations, all_actions, report)
+        all_actions = iter_actions(actions)
+    return report
+
+
+def _unconditional_sets(actions: Actions) -> Set[int]:
+    """
+    Returns the ids of the Actions sets whose actions run whenever the outermost set runs: the outermost set and
+    the bodies of the Scope statements they hold, at any depth.
+    """
+    unconditional = set()
+    stack = [actions]
+    while stack:
+        actions_set = stack.pop()
+        unconditional.add(id(actions_set))
+        stack.extend(node.actions for node in actions_set.nodes.values() if isinstance(node, ScopeStatement) and isinstance(node.actions, Actions))
+    return unconditional
+
+
+def _anchors(actions: Actions, calls: List[Tuple[Actions, BaseAction]], top_level: List[BaseAction]) -> List[BaseAction]:
+    """
+    Returns the top-level action of each call: the call itself, or the top-level action it is nested in.
+    """
+    anchor_of = {}
+    for node in top_level:
+        for child in node.get_child_actions():
+            for actions_set in iter_action_sets(child):
+                anchor_of[id(actions_set)] = node
+    return [node if actions_set is actions else anchor_of[id(actions_set)] for actions_set, node in calls]
+
+
+def _ancestors(actions: Actions, top_level: List[BaseAction]) -> Dict[str, Set[str]]:
+    """
+    Returns the names of the top-level actions that each top-level action runs after, directly or not.
+    """
+    ancestors: Dict[str, Set[str]] = {}
+    for node in top_level:
+        names = set()
+        for name in actions.runafter_of(node):
+            names.add(name)
+            names |= ancestors.get(name, set())
+        ancestors[node.action_name] = names
+    return ancestors
+
+
+def _hoist(actions: Actions, calls: List[Tuple[Actions, BaseAction]], names: set, unconditional: Set[int], top_level: List[BaseAction], initializations: List[BaseAction], all_actions: List[Tuple[Actions, BaseAction]], report: OptimizationReport):
+    ancestors = _ancestors(actions, top_level)
+    anchors = _anchors(actions, calls, top_level)
+    order = {id(node): index for index, node in enumerate(top_level)}
+    position = min((position for position, (actions_set, _) in enumerate(calls) if id(actions_set) in unconditional), key=lambda position: order[id(anchors[position])])
+    kept_set, first = calls[position]
+    kept_name = first.action_name
+    anchor = anchors[position]
+    in_place = kept_set is actions and all(other is first or kept_name in ancestors[other.action_name] for other in anchors)
+
+    if in_place:
+        hoisted = first
+        for actions_set, node in calls:
+            if node is not first:
+                actions_set.remove(node)
+        report.record(kept_name, f"kept in place, shared by {len(calls)} identical calls")
+    else:
+        common = set.intersection(*(ancestors[other.action_name] for other in anchors))
+        nearest = [node.action_name for node in top_level if node.action_name in common and not any(node.action_name in ancestors[other] for other in common)]
+        anchor_runafter = actions.runafter_of(anchor)
+        prev_actions = {name: anchor_runafter.get(name, RUN_AFTER_SUCCEEDED) for name in nearest}
+        if not prev_actions and initializations:
+            prev_actions = {initializations[-1].action_name: RUN_AFTER_SUCCEEDED}
+        for actions_set, node in calls:
+            actions_set.remove(node)
+        actions.name_registry.release(kept_name)
+        hoisted = first.clone()
+        hoisted.action_name = kept_name
+        actions.add_top(hoisted)
+        if prev_actions:
+            actions.set_runafter(hoisted, {actions.get(name): states for name, states in prev_actions.items()})
+        report.record(kept_name, f"hoisted to the top level, shared by {len(calls)} identical calls")
+
+    renames = {name: kept_name for name in names}
+    for _, node in all_actions:
+        rewrite_references(node, renames)
+    for _, node in calls:
+        if node is not first:
+            report.record(node.action_name, f"removed, references now point at {kept_name}")
+
+    for node in top_level:
+        if node in actions and node is not hoisted and scan_action(node).actions & {reference_key(kept_name)}:
+            if in_place and kept_name in ancestors[node.action_name]:
+                continue
+            runafter = {actions.get(name): states for name, states in actions.runafter_of(node).items()}
+            runafter[hoisted] = RUN_AFTER_SUCCEEDED
+            actions.set_runafter(node, runafter)
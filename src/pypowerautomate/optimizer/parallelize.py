@@ -0,0 +1,156 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from ..actions import Actions, BaseAction
+from ..actions.base import RUN_AFTER_SUCCEEDED
+from ..flow import Flow
+from .hoist import is_read_only_call
+from .references import index_by_reference, iter_actions, reference_key, scan_action
+from .report import OptimizationReport
+
+# Actions that everything before them must have finished for, and that nothing after them may start before:
+# variable initializations, which run in sequence before other actions, and actions that end the run or answer the caller.
+BARRIER_TYPES = frozenset(["InitializeVariable", "Response", "Terminate"])
+
+
+def parallelize(target: Flow|Actions, recursive: bool = True, keep_order: Callable[[BaseAction], bool]|None = None) -> OptimizationReport:
+    """
+    Rewires the run-after conditions so that actions only wait for the actions they depend on, letting
+    independent actions run as parallel branches.
+
+    An action depends on:
+    - the actions it references through body(), outputs(), actions(), result(), items() and similar functions,
+      or the If, Switch, Foreach, Until or Scope actions that hold them,
+    - for a variable it reads, the last action before it that writes the variable,
+    - for a variable it writes, the last action that writes the variable and the actions that read it since,
+    - for a connector call that only reads data (see `is_read_only_call`), the last connector call before it that
+      does not, and for a connector call that does not, that call and the read-only connector calls since,
+      or, when `keep_order` is given instead, the last action before it for which `keep_order` returns True,
+      if it returns True for this action too,
+    - all the previous actions if it is an InitializeVariable, Response or Terminate action, and the last such action otherwise.
+
+    Run-after conditions on states other than Succeeded (error handling) are kept unchanged, together with
+    the conditions of the actions that run after those handlers. Redundant conditions, implied by other ones,
+    are dropped.
+
+    An If, Switch, Foreach, Until or Scope action counts as a connector call that does not only read data if one of
+    its nested actions is such a call, and as a read-only call if one of them is a read-only call.
+
+    Other dependencies that are not visible in the flow definition, such as a connector call and an HTTP request
+    to the same service, are not detected. Use `keep_order` to choose the actions that keep their original order.
+
+    Args:
+        target (Flow|Actions): The flow or the actions to rewire.
+        recursive (bool): If True, the nested actions of If, Switch, Foreach, Until and Scope actions are rewired too.
+        keep_order (Callable[[BaseAction], bool], optional): Selects the actions that must keep their relative order,
+            replacing the ordering of connector calls.
+
+    Returns:
+        OptimizationReport: The actions whose run-after conditions changed.
+    """
+    actions = target.root_actions if isinstance(target, Flow) else target
+    report = OptimizationReport("parallelize")
+    _parallelize(actions, recursive, keep_order, report)
+    return report
+
+
+def _parallelize(actions: Actions, recursive: bool, keep_order: Callable[[BaseAction], bool]|None, report: OptimizationReport):
+    order = actions.topological_order()
+    position_by_id = {id(node): position for position, node in enumerate(order)}
+    # A reference to an action nested in an If, Switch, Foreach, Until or Scope action is a dependency on that action.
+    position_by_reference = {}
+    for position, node in enumerate(order):
+        for child in node.get_child_actions():
+            for _, nested_node in iter_actions(child):
+                position_by_reference[reference_key(nested_node.action_name)] = position
+    position_by_reference.update((name, position_by_id[id(node)]) for name, node in index_by_reference(actions).items())
+    position_by_name = {node.action_name: position for position, node in enumerate(order)}
+
+    pinned = [any(tuple(states) != RUN_AFTER_SUCCEEDED for states in actions.runafter_of(node).values()) for node in order]
+    ancestors: List[int] = []
+    last_writers: Dict[str, int] = {}
+    readers: Dict[str, List[int]] = {}
+    last_ordered = None
+    data_readers: List[int] = []
+    last_barrier = None
+    for position, node in enumerate(order):
+        if recursive:
+            for child in node.get_child_actions():
+                _parallelize(child, recursive, keep_order, report)
+
+        original = actions.runafter_of(node)
+        kept: Dict[int, Sequence[str]] = {}
+        for name, states in original.items():
+            prev_position = position_by_name[name]
+            if pinned[position] or pinned[prev_position]:
+                kept[prev_position] = states
+
+        dependencies = set(kept)
+        accesses = scan_action(node)
+        for name in accesses.actions:
+            prev_position = position_by_reference.get(name)
+            if prev_position is not None and prev_position < position:
+                dependencies.add(prev_position)
+        for variable in accesses.reads - accesses.writes:
+            if variable in last_writers:
+                dependencies.add(last_writers[variable])
+        for variable in accesses.writes:
+            if variable in last_writers:
+                dependencies.add(last_writers[variable])
+            dependencies.update(readers.get(variable, ()))
+        if keep_order is None:
+            reads_data, writes_data = _data_accesses(node)
+            if (reads_data or writes_data) and last_ordered is not None:
+                dependencies.add(last_ordered)
+            if writes_data:
+                dependencies.update(data_readers)
+                last_ordered = position
+                data_readers = []
+            elif reads_data:
+                data_readers.append(position)
+        elif keep_order(node):
+            if last_ordered is not None:
+                dependencies.add(last_ordered)
+            last_ordered = position
+        if node.type in BARRIER_TYPES:
+            dependencies.update(range(position))
+            last_barrier = position
+        elif last_barrier is not None:
+            dependencies.add(last_barrier)
+
+        for variable in accesses.reads - accesses.writes:
+            readers.setdefault(variable, []).append(position)
+        for variable in accesses.writes:
+            last_writers[variable] = position
+            readers[variable] = []
+
+        implied = 0
+        for prev_position in dependencies:
+            implied |= ancestors[prev_position]
+        required = sorted(prev_position for prev_position in dependencies if prev_position in kept or not implied >> prev_position & 1)
+        mask = implied
+        for prev_position in dependencies:
+            mask |= 1 << prev_position
+        ancestors.append(mask)
+
+        runafter = {order[prev_position].action_name: tuple(kept.get(prev_position, RUN_AFTER_SUCCEEDED)) for prev_position in required}
+        if runafter != {name: tuple(states) for name, states in original.items()}:
+            actions.set_runafter(node, {order[prev_position]: runafter[order[prev_position].action_name] for prev_position in required})
+            before = ", ".join(original) or "(top)"
+            after = ", ".join(runafter) or "(top)"
+            report.record(node.action_name, f"runs after {after} instead of {before}")
+
+
+def _data_accesses(node: BaseAction) -> Tuple[bool, bool]:
+    """
+    Checks whether an action, or one of its nested actions, is a connector call that only reads data,
+    and whether one is a connector call that does not.
+    """
+    reads = writes = False
+    for action in [node, *(nested_node for child in node.get_child_actions() for _, nested_node in iter_actions(child))]:
+        if not isinstance(getattr(action, "connection_host", None), dict):
+            continue
+        if is_read_only_call(action):
+            reads = True
+        else:
+            writes = True
+    return reads, writes
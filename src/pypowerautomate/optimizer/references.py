@@ -0,0 +1,288 @@
+import re
+from typing import Dict, Iterator, List, Set, Tuple
+
+from ..actions import Actions, RawActions, BaseAction, Condition, Expression
+from ..actions.base import RUN_AFTER_SUCCEEDED, _copied_attributes
+from ..actions.variable import VARIABLE_WRITE_TYPES
+
+ACTION_REFERENCE_PATTERN = re.compile(r"\b(?:actions|actionBody|actionOutputs|body|outputs|result|items|iterationIndexes)\(\s*'((?:[^']|'')+)'")
+VARIABLE_REFERENCE_PATTERN = re.compile(r"\bvariables\(\s*'((?:[^']|'')+)'")
+
+# Attributes that hold the identity of an action rather than its parameters.
+_IGNORED_ATTRIBUTES = frozenset(["action_name", "type", "_metadata"])
+
+
+def iter_strings(value: object, nested: bool = True) -> Iterator[str]:
+    """
+    Yields every string held by a value: the parameters of an action, including the actions nested in it,
+    or the contents of dictionaries, sequences, expressions and conditions.
+
+    Args:
+        value (object): The value to scan.
+        nested (bool): If False, the actions nested in an action are skipped.
+
+    Returns:
+        Iterator[str]: The strings.
+    """
+    root = value
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif isinstance(value, BaseAction):
+            if not nested and value is not root:
+                continue
+            stack.extend(getattr(value, name, None) for name in _copied_attributes(type(value)) if name not in _IGNORED_ATTRIBUTES)
+        elif isinstance(value, Actions):
+            if not nested:
+                continue
+            stack.extend(node for node in value.nodes.values() if node is not value.root_node)
+        elif isinstance(value, RawActions):
+            stack.append(value.definition)
+        elif isinstance(value, (Expression, Condition)):
+            stack.append(value.export())
+
+
+def _rewrite_value(value: object, pattern: re.Pattern, renames: Dict[str, str]) -> object:
+    """
+    Returns a copy of a parameter value with the action references renamed, or the value itself if nothing changed.
+    """
+    if isinstance(value, str):
+        if "(" not in value:
+            return value
+
+        def rename(match: re.Match) -> str:
+            new_name = renames.get(reference_key(match.group(1).replace("''", "'")))
+            if new_name is None:
+                return match.group(0)
+            start, end = match.span(1)
+            quoted = reference_key(new_name).replace("'", "''")
+            return match.group(0)[:start - match.start()] + quoted + match.group(0)[end - match.start():]
+
+        return pattern.sub(rename, value)
+    if isinstance(value, dict):
+        items = [(_rewrite_value(key, pattern, renames), _rewrite_value(item, pattern, renames)) for key, item in value.items()]
+        if all(new_key is key and new_item is item for (new_key, new_item), (key, item) in zip(items, value.items())):
+            return value
+        return dict(items)
+    if isinstance(value, (list, tuple)):
+        values = [_rewrite_value(item, pattern, renames) for item in value]
+        if all(new_item is item for new_item, item in zip(values, value)):
+            return value
+        return type(value)(values)
+    return value
+
+
+def rewrite_references(action: BaseAction, renames: Dict[str, str]) -> bool:
+    """
+    Renames the action references in the parameters of an action, not including the actions nested in it.
+    Parameters are replaced with rewritten copies, so dictionaries shared with other actions are not modified.
+
+    Expression and Condition objects are not rewritten; use `scan_objects` to check that they hold no
+    reference to rename.
+
+    Args:
+        action (BaseAction): The action to rewrite.
+        renames (Dict[str, str]): The new action names, keyed by the normalized old names.
+
+    Returns:
+        bool: True if a reference was renamed.
+    """
+    changed = False
+    for name in _copied_attributes(type(action)):
+        if name in _IGNORED_ATTRIBUTES:
+            continue
+        value = getattr(action, name, None)
+        if isinstance(value, (BaseAction, Actions, RawActions)):
+            continue
+        new_value = _rewrite_value(value, ACTION_REFERENCE_PATTERN, renames)
+        if new_value is not value:
+            setattr(action, name, new_value)
+            changed = True
+    return changed
+
+
+def scan_objects(action: BaseAction) -> Set[str]:
+    """
+    Collects the actions referenced from the Expression and Condition objects held by an action, which
+    `rewrite_references` cannot rewrite. Nested actions are not included.
+
+    Args:
+        action (BaseAction): The action to scan.
+
+    Returns:
+        Set[str]: The normalized names of the referenced actions.
+    """
+    references = set()
+    for name in _copied_attributes(type(action)):
+        value = getattr(action, name, None)
+        if isinstance(value, (Expression, Condition)):
+            for text in iter_strings(value):
+                references.update(reference_key(match.group(1).replace("''", "'")) for match in ACTION_REFERENCE_PATTERN.finditer(text))
+    return references
+
+
+def reference_key(name: str) -> str:
+    """
+    Normalizes an action name the way Power Automate does in expressions, where spaces become underscores.
+
+    Args:
+        name (str): The action name.
+
+    Returns:
+        str: The normalized name.
+    """
+    return name.replace(" ", "_")
+
+
+class ActionAccesses:
+    """
+    The actions and variables that an action uses, including the actions nested in it.
+
+    Attributes:
+        actions (Set[str]): The normalized names of the actions referenced through body(), outputs(), actions(), result(), items() and similar functions.
+        reads (Set[str]): The variables read through variables().
+        writes (Set[str]): The variables initialized or modified.
+    """
+
+    __slots__ = ("actions", "reads", "writes")
+
+    def __init__(self) -> None:
+        self.actions: Set[str] = set()
+        self.reads: Set[str] = set()
+        self.writes: Set[str] = set()
+
+
+def scan_action(action: BaseAction, nested: bool = True) -> ActionAccesses:
+    """
+    Collects the actions and variables used by an action and by the actions nested in it.
+
+    Args:
+        action (BaseAction): The action to scan.
+        nested (bool): If False, only the parameters of the action itself are scanned.
+
+    Returns:
+        ActionAccesses: The accesses.
+    """
+    accesses = ActionAccesses()
+    for text in iter_strings(action, nested):
+        if "(" not in text:
+            continue
+        for match in ACTION_REFERENCE_PATTERN.finditer(text):
+            accesses.actions.add(reference_key(match.group(1).replace("''", "'")))
+        for match in VARIABLE_REFERENCE_PATTERN.finditer(text):
+            accesses.reads.add(match.group(1).replace("''", "'"))
+
+    stack = [action]
+    while stack:
+        node = stack.pop()
+        inputs = getattr(node, "inputs", None)
+        if node.type == "InitializeVariable" and isinstance(inputs, dict):
+            accesses.writes.update(variable["name"] for variable in inputs.get("variables", []))
+        elif node.type in VARIABLE_WRITE_TYPES and isinstance(inputs, dict):
+            accesses.writes.add(inputs["name"])
+        if not nested:
+            break
+        for child in node.get_child_actions():
+            stack.extend(child_node for child_node in child.nodes.values() if child_node is not child.root_node)
+    return accesses
+
+
+def index_by_reference(actions: Actions) -> Dict[str, BaseAction]:
+    """
+    Maps the normalized names of the actions of an Actions set to the actions.
+
+    Args:
+        actions (Actions): The actions.
+
+    Returns:
+        Dict[str, BaseAction]: The actions keyed by normalized name.
+    """
+    return {reference_key(node.action_name): node for node in actions.nodes.values() if node is not actions.root_node}
+
+
+def iter_action_sets(actions: Actions) -> Iterator[Actions]:
+    """
+    Yields an Actions set and every Actions set nested in its actions, at any depth, in depth-first order.
+
+    Args:
+        actions (Actions): The outermost Actions set.
+
+    Returns:
+        Iterator[Actions]: The Actions sets.
+    """
+    stack = [actions]
+    while stack:
+        actions = stack.pop()
+        yield actions
+        children = [child for node in list(actions.nodes.values()) for child in node.get_child_actions()]
+        stack.extend(reversed(children))
+
+
+def iter_actions(actions: Actions) -> List[Tuple[Actions, BaseAction]]:
+    """
+    Lists every action of an Actions set and of the Actions sets nested in it, with the set that holds it.
+
+    Args:
+        actions (Actions): The outermost Actions set.
+
+    Returns:
+        List[Tuple[Actions, BaseAction]]: The actions with their Actions sets.
+    """
+    return [(actions_set, node) for actions_set in iter_action_sets(actions) for node in actions_set.nodes.values() if node is not actions_set.root_node]
+
+
+def handles_errors(actions: Actions, action: BaseAction) -> bool:
+    """
+    Checks whether an action has run-after conditions on states other than Succeeded, or whether some action
+    runs after it on such states (error handling).
+
+    Args:
+        actions (Actions): The Actions set that holds the action.
+        action (BaseAction): The action.
+
+    Returns:
+        bool: True if the action takes part in error handling.
+    """
+    if any(tuple(states) != RUN_AFTER_SUCCEEDED for states in actions.runafter_of(action).values()):
+        return True
+    for follower in actions.successors(action):
+        states = actions.runafter_of(follower).get(action.action_name)
+        if states is not None and tuple(states) != RUN_AFTER_SUCCEEDED:
+            return True
+    return False
+
+
+def handles_errors_inside(actions: Actions) -> bool:
+    """
+    Checks whether an action of an Actions set has run-after conditions on states other than Succeeded.
+    Inlining such a set into another one would change which failures its handlers see.
+
+    Args:
+        actions (Actions): The Actions set, such as the body of a Scope statement.
+
+    Returns:
+        bool: True if the set handles errors.
+    """
+    return any(tuple(states) != RUN_AFTER_SUCCEEDED for node in actions.nodes.values() for states in actions.runafter_of(node).values())
+
+
+def is_referenced(actions: Actions, action: BaseAction) -> bool:
+    """
+    Checks whether another action references an action through actions(), result(), body() or similar functions.
+
+    Args:
+        actions (Actions): The outermost Actions set, whose actions are scanned at every nesting level.
+        action (BaseAction): The action.
+
+    Returns:
+        bool: True if the action is referenced.
+    """
+    key = reference_key(action.action_name)
+    return any(key in scan_action(node, nested=False).actions for _, node in iter_actions(actions) if node is not action)
@@ -0,0 +1,71 @@
+from typing import Dict, List, Tuple
+
+
+class OptimizationReport:
+    """
+    Records the changes made by an optimizer pass.
+
+    Attributes:
+        pass_name (str): The name of the pass.
+        changes (List[Tuple[str, str]]): The changed action names, each with a description of the change.
+        metrics (Dict[str, object]): Measurements taken by the pass, such as action counts before and after it.
+    """
+
+    def __init__(self, pass_name: str) -> None:
+        self.pass_name: str = pass_name
+        self.changes: List[Tuple[str, str]] = []
+        self.metrics: Dict[str, object] = {}
+
+    def record(self, action_name: str, description: str):
+        """
+        Records a change.
+
+        Args:
+            action_name (str): The name of the changed action.
+            description (str): What was changed.
+        """
+        self.changes.append((action_name, description))
+
+    def set_metric(self, name: str, value: object):
+        """
+        Records a measurement.
+
+        Args:
+            name (str): The name of the measurement.
+            value (object): The measured value.
+        """
+        self.metrics[name] = value
+
+    def merge(self, report: 'OptimizationReport'):
+        """
+        Appends the changes recorded in another report, and takes over its measurements.
+
+        Args:
+            report (OptimizationReport): The other report.
+        """
+        self.changes.extend(report.changes)
+        self.metrics.update(report.metrics)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def export(self) -> Dict:
+        """
+        Exports the report as a dictionary.
+
+        Returns:
+            Dict: The name of the pass, the list of changes and the measurements, if any.
+        """
+        d = {"pass": self.pass_name, "changes": [{"action": name, "change": description} for name, description in self.changes]}
+        if self.metrics:
+            d["metrics"] = dict(self.metrics)
+        return d
+
+    def __str__(self) -> str:
+        lines = [f"{self.pass_name}: {len(self.changes)} change(s)"]
+        lines.extend(f"  [{name}] {value}" for name, value in self.metrics.items())
+        lines.extend(f"  {name}: {description}" for name, description in self.changes)
+        return "\n".join(lines)
@@ -1,22 +1,29 @@
-from typing import List, Dict
+from typing import IO, List, Dict
+import io
 import uuid
-import json
-from os import makedirs, path, walk
-import shutil
+from os import path, remove
 import zipfile
-import tempfile
 from random import randint
 from datetime import datetime, timezone
 
+from ..build import BuildCache, CanonicalBuild, zip_entry
 from ..flow import Flow
+from ..metadata import IdAllocator
+from ..serialization import iter_json_bytes, write_json
 
-def get_timestamp() -> str:
+def get_timestamp(now: datetime|None = None) -> str:
     """
     Generates a timestamp in ISO 8601 format appended with a random single digit, suitable for use in file naming or logging.
 
+    Args:
+        now (datetime, optional): The time to format, in UTC, appended with a zero instead of a random digit.
+            Defaults to the current time.
+
     Returns:
         str: The generated timestamp string in UTC.
     """
+    if now is not None:
+        return now.strftime("%Y-%m-%dT%H:%M:%S.%f") + "0Z"
     now = datetime.now(timezone.utc)
     return now.strftime("%Y-%m-%dT%H:%M:%S.%f") + str(randint(0, 9)) + "Z"
 
@@ -74,7 +81,8 @@ class Resource:
         """
         for resource in resources:
             self.dependencies.append(resource.uuid)
-        self.dependencies = list(set(self.dependencies))
+        # Removes duplicates but keeps the order, so that rebuilt manifests are identical.
+        self.dependencies = list(dict.fromkeys(self.dependencies))
 
     def set_connection_reference_logical_name(self, name: str):
         self.__connection_reference_logical_name = name
@@ -157,16 +165,25 @@ class Package:
     └── manifest.json
     """
 
-    def __init__(self, display_name: str, flow: Flow, languagecode: int = 1033):
+    def __init__(self, display_name: str, flow: Flow, languagecode: int = 1033, id_allocator: IdAllocator|None = None, canonical: CanonicalBuild|None = None):
         """
         Initializes the package with a specific flow and a display name.
 
         Args:
             display_name (str): The name to display for the packaged flow.
             flow (Flow): The Flow object containing the workflow logic and configurations.
+            id_allocator (IdAllocator, optional): The allocator of operationMetadataIds used when exporting the flow.
+                Defaults to the allocator of the canonical build, then to the allocator of the flow.
+            canonical (CanonicalBuild, optional): The settings of a canonical build, which derives the IDs and
+                timestamps of the package from a seed so that rebuilding it produces an identical zip file.
         """
         self.display_name = display_name
-        self.uuid = uuid.uuid4().__str__()
+        self.id_allocator = id_allocator
+        self.canonical = canonical
+        if canonical is not None:
+            self.uuid = canonical.uuid("packages", display_name)
+        else:
+            self.uuid = uuid.uuid4().__str__()
         self.__apis: List[Resource] = []
         self.__connections: List[Resource] = []
         self.__api_connection_map: Dict[Resource, Resource] = {}
@@ -187,11 +204,20 @@ class Package:
     def add_localized_name(self, description: str, languagecode: int):
         self.__localized_names[languagecode] = description
 
+    def __new_resource(self, type: str, suggested_creation_type: str, creation_type: str|None, configurable_by: str, hierarchy: str, display_name: str, icon_uri: str|None = None) -> Resource:
+        """
+        Creates a resource of the package, with an ID derived from its type and display name in a canonical build.
+        """
+        resource = Resource(type, suggested_creation_type, creation_type, configurable_by, hierarchy, display_name, icon_uri)
+        if self.canonical is not None:
+            resource.uuid = self.canonical.uuid("resources", f"{self.uuid}/{type}/{display_name}")
+        return resource
+
     def __set_flow_resource(self):
         """
         Initializes the primary resource for the flow within the package.
         """
-        self.__flow_resource = Resource(
+        self.__flow_resource = self.__new_resource(
             "Microsoft.Flow/flows", "New", "Existing, New, Update", "User", "Root", self.display_name)
 
 
@@ -203,13 +229,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # PowerAutomate Management APIの設定
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Flow Management",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Flow Management",
                        "https://connectoricons-prod.azureedge.net/releases/v1.0.1650/1.0.1650.3374/flowmanagement/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_flowmanagement", "shared_flowmanagement")
 
         # PowerAutomate Management Connectionの設定
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "User",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "User",
                               "https://connectoricons-prod.azureedge.net/releases/v1.0.1644/1.0.1644.3342/flowmanagement/icon.png")
 
         # Connectionの依存APIの設定
@@ -235,13 +261,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # Dropbox APIの設定
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Dropbox",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Dropbox",
                        "https://connectoricons-prod.azureedge.net/releases/v1.0.1651/1.0.1651.3382/dropbox/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_dropbox", "shared_dropbox")
 
         # Dropbox Connectionの設定
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child",
                               "Dropbox", "https://connectoricons-prod.azureedge.net/releases/v1.0.1651/1.0.1651.3382/dropbox/icon.png")
 
         # Connectionの依存APIの設定
@@ -267,13 +293,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # Teams APIの設定
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Microsoft Teams",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Microsoft Teams",
                        "https://connectoricons-prod.azureedge.net/releases/v1.0.1657/1.0.1657.3443/teams/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_teams", "shared_teams")
 
         # Teams Connectionの設定
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child",
                               "Microsoft Teams", "https://connectoricons-prod.azureedge.net/releases/v1.0.1657/1.0.1657.3443/teams/icon.png")
 
         # Connectionの依存APIの設定
@@ -299,13 +325,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # SharePoint APIの設定
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "SharePoint",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "SharePoint",
                        "https://connectoricons-prod.azureedge.net/u/shgogna/globalperconnector-train1/1.0.1639.3312/sharepointonline/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_sharepointonline", "shared_sharepointonline")
 
         # SharePoint Connectionの設定
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "SharePoint",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "SharePoint",
                               "https://connectoricons-prod.azureedge.net/u/shgogna/globalperconnector-train1/1.0.1639.3312/sharepointonline/icon.png")
 
         # Connectionの依存APIの設定
@@ -331,13 +357,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # Outlook 365 APIの設定
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Office 365 Outlook",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Office 365 Outlook",
                        "https://connectoricons-prod.azureedge.net/u/laborbol/partial-builds/ase-v3/1.0.1653.3402/office365/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_office365", "shared_office365")
 
         # Outlook 365 Connectionの設定
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "Office 365 Outlook",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "Office 365 Outlook",
                               "https://connectoricons-prod.azureedge.net/u/laborbol/partial-builds/ase-v3/1.0.1653.3402/office365/icon.png")
 
         # Connectionの依存APIの設定
@@ -363,13 +389,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # Microsoft Forms API Settings
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Microsoft Forms",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Microsoft Forms",
                        "https://connectoricons-prod.azureedge.net/releases/v1.0.1686/1.0.1686.3695/microsoftforms/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_microsoftforms", "shared_microsoftforms")
 
         # Setting up Microsoft Forms Connection
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "Microsoft Forms",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "Microsoft Forms",
                               "https://connectoricons-prod.azureedge.net/releases/v1.0.1686/1.0.1686.3695/microsoftforms/icon.png")
 
         # Setting dependency of connection
@@ -395,13 +421,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # Excel Online API Settings
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Excel Online (Business)",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "Excel Online (Business)",
                        "https://connectoricons-prod.azureedge.net/releases/v1.0.1680/1.0.1680.3652/excelonlinebusiness/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_excelonlinebusiness", "shared_excelonlinebusiness")
 
         # Setting up Excel Online Connection
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "Excel Online (Business)",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "Excel Online (Business)",
                               "https://connectoricons-prod.azureedge.net/releases/v1.0.1680/1.0.1680.3652/excelonlinebusiness/icon.png")
 
         # Setting dependency of connection
@@ -427,13 +453,13 @@ class Package:
             connection_name (str, optional): The name to assign to the connection if it already exists.
         """
         # Excel Online API Settings
-        api = Resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "SQL Server",
+        api = self.__new_resource("Microsoft.PowerApps/apis", "Existing", None, "System", "Child", "SQL Server",
                        "https://connectoricons-prod.azureedge.net/releases/v1.0.1715/1.0.1715.3906/sql/icon.png")
         api.set_api_info(
             "/providers/Microsoft.PowerApps/apis/shared_sql", "shared_sql")
 
         # Setting up Excel Online Connection
-        connection = Resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "SQL Server",
+        connection = self.__new_resource("Microsoft.PowerApps/apis/connections", "Existing", "Existing", "User", "Child", "SQL Server",
                               "https://connectoricons-prod.azureedge.net/releases/v1.0.1715/1.0.1715.3906/sql/icon.png")
 
         # Setting dependency of connection
@@ -467,8 +493,12 @@ class Package:
         details = {}
         details["displayName"] = self.display_name
         details["description"] = ""
-        details["createdTime"] = get_timestamp()
-        details["packageTelemetryId"] = uuid.uuid4().__str__()
+        if self.canonical is not None:
+            details["createdTime"] = get_timestamp(self.canonical.timestamp)
+            details["packageTelemetryId"] = self.canonical.uuid("packageTelemetryIds", self.uuid)
+        else:
+            details["createdTime"] = get_timestamp()
+            details["packageTelemetryId"] = uuid.uuid4().__str__()
         details["creator"] = "N/A"
         details["sourceEnvironment"] = ""
         d["details"] = details
@@ -506,11 +536,11 @@ class Package:
         }
         return d
 
-    def export_definition(self, embedded: bool = False):
+    def export_definition(self, embedded: bool = False, id_allocator: IdAllocator|None = None, streaming: bool = False):
         d = {}
 
         properties = {}
-        properties["definition"] = self.flow.export()
+        properties["definition"] = self.flow.export(self.__allocator(id_allocator), streaming)
 
         if not embedded:
             d["name"] = self.uuid
@@ -536,45 +566,121 @@ class Package:
 
 
 
-    def __write_json_file(self, path: str, content: dict):
-        with open(path, 'w') as f:
-            f.write(json.dumps(content))
-
-    def export_zipfile(self, output_dir: str = ".") -> str:
-        work_dir = tempfile.TemporaryDirectory().name
-        definition_dir = path.join(
-            work_dir, "Microsoft.Flow", "flows", self.__flow_resource.uuid)
-
-        # ディレクトリ階層作成
-        makedirs(definition_dir, exist_ok=True)
-
-        # ./manifest.json
-        self.__write_json_file(
-            path.join(work_dir, "manifest.json"), self.export_solution_manifest())
-        # ./Microsoft.Flow/flows/manifest.json
-        self.__write_json_file(path.join(
-            work_dir, "Microsoft.Flow", "flows", "manifest.json"), self.export_package_manifest())
-        # ./Microsoft.Flow/flows/{uuid}/definition.json
-        self.__write_json_file(
-            path.join(definition_dir, "definition.json"), self.export_definition())
-        # ./Microsoft.Flow/flows/{uuid}/apisMap.json
-        self.__write_json_file(
-            path.join(definition_dir, "apisMap.json"), self.export_apis_map())
-        # ./Microsoft.Flow/flows/{uuid}/connectionsMap.json
-        self.__write_json_file(path.join(
-            definition_dir, "connectionsMap.json"), self.export_connections_map())
-
-        # zipファイル作成
-        filepath = path.join(output_dir, f"{self.display_name}.zip")
-        zip_file = zipfile.ZipFile(filepath, "w", zipfile.ZIP_DEFLATED)
-        for root, _, files in walk(work_dir):
-            for file in files:
-                zip_file.write(path.join(root, file), path.relpath(
-                    path.join(root, file), work_dir))
+    def write_definition(self, fp: IO, embedded: bool = False, id_allocator: IdAllocator|None = None):
+        """
+        Writes the definition of the package as JSON to a file-like object, exporting the actions of the flow while
+        they are written. The text is the same as `current_serializer().dumps(export_definition(embedded, id_allocator))`.
+
+        Args:
+            fp (IO): A text stream, or a binary stream such as a zip file entry.
+            embedded (bool, optional): If True, writes the definition embedded in a solution.
+            id_allocator (IdAllocator, optional): The allocator of operationMetadataIds used for this export.
+        """
+        with self.flow.caching():
+            write_json(self.export_definition(embedded, streaming=True), fp, self.__allocator(id_allocator) or self.flow.id_allocator, serializer=self.__serializer())
+
+    def __allocator(self, id_allocator: IdAllocator|None) -> IdAllocator|None:
+        """
+        Returns the allocator of operationMetadataIds of an export, or None for the allocator of the flow.
+        """
+        if id_allocator is not None:
+            return id_allocator
+        if self.id_allocator is not None:
+            return self.id_allocator
+        return self.canonical.id_allocator if self.canonical is not None else None
+
+    def __serializer(self):
+        return self.canonical.serializer if self.canonical is not None else None
+
+    def write_zipfile(self, fp: IO):
+        """
+        Writes the package as a zip file to a binary stream, such as a file opened with "wb" or an `io.BytesIO`.
+        The files of the package are compressed from their exports as they are encoded, without temporary files.
+        Streams that cannot seek are supported too.
+
+        Args:
+            fp (IO): The binary stream.
+        """
+        definition_dir = f"Microsoft.Flow/flows/{self.__flow_resource.uuid}"
+        files = {
+            "manifest.json": self.export_solution_manifest(),
+            "Microsoft.Flow/flows/manifest.json": self.export_package_manifest(),
+            f"{definition_dir}/definition.json": self.export_definition(streaming=True),
+            f"{definition_dir}/apisMap.json": self.export_apis_map(),
+            f"{definition_dir}/connectionsMap.json": self.export_connections_map(),
+        }
+        with self.flow.caching(), zipfile.ZipFile(fp, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name in (sorted(files) if self.canonical is not None else files):
+                with zip_file.open(zip_entry(name, self.canonical), "w") as entry:
+                    write_json(files[name], entry, self.__allocator(None) or self.flow.id_allocator, serializer=self.__serializer())
+            zip_file.comment = b'\xe2\xa0\x89\xe2\xa0\x97\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x99\xe2\xa0\x80\xe2\xa0\x83\xe2\xa0\xbd\xe2\xa0\x80\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x8d\xe2\xa0\xa7'
+
+    def export_zipbytes(self) -> bytes:
+        """
+        Exports the package as a zip file held in memory (see `write_zipfile`).
+
+        Returns:
+            bytes: The zip file.
+        """
+        buffer = io.BytesIO()
+        self.write_zipfile(buffer)
+        return buffer.getvalue()
 
-        zip_file.comment = b'\xe2\xa0\x89\xe2\xa0\x97\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x99\xe2\xa0\x80\xe2\xa0\x83\xe2\xa0\xbd\xe2\xa0\x80\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x8d\xe2\xa0\xa7'
-        zip_file.close()
+    def cache_key(self) -> str:
+        """
+        Computes the key of the zip file of the package in a `BuildCache`: a hash of the definition, the manifests,
+        the connector resources, the localized names and the settings of the canonical build.
 
-        # clean-up
-        shutil.rmtree(work_dir)
+        Returns:
+            str: The key.
+
+        Raises:
+            ValueError: If the package is not built canonically, as its zip file would change on every build.
+        """
+        if self.canonical is None:
+            raise ValueError(f"Only canonical builds can be cached: package {self.display_name} has no CanonicalBuild")
+        content = {
+            "timestamp": self.canonical.timestamp.isoformat(),
+            "displayName": self.display_name,
+            "localizedNames": self.__localized_names,
+            "manifest": self.export_solution_manifest(),
+            "packageManifest": self.export_package_manifest(),
+            "apisMap": self.export_apis_map(),
+            "connectionsMap": self.export_connections_map(),
+            "definition": self.export_definition(streaming=True),
+        }
+        return BuildCache.key(iter_json_bytes(content, self.__allocator(None) or self.flow.id_allocator, self.canonical.serializer))
+
+    def export_zipfile(self, output_dir: str = ".", cache: BuildCache|str|None = None) -> str:
+        """
+        Exports the package as a zip file named after its display name.
+
+        Args:
+            output_dir (str, optional): The directory of the zip file.
+            cache (BuildCache|str, optional): A build cache, or its directory. If the cache holds the zip file of
+                the package (see `cache_key`), it is reused instead of being built; otherwise the built zip file
+                is stored in the cache. Requires a canonical build.
+
+        Returns:
+            str: The absolute path of the zip file.
+
+        Raises:
+            ValueError: If a cache is given but the package is not built canonically.
+        """
+        filepath = path.join(output_dir, f"{self.display_name}.zip")
+        if cache is not None:
+            if isinstance(cache, str):
+                cache = BuildCache(cache)
+            key = self.cache_key()
+            if cache.get(key, filepath):
+                return path.abspath(filepath)
+        # Replaces the zip file rather than writing into it, as it may be hard-linked to a cached one.
+        if path.lexists(filepath):
+            remove(filepath)
+
+        with open(filepath, "wb") as f:
+            self.write_zipfile(f)
+
+        if cache is not None:
+            cache.put(key, filepath)
         return path.abspath(filepath)
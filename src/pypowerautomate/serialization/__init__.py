@@ -0,0 +1,3 @@
+from .backends import JsonBackend, JsonSerializer, DEFAULT_SERIALIZER, JSON_BACKENDS, available_backends, current_serializer, use_serializer
+from .jsonstream import iter_json, iter_json_bytes, write_json
+from .xor import parse_xor_key, xor_encode, xor_decode, iter_xor_encode, iter_xor_decode
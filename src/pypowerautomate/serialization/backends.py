@@ -0,0 +1,346 @@
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Dict, Iterator, List, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonBackend:
+    """
+    A JSON library used by `JsonSerializer`. Each subclass wraps one library.
+
+    Backends may format numbers and escape characters differently, so the same value can be encoded to different
+    texts by different backends. The texts always decode to the same value.
+
+    Attributes:
+        name (str): The name the backend is selected by.
+    """
+
+    __slots__ = ()
+
+    name: str = ""
+
+    def available(self) -> bool:
+        """
+        Checks whether the library is installed.
+
+        Returns:
+            bool: True if the backend can be used.
+        """
+        return True
+
+    def supports(self, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bool:
+        """
+        Checks whether the backend can encode with the given options.
+
+        Args:
+            sort_keys (bool): Whether the keys of objects are sorted.
+            compact (bool): Whether the separators are "," and ":" instead of ", " and ": ".
+            ensure_ascii (bool): Whether characters beyond ASCII are escaped.
+
+        Returns:
+            bool: True if the options are supported.
+        """
+        return True
+
+    def dumps(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bytes:
+        """
+        Encodes a value as UTF-8 JSON.
+
+        Raises:
+            TypeError: If the value holds an object that is not JSON serializable.
+        """
+        raise NotImplementedError
+
+    def dumps_text(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> str:
+        """
+        Encodes a value as a JSON string.
+
+        Raises:
+            TypeError: If the value holds an object that is not JSON serializable.
+        """
+        return self.dumps(value, sort_keys, compact, ensure_ascii).decode("utf-8")
+
+    def loads(self, data: str|bytes) -> object:
+        """
+        Decodes a JSON text.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+        """
+        raise NotImplementedError
+
+
+class StdlibJsonBackend(JsonBackend):
+    """
+    The `json` module of the standard library. It supports every option and is always available.
+    """
+
+    __slots__ = ("__encoders",)
+
+    name = "json"
+
+    def __init__(self):
+        self.__encoders: Dict[Tuple[bool, bool, bool], json.JSONEncoder] = {}
+
+    def encoder(self, sort_keys: bool, compact: bool, ensure_ascii: bool) -> json.JSONEncoder:
+        """
+        Returns the encoder for the given options, created once.
+        """
+        options = (sort_keys, compact, ensure_ascii)
+        encoder = self.__encoders.get(options)
+        if encoder is None:
+            encoder = json.JSONEncoder(sort_keys=sort_keys, ensure_ascii=ensure_ascii, separators=(",", ":") if compact else (", ", ": "))
+            self.__encoders[options] = encoder
+        return encoder
+
+    def dumps(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bytes:
+        return self.encoder(sort_keys, compact, ensure_ascii).encode(value).encode("utf-8")
+
+    def dumps_text(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> str:
+        return self.encoder(sort_keys, compact, ensure_ascii).encode(value)
+
+    def loads(self, data: str|bytes) -> object:
+        return json.loads(data)
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    The `orjson` library. It only writes compact JSON without escaping characters beyond ASCII. Values it cannot
+    encode, such as integers beyond 64 bits, are encoded by the standard library instead.
+    """
+
+    __slots__ = ()
+
+    name = "orjson"
+
+    def available(self) -> bool:
+        return orjson is not None
+
+    def supports(self, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bool:
+        return compact and not ensure_ascii
+
+    def dumps(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(value, option=option)
+        except orjson.JSONEncodeError:
+            return STDLIB_BACKEND.dumps(value, sort_keys, compact, ensure_ascii)
+
+    def loads(self, data: str|bytes) -> object:
+        return orjson.loads(data)
+
+
+class UjsonBackend(JsonBackend):
+    """
+    The `ujson` library. Versions without the `separators` argument only write compact JSON. Values it cannot encode, such as integers
+    beyond 64 bits, are encoded by the standard library instead.
+    """
+
+    __slots__ = ()
+
+    name = "ujson"
+
+    def available(self) -> bool:
+        return ujson is not None
+
+    def supports(self, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bool:
+        return compact or _ujson_separators()
+
+    def dumps(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> bytes:
+        return self.dumps_text(value, sort_keys, compact, ensure_ascii).encode("utf-8")
+
+    def dumps_text(self, value: object, sort_keys: bool, compact: bool, ensure_ascii: bool) -> str:
+        try:
+            if compact:
+                return ujson.dumps(value, sort_keys=sort_keys, ensure_ascii=ensure_ascii, escape_forward_slashes=False)
+            return ujson.dumps(value, sort_keys=sort_keys, ensure_ascii=ensure_ascii, escape_forward_slashes=False, separators=(", ", ": "))
+        except (TypeError, OverflowError):
+            return STDLIB_BACKEND.dumps_text(value, sort_keys, compact, ensure_ascii)
+
+    def loads(self, data: str|bytes) -> object:
+        return ujson.loads(data)
+
+
+def _ujson_separators() -> bool:
+    """
+    Checks whether the installed `ujson` accepts the `separators` argument.
+    """
+    try:
+        ujson.dumps([], separators=(", ", ": "))
+    except TypeError:
+        return False
+    return True
+
+
+STDLIB_BACKEND = StdlibJsonBackend()
+
+# The backends, fastest first.
+JSON_BACKENDS: Dict[str, JsonBackend] = {backend.name: backend for backend in (OrjsonBackend(), UjsonBackend(), STDLIB_BACKEND)}
+
+
+def available_backends() -> List[str]:
+    """
+    Lists the names of the installed JSON backends, fastest first.
+
+    Returns:
+        List[str]: The names, e.g. ["orjson", "json"].
+    """
+    return [name for name, backend in JSON_BACKENDS.items() if backend.available()]
+
+
+class JsonSerializer:
+    """
+    Encodes and decodes JSON with a backend and formatting options. Flows, packages, solutions and connections
+    are written and read with the current serializer (see `current_serializer` and `use_serializer`).
+
+    The default serializer uses the standard library, so it writes exactly what `json.dumps` writes. Faster
+    backends format some numbers differently (e.g. ujson writes 1.5e-5 where `json.dumps` writes 1.5e-05), so they
+    are opt-in: pass a backend name or "auto" and activate the serializer with `use_serializer`. Writing compact
+    JSON without escaping characters beyond ASCII lets the "auto" backend pick orjson.
+
+    Attributes:
+        backend (JsonBackend): The backend.
+        sort_keys (bool): Whether the keys of objects are sorted.
+        compact (bool): Whether the separators are "," and ":" instead of ", " and ": ".
+        ensure_ascii (bool): Whether characters beyond ASCII are escaped.
+    """
+
+    __slots__ = ("backend", "sort_keys", "compact", "ensure_ascii")
+
+    def __init__(self, backend: str|JsonBackend = "json", sort_keys: bool = False, compact: bool = False, ensure_ascii: bool = True):
+        """
+        Initializes a serializer.
+
+        Args:
+            backend (str|JsonBackend): A backend, the name of one ("orjson", "ujson" or "json"), or "auto" for the
+                fastest installed backend that supports the options. Defaults to the standard library.
+            sort_keys (bool): Whether the keys of objects are sorted.
+            compact (bool): Whether the separators are "," and ":" instead of ", " and ": ".
+            ensure_ascii (bool): Whether characters beyond ASCII are escaped.
+
+        Raises:
+            ValueError: If the backend is unknown, not installed, or does not support the options.
+        """
+        if backend == "auto":
+            backend = next(backend for backend in JSON_BACKENDS.values() if backend.available() and backend.supports(sort_keys, compact, ensure_ascii))
+        elif isinstance(backend, str):
+            if backend not in JSON_BACKENDS:
+                raise ValueError(f"Unknown JSON backend: {backend}")
+            backend = JSON_BACKENDS[backend]
+        if not backend.available():
+            raise ValueError(f"The JSON backend {backend.name} is not installed")
+        if not backend.supports(sort_keys, compact, ensure_ascii):
+            raise ValueError(f"The JSON backend {backend.name} does not support sort_keys={sort_keys}, compact={compact}, ensure_ascii={ensure_ascii}")
+
+        self.backend: JsonBackend = backend
+        self.sort_keys: bool = sort_keys
+        self.compact: bool = compact
+        self.ensure_ascii: bool = ensure_ascii
+
+    @property
+    def separators(self) -> Tuple[str, str]:
+        """
+        The separators between items and between keys and values.
+        """
+        return (",", ":") if self.compact else (", ", ": ")
+
+    def dumps(self, value: object) -> bytes:
+        """
+        Encodes a value as UTF-8 JSON.
+
+        Args:
+            value (object): The value.
+
+        Returns:
+            bytes: The JSON text.
+
+        Raises:
+            TypeError: If the value holds an object that is not JSON serializable.
+        """
+        return self.backend.dumps(value, self.sort_keys, self.compact, self.ensure_ascii)
+
+    def dumps_text(self, value: object) -> str:
+        """
+        Encodes a value as a JSON string.
+
+        Args:
+            value (object): The value.
+
+        Returns:
+            str: The JSON text.
+
+        Raises:
+            TypeError: If the value holds an object that is not JSON serializable.
+        """
+        return self.backend.dumps_text(value, self.sort_keys, self.compact, self.ensure_ascii)
+
+    def loads(self, data: str|bytes) -> object:
+        """
+        Decodes a JSON text.
+
+        Args:
+            data (str|bytes): The JSON text, as a string or as UTF-8 bytes.
+
+        Returns:
+            object: The decoded value.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+        """
+        return self.backend.loads(data)
+
+    def load(self, fp: IO) -> object:
+        """
+        Decodes the JSON text of a file-like object.
+
+        Args:
+            fp (IO): The file-like object, opened in text or binary mode.
+
+        Returns:
+            object: The decoded value.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+        """
+        return self.backend.loads(fp.read())
+
+
+DEFAULT_SERIALIZER = JsonSerializer()
+_current_serializer: ContextVar[JsonSerializer] = ContextVar("json_serializer", default=DEFAULT_SERIALIZER)
+
+
+def current_serializer() -> JsonSerializer:
+    """
+    Returns the serializer used at this point, `DEFAULT_SERIALIZER` unless `use_serializer` is active.
+
+    Returns:
+        JsonSerializer: The current serializer.
+    """
+    return _current_serializer.get()
+
+
+@contextmanager
+def use_serializer(serializer: JsonSerializer) -> Iterator[JsonSerializer]:
+    """
+    Makes the given serializer the current one while the context is active.
+
+    Args:
+        serializer (JsonSerializer): The serializer to use.
+    """
+    token = _current_serializer.set(serializer)
+    try:
+        yield serializer
+    finally:
+        _current_serializer.reset(token)
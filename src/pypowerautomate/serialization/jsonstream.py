@@ -0,0 +1,200 @@
+import io
+import json
+from operator import itemgetter
+from typing import IO, Callable, Dict, Iterator, Tuple
+
+from ..actions import Actions
+from ..actions.base import _deferred_actions
+from ..metadata import IdAllocator, use_allocator
+from ..triggers import Triggers
+from .backends import JsonSerializer, current_serializer
+
+DEFAULT_BUFFER_SIZE = 65536
+
+# Converts numbers, booleans and None used as keys to strings, as json.dumps does.
+_key_encoder = json.JSONEncoder()
+_END = object()
+_first = itemgetter(0)
+
+
+class _Tokens:
+    """
+    The punctuation of the JSON text, as strings or as bytes.
+    """
+
+    __slots__ = ("item_separator", "key_separator", "open_object", "close_object", "open_array", "close_array", "empty_object", "empty_array")
+
+    def __init__(self, separators: Tuple[str, str], binary: bool):
+        item_separator, key_separator = separators
+        tokens = [item_separator, key_separator, "{", "}", "[", "]", "{}", "[]"]
+        if binary:
+            tokens = [token.encode("ascii") for token in tokens]
+        (self.item_separator, self.key_separator, self.open_object, self.close_object,
+         self.open_array, self.close_array, self.empty_object, self.empty_array) = tokens
+
+
+def iter_json(value: object, id_allocator: IdAllocator|None = None, serializer: JsonSerializer|None = None) -> Iterator[str]:
+    """
+    Encodes a value as JSON in chunks. The concatenated chunks are the same as `serializer.dumps_text(value)` with
+    the Actions and Triggers objects in the value replaced by their exports.
+
+    Actions and Triggers are exported one action or trigger at a time, and the actions nested in If, Switch,
+    Foreach, Until and Scope actions are exported when they are written, so the whole exported dictionary of a
+    flow is never held in memory. Use with `Flow.export(streaming=True)`. With `sort_keys`, the exports of the
+    actions of an Actions object are held until they are sorted, but the actions nested in them are still not.
+
+    Args:
+        value (object): The value to encode.
+        id_allocator (IdAllocator, optional): The allocator of the operationMetadataIds assigned while exporting
+            the actions and triggers. Defaults to the current allocator.
+        serializer (JsonSerializer, optional): The serializer. Defaults to the current serializer.
+
+    Returns:
+        Iterator[str]: The JSON text, in chunks.
+
+    Raises:
+        TypeError: If the value holds an object that is not JSON serializable.
+        ValueError: If the actions contain a cycle or a run-after condition on an unknown action.
+    """
+    if serializer is None:
+        serializer = current_serializer()
+    return _iter_chunks(value, id_allocator, serializer, serializer.dumps_text, _Tokens(serializer.separators, False))
+
+
+def iter_json_bytes(value: object, id_allocator: IdAllocator|None = None, serializer: JsonSerializer|None = None) -> Iterator[bytes]:
+    """
+    Encodes a value as UTF-8 JSON in chunks, like `iter_json`. Backends that encode to bytes, such as orjson,
+    are not converted to strings.
+
+    Args:
+        value (object): The value to encode.
+        id_allocator (IdAllocator, optional): The allocator of the operationMetadataIds assigned while exporting
+            the actions and triggers. Defaults to the current allocator.
+        serializer (JsonSerializer, optional): The serializer. Defaults to the current serializer.
+
+    Returns:
+        Iterator[bytes]: The JSON text, in chunks.
+
+    Raises:
+        TypeError: If the value holds an object that is not JSON serializable.
+        ValueError: If the actions contain a cycle or a run-after condition on an unknown action.
+    """
+    if serializer is None:
+        serializer = current_serializer()
+    return _iter_chunks(value, id_allocator, serializer, serializer.dumps, _Tokens(serializer.separators, True))
+
+
+def _iter_chunks(value: object, id_allocator: IdAllocator|None, serializer: JsonSerializer, encode: Callable, tokens: _Tokens) -> Iterator:
+    """
+    Encodes a value in chunks of the type returned by `encode`, `serializer.dumps_text` or `serializer.dumps`.
+    """
+    if isinstance(value, (Actions, Triggers)):
+        yield from _iter_exported(value.iter_export(), id_allocator, serializer, encode, tokens)
+    elif isinstance(value, dict):
+        if not value:
+            yield tokens.empty_object
+            return
+        items = sorted(value.items(), key=_first) if serializer.sort_keys else value.items()
+        separator = tokens.open_object
+        for key, item in items:
+            yield separator + _encode_key(key, encode) + tokens.key_separator
+            yield from _iter_chunks(item, id_allocator, serializer, encode, tokens)
+            separator = tokens.item_separator
+        yield tokens.close_object
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            yield tokens.empty_array
+            return
+        separator = tokens.open_array
+        for item in value:
+            yield separator
+            yield from _iter_chunks(item, id_allocator, serializer, encode, tokens)
+            separator = tokens.item_separator
+        yield tokens.close_array
+    else:
+        yield encode(value)
+
+
+def _encode_key(key: object, encode: Callable):
+    """
+    Encodes a dictionary key the way json.dumps does, converting numbers, booleans and None to strings.
+    """
+    if not isinstance(key, str):
+        if not (isinstance(key, (int, float)) or key is None):
+            raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+        key = _key_encoder.encode(key)
+    return encode(key)
+
+
+def _next_exported(items: Iterator[Tuple[str, Dict]], id_allocator: IdAllocator|None) -> Iterator[Tuple[str, Dict, bool]]:
+    """
+    Exports the items of an `iter_export` iterator with the nested actions deferred, and tells whether each
+    item holds deferred actions.
+    """
+    while True:
+        deferred = []
+        token = _deferred_actions.set(deferred)
+        try:
+            if id_allocator is not None:
+                with use_allocator(id_allocator):
+                    item = next(items, _END)
+            else:
+                item = next(items, _END)
+        finally:
+            _deferred_actions.reset(token)
+        if item is _END:
+            return
+        yield item[0], item[1], bool(deferred)
+
+
+def _iter_exported(items: Iterator[Tuple[str, Dict]], id_allocator: IdAllocator|None, serializer: JsonSerializer, encode: Callable, tokens: _Tokens) -> Iterator:
+    """
+    Encodes the items of an `iter_export` iterator as a JSON object. Each item is encoded at once unless it
+    holds deferred actions.
+    """
+    exported_items = _next_exported(items, id_allocator)
+    if serializer.sort_keys:
+        exported_items = sorted(exported_items, key=_first)
+    separator = tokens.open_object
+    for key, exported, deferred in exported_items:
+        yield separator + _encode_key(key, encode) + tokens.key_separator
+        if deferred:
+            yield from _iter_chunks(exported, id_allocator, serializer, encode, tokens)
+        else:
+            yield encode(exported)
+        separator = tokens.item_separator
+    yield tokens.empty_object if separator is tokens.open_object else tokens.close_object
+
+
+def write_json(value: object, fp: IO, id_allocator: IdAllocator|None = None, buffer_size: int = DEFAULT_BUFFER_SIZE, serializer: JsonSerializer|None = None):
+    """
+    Writes a value as JSON to a file-like object, such as a file, a `zipfile.ZipFile.open(name, "w")` entry or
+    an `io.BytesIO`, as it is encoded (see `iter_json`). The written text is the same as `serializer.dumps(value)`.
+
+    Args:
+        value (object): The value to write.
+        fp (IO): The file-like object. Text streams (`io.TextIOBase`) receive strings, other streams receive
+            UTF-8 bytes.
+        id_allocator (IdAllocator, optional): The allocator of the operationMetadataIds assigned while exporting.
+        buffer_size (int): The number of characters or bytes collected before each write.
+        serializer (JsonSerializer, optional): The serializer. Defaults to the current serializer.
+
+    Raises:
+        TypeError: If the value holds an object that is not JSON serializable.
+        ValueError: If the actions contain a cycle or a run-after condition on an unknown action.
+    """
+    if isinstance(fp, io.TextIOBase):
+        chunks, empty = iter_json(value, id_allocator, serializer), ""
+    else:
+        chunks, empty = iter_json_bytes(value, id_allocator, serializer), b""
+    block = []
+    size = 0
+    for chunk in chunks:
+        block.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            fp.write(empty.join(block))
+            block = []
+            size = 0
+    if block:
+        fp.write(empty.join(block))
@@ -0,0 +1,229 @@
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+from .backends import current_serializer
+
+DEFAULT_BLOCK_SIZE = 65536
+
+
+def parse_xor_key(key: str|Sequence[int]) -> Tuple[int, ...]:
+    """
+    Parses an XOR key given as a comma-separated string of integers, e.g. "12,34,56".
+
+    Args:
+        key (str|Sequence[int]): The key, as a string or as integers.
+
+    Returns:
+        Tuple[int, ...]: The integers of the key.
+
+    Raises:
+        ValueError: If the key is empty or holds something other than integers.
+    """
+    values = tuple(int(x) for x in key.split(",")) if isinstance(key, str) else tuple(key)
+    if not values:
+        raise ValueError("The XOR key must hold at least one integer")
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"The XOR key must hold integers: {value!r}")
+    return values
+
+
+# Translations of a byte to the hundreds, tens and ones digits of its decimal text, with a space for leading zeros.
+_HUNDREDS = bytes(48 + byte // 100 if byte >= 100 else 32 for byte in range(256))
+_TENS = bytes(48 + byte // 10 % 10 if byte >= 10 else 32 for byte in range(256))
+_ONES = bytes(48 + byte % 10 for byte in range(256))
+_ENCODED_CHARACTERS = b"-0123456789,"
+
+
+def _translation(value: int) -> bytes:
+    """
+    Builds the `bytes.translate` table that XORs every byte with a key integer from 0 to 255.
+    """
+    return bytes(byte ^ value for byte in range(256))
+
+
+def _is_byte_key(key: Tuple[int, ...]) -> bool:
+    return all(0 <= value <= 255 for value in key)
+
+
+def _xor_bytes(data: bytes, translations: List[bytes], position: int) -> bytes:
+    """
+    XORs bytes with a key of integers from 0 to 255, starting at the given position of the key cycle. Each key
+    position is translated as a whole slice, so no Python code runs per byte.
+    """
+    size = len(translations)
+    if size == 1:
+        return data.translate(translations[0])
+    result = bytearray(len(data))
+    for offset in range(min(size, len(data))):
+        result[offset::size] = data[offset::size].translate(translations[(position + offset) % size])
+    return bytes(result)
+
+
+def _decimals(data: bytes) -> str:
+    """
+    Joins the decimal texts of bytes with commas. Every byte is first written as three digits and a comma, with
+    spaces for the leading zeros, which are then removed.
+    """
+    if not data:
+        return ""
+    text = bytearray(4 * len(data))
+    text[0::4] = data.translate(_HUNDREDS)
+    text[1::4] = data.translate(_TENS)
+    text[2::4] = data.translate(_ONES)
+    text[3::4] = b"," * len(data)
+    return text.replace(b" ", b"")[:-1].decode("ascii")
+
+
+def _block_encoder(key: Tuple[int, ...]) -> Callable[[bytes, int], str]:
+    """
+    Returns a function that encodes a block of bytes starting at a given position of the key cycle.
+    """
+    if _is_byte_key(key):
+        translations = [_translation(value) for value in key]
+        return lambda data, position: _decimals(_xor_bytes(data, translations, position))
+
+    # Key integers beyond a byte give results beyond a byte: look the decimal text up for each key position.
+    tables = [tuple(str(byte ^ value) for byte in range(256)) for value in key]
+
+    def encode(data: bytes, position: int) -> str:
+        size = len(tables)
+        parts = [""] * len(data)
+        for offset in range(min(size, len(data))):
+            parts[offset::size] = map(tables[(position + offset) % size].__getitem__, data[offset::size])
+        return ",".join(parts)
+    return encode
+
+
+def _parse_values(text: str) -> List[int]:
+    """
+    Parses integers separated by commas, with the JSON parser of the current serializer since it runs in C.
+    """
+    if text.encode("utf-8").translate(None, _ENCODED_CHARACTERS):
+        raise ValueError("An XOR encoded text must hold integers separated by commas")
+    return current_serializer().loads("[" + text + "]")
+
+
+def _decode_values(values: List[int], key: Tuple[int, ...], position: int) -> bytes:
+    """
+    XORs decoded integers back to bytes, starting at the given position of the key cycle.
+    """
+    try:
+        if _is_byte_key(key):
+            return _xor_bytes(bytes(values), [_translation(value) for value in key], position)
+        size = len(key)
+        data = bytearray(len(values))
+        for offset in range(min(size, len(values))):
+            data[offset::size] = bytes(map(key[(position + offset) % size].__xor__, values[offset::size]))
+        return bytes(data)
+    except ValueError:
+        raise ValueError("The XOR encoded text does not decode to bytes with this key") from None
+
+
+def xor_encode(data: str|bytes, key: str|Sequence[int]) -> str:
+    """
+    Encodes a text with an XOR key, as `Flow.export_json(xor_key=...)` does: every byte of the UTF-8 text is
+    XORed with the key integer at its position, cycling through the key, and the results are joined with commas.
+
+    Args:
+        data (str|bytes): The text, or its UTF-8 bytes.
+        key (str|Sequence[int]): The key, as a comma-separated string of integers or as integers.
+
+    Returns:
+        str: The encoded text.
+
+    Raises:
+        ValueError: If the key is invalid.
+    """
+    key = parse_xor_key(key)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return _block_encoder(key)(data, 0)
+
+
+def xor_decode(text: str, key: str|Sequence[int]) -> bytes:
+    """
+    Decodes a text encoded by `xor_encode`.
+
+    Args:
+        text (str): The encoded text.
+        key (str|Sequence[int]): The key used to encode it.
+
+    Returns:
+        bytes: The decoded UTF-8 bytes.
+
+    Raises:
+        ValueError: If the key is invalid, or the text was not encoded with this key.
+    """
+    key = parse_xor_key(key)
+    if not text:
+        return b""
+    return _decode_values(_parse_values(text), key, 0)
+
+
+def iter_xor_encode(chunks: Iterable[str|bytes], key: str|Sequence[int], block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Encodes a text given in chunks, such as the output of `iter_json`, with an XOR key. The concatenated results
+    are the same as `xor_encode` of the concatenated chunks. Chunks are collected into blocks of about
+    `block_size` bytes before they are encoded.
+
+    Args:
+        chunks (Iterable[str|bytes]): The text, or its UTF-8 bytes, in chunks.
+        key (str|Sequence[int]): The key, as a comma-separated string of integers or as integers.
+        block_size (int): The number of bytes encoded at once.
+
+    Returns:
+        Iterator[str]: The encoded text, in chunks.
+
+    Raises:
+        ValueError: If the key is invalid.
+    """
+    key = parse_xor_key(key)
+    encode = _block_encoder(key)
+    position = 0
+    block = []
+    size = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        block.append(chunk)
+        size += len(chunk)
+        if size >= block_size:
+            data = b"".join(block)
+            yield ("," if position else "") + encode(data, position % len(key))
+            position += len(data)
+            block = []
+            size = 0
+    if size:
+        yield ("," if position else "") + encode(b"".join(block), position % len(key))
+
+
+def iter_xor_decode(chunks: Iterable[str], key: str|Sequence[int]) -> Iterator[bytes]:
+    """
+    Decodes a text encoded with an XOR key, given in chunks that may split the numbers anywhere. The concatenated
+    results are the same as `xor_decode` of the concatenated chunks.
+
+    Args:
+        chunks (Iterable[str]): The encoded text, in chunks.
+        key (str|Sequence[int]): The key used to encode it.
+
+    Returns:
+        Iterator[bytes]: The decoded UTF-8 bytes, in chunks.
+
+    Raises:
+        ValueError: If the key is invalid, or the text was not encoded with this key.
+    """
+    key = parse_xor_key(key)
+    position = 0
+    rest = ""
+    for chunk in chunks:
+        text = rest + chunk
+        end = text.rfind(",")
+        if end < 0:
+            rest = text
+            continue
+        rest = text[end + 1:]
+        values = _parse_values(text[:end])
+        yield _decode_values(values, key, position % len(key))
+        position += len(values)
+    if rest or position:
+        yield _decode_values(_parse_values(rest), key, position % len(key))
@@ -1,16 +1,18 @@
-import json
-from os import makedirs, path, walk
+from contextlib import nullcontext
+import io
+from os import path, remove
 from random import choices
-import shutil
 import string
-from typing import Dict, List
-import tempfile
+from typing import IO, Dict, Iterator, List
 from xml.etree.ElementTree import Element, tostring
 import re
 import zipfile
 
+from ..build import BuildCache, CanonicalBuild, zip_entry
 from ..environment_variable import EnvironmentVariable
+from ..metadata import IdAllocator
 from ..package import Package, Resource
+from ..serialization import iter_json_bytes, use_serializer
 
 # TODO: Add method comments
 
@@ -35,7 +37,7 @@ class Solution:
     ├── customizations.xml
     └── solution.xml
     """
-    def __init__(self, display_name: str, prefix: str, publisher: str, version: str = "1.0.0.0", languagecode: int = 1033):
+    def __init__(self, display_name: str, prefix: str, publisher: str, version: str = "1.0.0.0", languagecode: int = 1033, id_allocator: IdAllocator|None = None, canonical: CanonicalBuild|None = None):
         """
         Initializes a new instance of the Solution class.
 
@@ -45,11 +47,18 @@ class Solution:
             publisher (str): The publisher of the solution
             version (str): The version of the solution
             languagecode (int, optional): The language code for the solution. Use the following to find the correct code: https://learn.microsoft.com/en-us/openspecs/office_standards/ms-oe376/6c085406-a698-4e12-9d4d-c3b0ee3dbc4a Defaults to 1033, for US English.
+            id_allocator (IdAllocator, optional): The allocator of operationMetadataIds used when exporting the flows of the solution.
+                Defaults to the allocator of the canonical build, then to the allocator of each package.
+            canonical (CanonicalBuild, optional): The settings of a canonical build, which derives the connection
+                reference names and the zip entry timestamps of the solution from a seed, so that rebuilding it
+                produces an identical zip file. Create the packages with the same settings.
         """
 
         self.display_name = display_name
         self.prefix = prefix
         self.version = version
+        self.id_allocator = id_allocator
+        self.canonical = canonical
 
         self.__packages: Dict[str, Package] = {}
         self.__environment_variables: Dict[str, EnvironmentVariable] = {}
@@ -81,7 +90,9 @@ class Solution:
 
         self.__localized_names[languagecode] = {"description": name}
 
-    def __random_id(self):
+    def __random_id(self, name: str):
+        if self.canonical is not None:
+            return self.canonical.random_id(f"connectionReferences/{name}")
         return ''.join(choices(string.ascii_uppercase + string.digits + string.ascii_lowercase, k=5))
 
     def add_package(self, package: Package):
@@ -91,7 +102,7 @@ class Solution:
                 if name != None:
                     connection.set_connection_reference_logical_name(name)
             elif connection.id != None:
-                connection.set_connection_reference_logical_name(f"{self.prefix}_{connection.id.split("/")[-1]}_{self.__random_id()}")
+                connection.set_connection_reference_logical_name(f"{self.prefix}_{connection.id.split("/")[-1]}_{self.__random_id(connection.id)}")
                 self.__connections[connection.id] = connection
 
         self.__packages[package.uuid] = package
@@ -327,65 +338,112 @@ class Solution:
     def export_workflows(self) -> Dict:
         workflows = {}
         for uuid, package in self.__packages.items():
-            workflow = package.export_definition(embedded = True)
+            workflow = package.export_definition(embedded = True, id_allocator = self.__allocator())
             workflows[package.display_name] = {"definition": workflow, "uuid": uuid}
 
         return workflows
 
-    def __write_json_file(self, path: str, content: dict):
-        with open(path, 'w') as f:
-            f.write(json.dumps(content))
+    def __allocator(self) -> IdAllocator|None:
+        if self.id_allocator is None and self.canonical is not None:
+            return self.canonical.id_allocator
+        return self.id_allocator
 
+    def write_zipfile(self, fp: IO):
+        """
+        Writes the solution as a zip file to a binary stream, such as a file opened with "wb" or an `io.BytesIO`.
+        The files of the solution are compressed from their exports as they are encoded, without temporary files.
+        Streams that cannot seek are supported too.
+
+        Args:
+            fp (IO): The binary stream.
+        """
+        files: Dict[str, bytes|Package] = {}
+        files["solution.xml"] = tostring(self.export_solution_manifest(), encoding="utf-8")
+        files["customizations.xml"] = tostring(self.export_customizations(), encoding="utf-8")
+        files["[Content_Types].xml"] = tostring(self.export_content_types(), encoding="utf-8", xml_declaration=True)
+        for name, definition in self.export_environment_variables().items():
+            files[f"environmentvariabledefinitions/{name}/environmentvariabledefinition.xml"] = tostring(definition, encoding="utf-8")
+        for uuid, package in self.__packages.items():
+            files[f"Workflows/{package.display_name}-{uuid}.json"] = package
+
+        serializer = use_serializer(self.canonical.serializer) if self.canonical is not None else nullcontext()
+        with serializer, zipfile.ZipFile(fp, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name in (sorted(files) if self.canonical is not None else files):
+                content = files[name]
+                with zip_file.open(zip_entry(name, self.canonical), "w") as entry:
+                    if isinstance(content, Package):
+                        content.write_definition(entry, embedded = True, id_allocator = self.__allocator())
+                    else:
+                        entry.write(content)
+            zip_file.comment = b'\xe2\xa0\x89\xe2\xa0\x97\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x99\xe2\xa0\x80\xe2\xa0\x83\xe2\xa0\xbd\xe2\xa0\x80\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x8d\xe2\xa0\xa7'
+
+    def export_zipbytes(self) -> bytes:
+        """
+        Exports the solution as a zip file held in memory (see `write_zipfile`).
 
-    def __write_xml_file(self, path: str, content: Element, xml_declaration=False):
-        # The tostring function outputs a byte string. We must output it with 'wb' instead of 'w'
-        with open(path, 'wb') as f:
-            f.write(tostring(content, encoding="utf-8", xml_declaration=xml_declaration))
+        Returns:
+            bytes: The zip file.
+        """
+        buffer = io.BytesIO()
+        self.write_zipfile(buffer)
+        return buffer.getvalue()
 
-    def export_zipfile(self, output_dir: str = ".") -> str:
-        work_dir = tempfile.TemporaryDirectory().name
+    def cache_key(self) -> str:
+        """
+        Computes the key of the zip file of the solution in a `BuildCache`: a hash of the manifests, the
+        customizations with the connection references and localized names, the environment variables, the
+        definitions of the flows and the settings of the canonical build.
 
-        # Directory hierarchy creation
-        makedirs(work_dir, exist_ok=True)
+        Returns:
+            str: The key.
 
-        # ./solution.xml
-        self.__write_xml_file(
-            path.join(work_dir, "solution.xml"), self.export_solution_manifest())
-        # ./customizations.xml
-        self.__write_xml_file(path.join(
-            work_dir, "customizations.xml"), self.export_customizations())
-        # ./[Content_Types].xml
-        self.__write_xml_file(path.join(
-            work_dir, "[Content_Types].xml"), self.export_content_types(), xml_declaration=True)
-        # ./environmentvariabledefinitions/{name}/environmentvariabledefinition.xml
+        Raises:
+            ValueError: If the solution is not built canonically, as its zip file would change on every build.
+        """
+        if self.canonical is None:
+            raise ValueError(f"Only canonical builds can be cached: solution {self.display_name} has no CanonicalBuild")
+        return BuildCache.key(self.__cache_content())
+
+    def __cache_content(self) -> Iterator[bytes]:
+        yield self.canonical.timestamp.isoformat().encode("utf-8")
+        for element in (self.export_solution_manifest(), self.export_customizations(), self.export_content_types()):
+            yield b"\0" + tostring(element, encoding="utf-8")
         for name, definition in self.export_environment_variables().items():
-            definition_dir = path.join(work_dir, "environmentvariabledefinitions", name)
+            yield b"\0" + name.encode("utf-8") + b"\0" + tostring(definition, encoding="utf-8")
+        for uuid, package in self.__packages.items():
+            yield b"\0" + f"{package.display_name}-{uuid}".encode("utf-8") + b"\0"
+            yield from iter_json_bytes(package.export_definition(embedded = True, streaming = True), self.__allocator(), self.canonical.serializer)
 
-            # Directory hierarchy creation
-            makedirs(definition_dir, exist_ok=True)
+    def export_zipfile(self, output_dir: str = ".", cache: BuildCache|str|None = None) -> str:
+        """
+        Exports the solution as a zip file named after its display name.
 
-            self.__write_xml_file(
-                path.join(definition_dir, "environmentvariabledefinition.xml"), definition
-            )
+        Args:
+            output_dir (str, optional): The directory of the zip file.
+            cache (BuildCache|str, optional): A build cache, or its directory. If the cache holds the zip file of
+                the solution (see `cache_key`), it is reused instead of being built; otherwise the built zip file
+                is stored in the cache. Requires a canonical build.
 
-        # ./Workflows/{name}-{uuid}.json
-        definition_dir = path.join(work_dir, "Workflows")
-        makedirs(definition_dir, exist_ok=True)
-        for name, flow in self.export_workflows().items():
-            self.__write_json_file(
-                path.join(definition_dir, f"{name}-{flow["uuid"]}.json"), flow["definition"])
+        Returns:
+            str: The absolute path of the zip file.
 
-        # zip file creation
+        Raises:
+            ValueError: If a cache is given but the solution is not built canonically.
+        """
         filepath = path.join(output_dir, f"{self.display_name}.zip")
-        zip_file = zipfile.ZipFile(filepath, "w", zipfile.ZIP_DEFLATED)
-        for root, _, files in walk(work_dir):
-            for file in files:
-                zip_file.write(path.join(root, file), path.relpath(
-                    path.join(root, file), work_dir))
-
-        zip_file.comment = b'\xe2\xa0\x89\xe2\xa0\x97\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x99\xe2\xa0\x80\xe2\xa0\x83\xe2\xa0\xbd\xe2\xa0\x80\xe2\xa0\x9e\xe2\xa0\x91\xe2\xa0\x81\xe2\xa0\x8d\xe2\xa0\xa7'
-        zip_file.close()
-
-        # clean-up
-        shutil.rmtree(work_dir)
+        if cache is not None:
+            if isinstance(cache, str):
+                cache = BuildCache(cache)
+            key = self.cache_key()
+            if cache.get(key, filepath):
+                return path.abspath(filepath)
+        # Replaces the zip file rather than writing into it, as it may be hard-linked to a cached one.
+        if path.lexists(filepath):
+            remove(filepath)
+
+        with open(filepath, "wb") as f:
+            self.write_zipfile(f)
+
+        if cache is not None:
+            cache.put(key, filepath)
         return path.abspath(filepath)
@@ -1,5 +1,6 @@
-from typing import List, Dict
-import uuid
+from typing import Iterator, List, Dict, Tuple
+
+from ..metadata import assign_id
 
 class TriggerInputVariableType:
     """
@@ -33,7 +34,8 @@ class BaseTrigger:
 
     Attributes:
         trigger_name (str): The name of the trigger.
-        metadata (Dict): A dictionary storing metadata related to the trigger, including a unique operation metadata ID.
+        metadata (Dict): A dictionary storing metadata related to the trigger, including a unique operation metadata ID
+            that, unless it is set explicitly, is allocated by the current IdAllocator when the metadata is read.
         type (str): The type of the trigger, to be defined in derived classes.
     """
 
@@ -45,10 +47,24 @@ class BaseTrigger:
             name (str): The name of the trigger.
         """
         self.trigger_name: str = name
-        self.metadata: Dict = {}
-        self.metadata["operationMetadataId"] = uuid.uuid4().__str__()
+        self._metadata: Dict = {}
+        self._allocation: Tuple|None = None
         self.type: str|None = None
 
+    @property
+    def metadata(self) -> Dict:
+        """
+        The metadata of this trigger. Unless it was set explicitly, the operationMetadataId is taken from the current
+        allocator when the metadata is read, and kept while the allocator and the trigger name are unchanged.
+        """
+        metadata, self._allocation = assign_id(self._metadata, self._allocation, "triggers", self.trigger_name)
+        self._metadata = metadata
+        return metadata
+
+    @metadata.setter
+    def metadata(self, metadata: Dict):
+        self._metadata = metadata
+
     def export(self) -> Dict:
         """
         Exports the trigger's data in a dictionary format. This method should be implemented by derived classes.
@@ -101,10 +117,17 @@ class Triggers:
         Returns:
             Dict: A dictionary representation of all trigger nodes.
         """
-        d = {}
+        return dict(self.iter_export())
+
+    def iter_export(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        Exports the trigger nodes one at a time, in the order of `export`.
+
+        Returns:
+            Iterator[Tuple[str, Dict]]: The trigger names with the exported triggers.
+        """
         for node in self.nodes:
-            d[node.trigger_name] = node.export()
-        return d
+            yield node.trigger_name, node.export()
 
 
 class RecurrenceTrigger(BaseTrigger):
@@ -0,0 +1,26 @@
+from typing import Callable
+
+import pytest
+
+from pypowerautomate.flow import Flow
+from pypowerautomate.triggers import ManualTrigger
+
+
+@pytest.fixture
+def new_flow() -> Callable[..., Flow]:
+    """
+    Returns a function that creates flows with a manual trigger, taking the keyword arguments of Flow.
+    """
+    def new_flow(**kwargs) -> Flow:
+        flow = Flow(**kwargs)
+        flow.set_trigger(ManualTrigger("Button"))
+        return flow
+    return new_flow
+
+
+@pytest.fixture
+def flow(new_flow: Callable[..., Flow]) -> Flow:
+    """
+    A flow with a manual trigger.
+    """
+    return new_flow()
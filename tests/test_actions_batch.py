@@ -0,0 +1,77 @@
+import pytest
+
+from pypowerautomate.actions import Actions, ActionNameRegistry, ComposeAction, PlatformLimits, ScopeStatement, State
+
+
+def new_actions() -> Actions:
+    actions = Actions(name_registry=ActionNameRegistry())
+    actions.append(ComposeAction("First", 1))
+    return actions
+
+
+def test_extend_adds_a_chain():
+    actions = new_actions()
+    chain = [ComposeAction("A", 2), ComposeAction("B", 3), ComposeAction("C", 4)]
+
+    actions.extend(chain, exec_if_failed=True)
+
+    exported = actions.export()
+    assert list(exported) == ["First", "A", "B", "C"]
+    assert exported["A"]["runAfter"] == {"First": [State.Failed]}
+    assert exported["B"]["runAfter"] == {"A": [State.Failed]}
+    assert exported["C"]["runAfter"] == {"B": [State.Failed]}
+    assert actions.successors(actions.get("First")) == (actions.get("A"),)
+    assert actions.last_update_node is actions.get("C")
+
+
+def test_add_parallel_fans_out():
+    actions = new_actions()
+    first = actions.get("First")
+
+    actions.add_parallel(first, [ComposeAction("Notify", 2), [ComposeAction("Get", 3), ComposeAction("Update", 4)]])
+
+    exported = actions.export()
+    assert list(exported["Notify"]["runAfter"]) == ["First"]
+    assert list(exported["Get"]["runAfter"]) == ["First"]
+    assert list(exported["Update"]["runAfter"]) == ["Get"]
+    assert [node.action_name for node in actions.successors(actions.get("First"))] == ["Notify", "Get"]
+    assert actions.last_update_node is actions.get("Update")
+
+
+def test_append_actions_chains_after_the_given_action(flow):
+    flow.append_action(ComposeAction("First", 1))
+    flow.append_action(ComposeAction("Second", 2))
+
+    flow.append_actions([ComposeAction("A", 3), ComposeAction("B", 4)], flow.root_actions.get("First"))
+
+    exported = flow.export()["actions"]
+    assert list(exported["A"]["runAfter"]) == ["First"]
+    assert list(exported["B"]["runAfter"]) == ["A"]
+    assert flow.root_actions.last_update_node is flow.root_actions.get("B")
+
+
+def test_failed_batch_adds_nothing():
+    actions = new_actions()
+    duplicate = ComposeAction("A", 2)
+    with pytest.raises(ValueError, match="already exists"):
+        actions.extend([duplicate, ComposeAction("B", 3), duplicate])
+
+    assert list(actions.export()) == ["First"]
+    assert "A" not in actions.name_registry and "B" not in actions.name_registry
+    assert actions.last_update_node is actions.get("First")
+
+
+def test_batch_over_limit_leaves_nested_names_unchanged(new_flow):
+    flow = new_flow(limits=PlatformLimits(max_actions=2))
+    flow.append_action(ComposeAction("x", 1))
+    registry = flow.root_actions.name_registry
+    before = set(registry.used_names)
+
+    body = Actions(name_registry=ActionNameRegistry())
+    body.append(ComposeAction("x", 2))
+    with pytest.raises(ValueError, match="actions"):
+        flow.append_actions([ScopeStatement("s", body), ComposeAction("y", 3)])
+
+    assert list(body.export()) == ["x"]
+    assert registry.used_names == before
+    assert list(flow.export()["actions"]) == ["x"]
@@ -0,0 +1,98 @@
+import sys
+
+from pypowerautomate.actions import Actions, ActionNameRegistry, ComposeAction, IfStatement, Condition
+
+
+def build_chain(length: int) -> Actions:
+    actions = Actions(True, ActionNameRegistry())
+    actions.extend(ComposeAction(f"compose {k}", k) for k in range(length))
+    return actions
+
+
+def test_clone_long_chain():
+    length = 100_000
+    actions = build_chain(length)
+    assert length > sys.getrecursionlimit()
+
+    clone = actions.clone()
+
+    assert len(clone.nodes) == len(actions.nodes)
+    exported = clone.export()
+    names = list(exported)
+    assert len(names) == length
+    assert exported[names[0]]["runAfter"] == {}
+    for prev_name, name in zip(names, names[1:]):
+        assert list(exported[name]["runAfter"]) == [prev_name]
+    assert exported[names[-1]]["inputs"] == length - 1
+
+
+def test_clone_copies_every_node_once():
+    actions = build_chain(1000)
+    clone = actions.clone()
+
+    originals = {id(node) for node in actions.nodes.values()}
+    copies = [node for node in clone.nodes.values()]
+    assert len({id(node) for node in copies}) == len(copies)
+    assert originals.isdisjoint(id(node) for node in copies)
+    # The copies get their own names in the registry of the original.
+    assert set(clone.nodes).isdisjoint(set(actions.nodes) - {"root"})
+
+
+def test_clone_wide_fan_in():
+    width = 5000
+    actions = Actions(name_registry=ActionNameRegistry())
+    top = ComposeAction("top", 0)
+    actions.append(top)
+    branches = [ComposeAction(f"branch {k}", k) for k in range(width)]
+    actions.add_parallel(top, branches)
+    sink = ComposeAction("sink", 0)
+    actions.add_after(sink, branches)
+
+    clone = actions.clone()
+
+    assert len(clone.nodes) == width + 3
+    exported = clone.export()
+    sink_name = clone.last_update_node.action_name
+    top_name = next(iter(exported))
+    assert len(exported[sink_name]["runAfter"]) == width
+    assert all(list(exported[name]["runAfter"]) == [top_name] for name in list(exported)[1:-1])
+    assert sum(len(clone.successors(node)) for node in clone.nodes.values()) == 1 + 2 * width
+
+
+def test_clone_stacked_diamonds():
+    actions = Actions(name_registry=ActionNameRegistry())
+    first = ComposeAction("first", 0)
+    actions.append(first)
+    prev = [first]
+    for k in range(500):
+        left, right = ComposeAction(f"left {k}", k), ComposeAction(f"right {k}", k)
+        actions.add_after(left, prev)
+        actions.add_after(right, prev)
+        prev = [left, right]
+
+    clone = actions.clone()
+
+    assert len(clone.nodes) == len(actions.nodes)
+    original = actions.export()
+    exported = clone.export()
+    renamed = dict(zip(original, exported))
+    for name, action in original.items():
+        assert list(exported[renamed[name]]["runAfter"]) == [renamed[prev_name] for prev_name in action["runAfter"]]
+
+
+def test_clone_is_independent():
+    actions = Actions(name_registry=ActionNameRegistry())
+    statement = IfStatement("if", Condition("var == 1"))
+    nested = Actions(name_registry=actions.name_registry)
+    nested.append(ComposeAction("inside", 1))
+    statement.set_true_actions(nested)
+    actions.append(statement)
+    before = actions.export()
+
+    clone = actions.clone()
+    clone.append(ComposeAction("added", 2))
+    clone_statement = next(node for node in clone.nodes.values() if isinstance(node, IfStatement))
+    clone_statement.true_actions.append(ComposeAction("added inside", 3))
+
+    assert actions.export() == before
+    assert len(clone.export()) == 2
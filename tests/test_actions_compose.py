@@ -0,0 +1,95 @@
+from pypowerautomate.actions import Actions, ComposeAction, ScopeStatement
+
+
+def test_composed_fragment_nested_twice_in_a_flow(flow):
+    fragment = Actions()
+    fragment.append(ComposeAction("F", 0))
+    composed = Actions()
+    for _ in range(3):
+        composed = composed + fragment
+    flow.append_action(ScopeStatement("S1", composed))
+    flow.append_action(ScopeStatement("S2", fragment))
+
+    exported = flow.export()["actions"]
+    first = exported["S1"]["actions"]
+    second = exported["S2"]["actions"]
+    assert list(first) == ["F", "F_1", "F_2"]
+    assert [list(action["runAfter"]) for action in first.values()] == [[], ["F"], ["F_1"]]
+    assert len(second) == 1 and set(second).isdisjoint(first)
+    ids = [action["metadata"]["operationMetadataId"] for action in [*first.values(), *second.values()]]
+    assert len(set(ids)) == 4
+
+
+def test_composed_fragment_keeps_the_operands(flow):
+    fragment = Actions()
+    fragment.append(ComposeAction("A", 0))
+    fragment.append(ComposeAction("B", 1))
+    composed = ComposeAction("Start", 2) + fragment
+    flow.append_action(ScopeStatement("S1", fragment))
+    flow.append_action(ScopeStatement("S2", composed))
+
+    exported = flow.export()["actions"]
+    assert exported["S1"]["actions"] == fragment.export()
+    assert list(exported["S1"]["actions"]["B"]["runAfter"]) == ["A"]
+    second = exported["S2"]["actions"]
+    names = list(second)
+    assert names[0] == "Start" and set(names[1:]).isdisjoint(exported["S1"]["actions"])
+    assert [list(action["runAfter"]) for action in second.values()] == [[], names[:1], names[1:2]]
+
+
+def new_operands():
+    left = Actions()
+    left.append(ComposeAction("x", 1))
+    right = Actions()
+    right.append(ComposeAction("y", 2))
+    body = Actions()
+    body.append(ComposeAction("inner", 3))
+    right.append(ScopeStatement("s", body))
+    return left, right
+
+
+def test_mutating_the_composition_leaves_the_operands_unchanged():
+    left, right = new_operands()
+    left_before, right_before = left.export(), right.export()
+    composed = left + right
+
+    composed.get("y").inputs = 4
+    composed.get("y").update_runafter(composed.get("x"))
+    composed.get("s").actions.get("inner").inputs = 5
+    composed.append(ComposeAction("z", 6))
+
+    assert left.export() == left_before
+    assert right.export() == right_before
+    exported = composed.export()
+    assert exported["y"]["inputs"] == 4
+    assert exported["s"]["actions"]["inner"]["inputs"] == 5
+    assert list(exported["z"]["runAfter"]) == ["s"]
+
+
+def test_mutating_the_operands_leaves_the_composition_unchanged():
+    left, right = new_operands()
+    composed = left + right
+    composed_before = composed.export()
+
+    left.get("x").inputs = 4
+    left.append(ComposeAction("w", 5))
+    right.get("s").update_runafter(right.get("y"), force_exec=True)
+    right.get("s").actions.get("inner").inputs = 6
+
+    assert composed.export() == composed_before
+    assert list(left.export()["w"]["runAfter"]) == ["x"]
+    assert right.export()["s"]["actions"]["inner"]["inputs"] == 6
+    assert len(right.export()["s"]["runAfter"]["y"]) == 4
+
+
+def test_composed_actions_expose_their_links():
+    left, right = new_operands()
+    composed = left + right
+
+    x, y, s = composed.get("x"), composed.get("y"), composed.get("s")
+    exported = composed.export()
+    assert {name: list(states) for name, states in y.runafter.items()} == exported["y"]["runAfter"]
+    assert x.next_nodes == (y,) and y.next_nodes == (s,)
+    assert composed.successors(composed.root_node) == (x,)
+    assert composed.last_update_node is s
+    assert left.get("x").next_nodes == () and right.get("y").runafter == {}
@@ -0,0 +1,68 @@
+import pytest
+
+from pypowerautomate.actions import Actions, ActionNameRegistry, ComposeAction
+
+
+class EqualCompose(ComposeAction):
+    """A Compose action that compares equal to any Compose action with the same name and inputs."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ComposeAction) and (other.action_name, other.inputs) == (self.action_name, self.inputs)
+
+    __hash__ = ComposeAction.__hash__
+
+
+def new_actions() -> Actions:
+    return Actions(name_registry=ActionNameRegistry())
+
+
+def test_append_judges_membership_by_identity():
+    actions = new_actions()
+    first = EqualCompose("A", 1)
+    actions.append(first)
+    twin = EqualCompose("A", 1)
+    assert twin == first
+
+    actions.append(twin)
+    assert list(actions.export()) == ["A", "A_1"]
+    with pytest.raises(ValueError, match="already exists"):
+        actions.append(first)
+
+
+def test_add_after_judges_predecessors_by_identity():
+    actions = new_actions()
+    first = EqualCompose("A", 1)
+    actions.append(first)
+
+    with pytest.raises(ValueError, match="not in Actions"):
+        actions.add_after(ComposeAction("B", 2), EqualCompose("A", 1))
+    actions.add_after(ComposeAction("B", 2), first)
+    assert list(actions.export()["B"]["runAfter"]) == ["A"]
+
+
+def test_splice_judges_membership_by_identity():
+    actions = new_actions()
+    first = EqualCompose("A", 1)
+    actions.append(first)
+
+    with pytest.raises(ValueError, match="not in Actions"):
+        actions.splice(EqualCompose("A", 1), None)
+    replacement = new_actions()
+    replacement.append(ComposeAction("B", 2))
+    actions.splice(first, replacement)
+    assert list(actions.export()) == ["B"]
+
+
+def test_predecessor_from_another_actions_is_rejected():
+    actions = new_actions()
+    actions.append(ComposeAction("A", 1))
+    other = new_actions()
+    other.append(ComposeAction("A", 1))
+
+    with pytest.raises(ValueError, match="not in Actions"):
+        actions.add_after(ComposeAction("B", 2), other.get("A"))
+    with pytest.raises(ValueError, match="not in Actions"):
+        actions.extend([ComposeAction("C", 3)], other.get("A"))
+    assert list(actions.export()) == ["A"]
@@ -0,0 +1,30 @@
+import json
+
+from pypowerautomate.actions import Actions, ActionNameRegistry, ComposeAction, State
+
+
+def test_runafter_is_exported_as_lists():
+    actions = Actions(name_registry=ActionNameRegistry())
+    first = ComposeAction("First", 1)
+    actions.append(first)
+    actions.append(ComposeAction("Second", 2), exec_if_failed=True)
+    actions = actions + ComposeAction("Third", 3)
+
+    exported = actions.export()
+    assert exported["First"]["runAfter"] == {}
+    assert exported["Second"]["runAfter"] == {"First": [State.Failed]}
+    assert exported["Third"]["runAfter"] == {"Second": [State.Succeeded]}
+    assert json.loads(json.dumps(exported)) == exported
+
+
+def test_runafter_writes_are_kept():
+    actions = Actions(name_registry=ActionNameRegistry())
+    first = ComposeAction("First", 1)
+    second = ComposeAction("Second", 2)
+    actions.append(first)
+    actions.add_top(second)
+
+    second.runafter["First"] = [State.Succeeded, State.Failed]
+
+    assert second.runafter == {"First": [State.Succeeded, State.Failed]}
+    assert actions.export()["Second"]["runAfter"] == {"First": [State.Succeeded, State.Failed]}
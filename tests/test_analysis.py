@@ -0,0 +1,49 @@
+from pypowerautomate.actions import Actions, ComposeAction, ScopeStatement
+from pypowerautomate.flow import Flow
+
+
+def diamond_flow(flow: Flow) -> Flow:
+    a = ComposeAction("A", 0)
+    b = ComposeAction("B", 1)
+    body = Actions()
+    body.append(ComposeAction("C1", 2))
+    body.append(ComposeAction("C2", 3))
+    c = ScopeStatement("C", body)
+    d = ComposeAction("D", 4)
+    flow.append_action(a)
+    flow.root_actions.add_after(b, a)
+    flow.root_actions.add_after(c, a)
+    flow.root_actions.add_after(d, [b, c])
+    flow.root_actions.add_after(ComposeAction("E", 5), a)
+    return flow
+
+
+def test_levels_and_widths(flow):
+    report = diamond_flow(flow).analyze()
+    assert report.action_count == 5
+    assert report.levels == [["A"], ["B", "C", "E"], ["D"]]
+    assert report.parallel_widths == [1, 3, 1]
+    assert report.max_parallel_width == 3
+    assert report.longest_chain == 3
+    assert report.path_lengths == {"D": 3, "E": 2}
+
+
+def test_critical_path_goes_through_the_longest_branch(flow):
+    report = diamond_flow(flow).analyze()
+    # C takes 1 plus the 2 actions of its body.
+    assert report.critical_path == ["A", "C", "D"]
+    assert report.estimated_duration == 5
+    assert [child.critical_path for child in report.nested["C"]] == [["C1", "C2"]]
+
+
+def test_latency_table(flow):
+    report = diamond_flow(flow).analyze({"Compose": 10, "Scope": 0}, default_latency=0)
+    assert report.critical_path == ["A", "C", "D"]
+    assert report.estimated_duration == 40
+    assert report.export()["criticalPath"] == ["A", "C", "D"]
+
+
+def test_empty_flow(flow):
+    report = flow.analyze()
+    assert report.critical_path == [] and report.estimated_duration == 0
+    assert report.max_parallel_width == 0 and report.longest_chain == 0
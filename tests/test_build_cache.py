@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from pypowerautomate.actions import ComposeAction
+from pypowerautomate.build import BuildCache, CanonicalBuild
+from pypowerautomate.flow import Flow
+from pypowerautomate.package import Package
+from pypowerautomate.triggers import ManualTrigger
+
+
+def new_package(value: object = 1, canonical: CanonicalBuild|None = None) -> Package:
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_action(ComposeAction("Compose", value))
+    return Package("Package", flow, canonical=canonical if canonical is not None else CanonicalBuild())
+
+
+def test_hit_and_miss(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache"))
+    output = tmp_path / "out"
+    output.mkdir()
+
+    first = new_package().export_zipfile(str(output), cache)
+    built = open(first, "rb").read()
+    assert (cache.hits, cache.misses, cache.stores) == (0, 1, 1)
+
+    second = new_package().export_zipfile(str(output), cache)
+    assert second == first
+    assert open(second, "rb").read() == built
+    assert (cache.hits, cache.misses, cache.stores) == (1, 1, 1)
+
+    new_package(2).export_zipfile(str(output), cache)
+    assert (cache.hits, cache.misses, cache.stores) == (1, 2, 2)
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_key_follows_the_content():
+    assert new_package().cache_key() == new_package().cache_key()
+    assert new_package(2).cache_key() != new_package().cache_key()
+    assert new_package(canonical=CanonicalBuild("other")).cache_key() != new_package().cache_key()
+
+
+def test_only_canonical_builds_are_cached(tmp_path):
+    package = Package("Package", new_package().flow)
+    with pytest.raises(ValueError, match="canonical"):
+        package.export_zipfile(str(tmp_path), BuildCache(str(tmp_path / "cache")))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache"), max_entries=2)
+    source = tmp_path / "source.zip"
+    source.write_bytes(b"zip")
+    for index, key in enumerate(["a", "b"]):
+        cache.put(key, str(source))
+        os.utime(cache.path(key), (index, index))
+    # Using "a" makes "b" the least recently used entry.
+    assert cache.get("a", str(tmp_path / "a.zip"))
+    cache.put("c", str(source))
+
+    assert sorted(key for key, _, _ in cache.entries()) == ["a", "c"]
+    assert cache.evictions == 1
+    assert not cache.get("b", str(tmp_path / "b.zip"))
+
+
+def test_size_cap(tmp_path):
+    cache = BuildCache(str(tmp_path / "cache"), max_size=5)
+    source = tmp_path / "source.zip"
+    source.write_bytes(b"123")
+    cache.put("a", str(source))
+    os.utime(cache.path("a"), (0, 0))
+    cache.put("b", str(source))
+
+    assert [key for key, _, _ in cache.entries()] == ["b"]
+    with pytest.raises(ValueError, match="max_size"):
+        BuildCache(str(tmp_path / "cache"), max_size=0)
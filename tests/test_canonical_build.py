@@ -0,0 +1,57 @@
+import io
+import zipfile
+from datetime import datetime, timezone
+
+import pytest
+
+from pypowerautomate.actions import ComposeAction
+from pypowerautomate.build import CanonicalBuild, ZIP_EPOCH
+from pypowerautomate.flow import Flow
+from pypowerautomate.package import Package
+from pypowerautomate.solution import Solution
+from pypowerautomate.triggers import ManualTrigger
+
+
+def new_package(canonical: CanonicalBuild|None) -> Package:
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_action(ComposeAction("Compose", "@triggerBody()"))
+    package = Package("Package", flow, canonical=canonical)
+    package.set_sharepoint_connector()
+    return package
+
+
+def new_solution(canonical: CanonicalBuild|None) -> Solution:
+    solution = Solution("Solution", "pre", "Publisher", canonical=canonical)
+    solution.add_package(new_package(canonical))
+    return solution
+
+
+def test_canonical_package_is_reproducible():
+    first = new_package(CanonicalBuild("seed")).export_zipbytes()
+    assert new_package(CanonicalBuild("seed")).export_zipbytes() == first
+    assert new_package(CanonicalBuild("other")).export_zipbytes() != first
+    assert new_package(None).export_zipbytes() != new_package(None).export_zipbytes()
+
+
+def test_canonical_solution_is_reproducible():
+    first = new_solution(CanonicalBuild("seed")).export_zipbytes()
+    assert new_solution(CanonicalBuild("seed")).export_zipbytes() == first
+
+
+def test_canonical_zip_entries():
+    timestamp = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    with zipfile.ZipFile(io.BytesIO(new_package(CanonicalBuild(timestamp=timestamp)).export_zipbytes())) as zip_file:
+        infos = zip_file.infolist()
+    assert [info.filename for info in infos] == sorted(info.filename for info in infos)
+    assert {info.date_time for info in infos} == {(2024, 5, 1, 12, 30, 0)}
+    assert {info.external_attr for info in infos} == {0o100644 << 16}
+
+
+def test_canonical_timestamp(monkeypatch):
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+    assert CanonicalBuild().timestamp == ZIP_EPOCH
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1714566600")
+    assert CanonicalBuild().timestamp == datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    with pytest.raises(ValueError, match="1980"):
+        CanonicalBuild(timestamp=datetime(1979, 12, 31))
@@ -0,0 +1,53 @@
+import json
+
+from pypowerautomate.actions import Actions, ComposeAction, ScopeStatement, cache_exports
+from pypowerautomate.flow import Flow
+from pypowerautomate.triggers import ManualTrigger
+
+
+def build_flow(cache: bool = False) -> Flow:
+    flow = Flow(cache_exports=cache)
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_action(ComposeAction("C", {"value": 1}))
+    body = Actions()
+    body.append(ComposeAction("Inner", [1, 2]))
+    flow.append_action(ScopeStatement("Scope", body))
+    return flow
+
+
+def test_exports_are_fresh_by_default():
+    flow = build_flow()
+    exported = flow.export()
+    exported["actions"]["C"]["inputs"] = "HACK"
+    exported["actions"]["Scope"]["actions"]["Inner"]["inputs"] = "HACK"
+
+    again = flow.export()
+    assert again["actions"]["C"]["inputs"] == {"value": 1}
+    assert again["actions"]["Scope"]["actions"]["Inner"]["inputs"] == [1, 2]
+
+
+def test_in_place_changes_are_exported_by_default():
+    flow = build_flow()
+    flow.export()
+    flow.root_actions.get("C").inputs["value"] = 2
+
+    assert flow.export()["actions"]["C"]["inputs"] == {"value": 2}
+    assert json.loads(flow.export_json())["actions"]["C"]["inputs"] == {"value": 2}
+
+
+def test_cached_exports_follow_changes():
+    flow = build_flow(cache=True)
+    first = flow.export()
+    assert flow.export()["actions"]["C"] is first["actions"]["C"]
+
+    compose = flow.root_actions.get("C")
+    compose.inputs = {"value": 2}
+    assert flow.export()["actions"]["C"]["inputs"] == {"value": 2}
+
+    compose.inputs["value"] = 3
+    compose.mark_dirty()
+    assert flow.export()["actions"]["C"]["inputs"] == {"value": 3}
+    assert flow.export_json() == json.dumps(flow.export())
+
+    with cache_exports():
+        assert flow.root_actions.export()["C"] is flow.export()["actions"]["C"]
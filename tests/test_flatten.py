@@ -0,0 +1,73 @@
+from pypowerautomate.actions import Actions, ComposeAction, DefaultCaseStatement, ScopeStatement, SwitchStatement
+from pypowerautomate.optimizer import action_count, flatten, nesting_depth
+
+
+def scope_of(name: str, *actions) -> ScopeStatement:
+    body = Actions()
+    for action in actions:
+        body.append(action)
+    return ScopeStatement(name, body)
+
+
+def test_nested_scopes_are_inlined(flow):
+    flow.append_action(ComposeAction("First", 1))
+    flow.append_action(scope_of("Outer", scope_of("Inner", ComposeAction("A", "@triggerBody()"), ComposeAction("B", "@variables('x')"))))
+    flow.append_action(ComposeAction("Last", "@variables('y')"))
+    assert action_count(flow.root_actions) == 6
+    assert nesting_depth(flow.root_actions) == 3
+
+    report = flatten(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported) == ["First", "A", "B", "Last"]
+    assert [list(action["runAfter"]) for action in exported.values()] == [[], ["First"], ["A"], ["B"]]
+    assert report.metrics == {"actions_before": 6, "depth_before": 3, "actions_after": 4, "depth_after": 1}
+
+
+def test_scopes_handling_errors_are_kept(flow):
+    flow.append_action(scope_of("Try", ComposeAction("Work", "@triggerBody()")))
+    flow.append_action(ComposeAction("Catch", "@result('Try')"), exec_if_failed=True)
+    flow.append_action(scope_of("Referenced", ComposeAction("Other", "@variables('x')")))
+    flow.append_action(ComposeAction("Status", "@actions('Referenced')?['status']"))
+
+    flatten(flow)
+
+    assert list(flow.export()["actions"]) == ["Try", "Catch", "Referenced", "Status"]
+
+
+def test_switch_without_cases_is_inlined(flow):
+    switch = SwitchStatement("Switch", "@triggerBody()?['kind']")
+    default = Actions()
+    default.append(ComposeAction("Default", "@variables('x')"))
+    switch.set_default_case(DefaultCaseStatement(default))
+    flow.append_action(switch)
+
+    flatten(flow)
+
+    assert list(flow.export()["actions"]) == ["Default"]
+
+
+def test_compose_chain_is_merged(flow):
+    flow.append_action(ComposeAction("Source", "@triggerBody()?['value']"))
+    flow.append_action(ComposeAction("Wrapped", "@toUpper(outputs('Source'))"))
+
+    report = flatten(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported) == ["Wrapped"]
+    assert exported["Wrapped"]["inputs"] == "@toUpper(triggerBody()?['value'])"
+    assert ("Source", "merged into Compose action Wrapped") in report.changes
+
+
+def test_compose_chains_that_would_change_results_are_kept(flow):
+    flow.append_action(ComposeAction("Counter", "@variables('count')"))
+    flow.append_action(ComposeAction("UsesCounter", "@add(outputs('Counter'), 1)"))
+    flow.append_action(ComposeAction("Id", "@guid()"))
+    flow.append_action(ComposeAction("UsesIdTwice", "@concat(outputs('Id'), outputs('Id'))"))
+    flow.append_action(ComposeAction("Shared", "@triggerBody()"))
+    flow.append_action(ComposeAction("UserA", "@outputs('Shared')"))
+    flow.append_action(ComposeAction("UserB", "@outputs('Shared')"))
+
+    flatten(flow)
+
+    assert list(flow.export()["actions"]) == ["Counter", "UsesCounter", "Id", "UsesIdTwice", "Shared", "UserA", "UserB"]
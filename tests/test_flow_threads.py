@@ -0,0 +1,76 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pypowerautomate.actions import Actions, ComposeAction
+from pypowerautomate.environment_variable import EnvironmentVariable, EnvironmentVariableType
+from pypowerautomate.flow import Flow
+from pypowerautomate.flow.flow import DEFAULT_PARAMETER
+from pypowerautomate.triggers import ManualTrigger
+
+THREADS = 16
+FLOWS = 400
+EXPORTS = 20
+
+
+def export_flow(index: int):
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.add_environment_variable(EnvironmentVariable(f"var{index}", "pre", EnvironmentVariableType.text, str(index)))
+    flow.append_action(ComposeAction(f"compose {index}", index))
+    exports = []
+    for _ in range(EXPORTS):
+        exports.append(json.loads(flow.export_json()))
+        # Changing an export must not change the next ones, nor those of other flows.
+        flow.export()["parameters"]["$connections"]["defaultValue"]["leak"] = index
+    return index, exports
+
+
+def test_concurrent_exports_do_not_leak_parameters():
+    with ThreadPoolExecutor(THREADS) as pool:
+        for index, exports in pool.map(export_flow, range(FLOWS)):
+            for exported in exports:
+                parameters = exported["parameters"]
+                assert set(parameters) == {"$connections", "$authentication", f"var{index}"}
+                assert parameters[f"var{index}"]["defaultValue"] == str(index)
+                assert parameters["$connections"]["defaultValue"] == {}
+                assert list(exported["actions"]) == [f"compose {index}"]
+
+    assert DEFAULT_PARAMETER["$connections"]["defaultValue"] == {}
+    assert set(DEFAULT_PARAMETER) == {"$connections", "$authentication"}
+
+
+def test_default_parameters_are_read_only():
+    with pytest.raises(TypeError):
+        DEFAULT_PARAMETER["$connections"]["defaultValue"]["leak"] = 1
+    with pytest.raises(TypeError):
+        DEFAULT_PARAMETER["var"] = {}
+    flow = Flow()
+    assert flow.export_parameters() == {"$connections": {"defaultValue": {}, "type": "Object"}, "$authentication": {"defaultValue": {}, "type": "SecureObject"}}
+    assert json.loads(flow.export_json())["parameters"] == flow.export_parameters()
+
+
+def test_concurrent_exports_agree_on_operation_metadata_id():
+    actions = Actions()
+    actions.append(ComposeAction("shared", 1))
+
+    def operation_metadata_id(_):
+        return actions.export()["shared"]["metadata"]["operationMetadataId"]
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        assert len(set(pool.map(operation_metadata_id, range(200)))) == 1
+
+
+def test_concurrent_changes_get_distinct_versions():
+    def versions(_):
+        action = ComposeAction("compose", 1)
+        times = []
+        for _ in range(EXPORTS):
+            action.mark_dirty()
+            times.append(action._version)
+        return times
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        times = [time for result in pool.map(versions, range(FLOWS)) for time in result]
+    assert len(set(times)) == len(times)
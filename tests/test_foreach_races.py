@@ -0,0 +1,53 @@
+import warnings
+
+import pytest
+
+from pypowerautomate.actions import Actions, ComposeAction, ForeachStatement, IncrementVariableAction, ScopeStatement, SetVariableAction
+
+
+def loop_writing_a_variable() -> ForeachStatement:
+    inner = Actions()
+    inner.append(IncrementVariableAction("Count", "count", 1))
+    body = Actions()
+    body.append(ComposeAction("Item", "@items('Loop')"))
+    body.append(ScopeStatement("Scope", inner))
+    body.append(SetVariableAction("Last", "last", "@items('Loop')"))
+    loop = ForeachStatement("Loop", "@triggerBody()")
+    loop.set_actions(body)
+    return loop
+
+
+def test_variable_races_finds_nested_writes():
+    loop = loop_writing_a_variable()
+    assert sorted(node.action_name for node in loop.variable_races()) == ["Count", "Last"]
+
+
+def test_parallel_loop_writing_variables_is_rejected():
+    loop = loop_writing_a_variable()
+    with pytest.raises(ValueError, match="Count|Last"):
+        loop.set_concurrency(5)
+
+
+def test_race_check_modes():
+    loop = loop_writing_a_variable()
+    loop.set_concurrency(1)
+    with pytest.warns(RuntimeWarning, match="Loop runs 5 iterations in parallel"):
+        loop.set_concurrency(5, race_check="warn")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        loop.set_concurrency(5, race_check="ignore")
+        assert loop.export()["runtimeConfiguration"] == {"concurrency": {"repetitions": 5}}
+
+
+def test_races_are_checked_on_export(flow):
+    loop = ForeachStatement("Loop", "@triggerBody()")
+    body = Actions()
+    body.append(ComposeAction("Item", "@items('Loop')"))
+    loop.set_actions(body)
+    loop.set_concurrency(5)
+    assert loop.variable_races() == []
+
+    body.append(SetVariableAction("Last", "last", "@items('Loop')"))
+    flow.append_action(loop)
+    with pytest.raises(ValueError, match="Last"):
+        flow.export()
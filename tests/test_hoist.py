@@ -0,0 +1,91 @@
+from pypowerautomate.actions import Actions, ComposeAction, Condition, ForeachStatement, IfStatement, ScopeStatement, SharepointGetFileMetadataAction, SharepointUpdateFileAction
+from pypowerautomate.optimizer import hoist_common_calls
+
+
+def get_metadata(name: str) -> SharepointGetFileMetadataAction:
+    return SharepointGetFileMetadataAction(name, "https://example.sharepoint.com/sites/site", "file-id")
+
+
+def branch(*actions) -> Actions:
+    branch_actions = Actions()
+    for action in actions:
+        branch_actions.append(action)
+    return branch_actions
+
+
+def test_unconditional_call_is_shared_with_branches(flow):
+    body = branch(get_metadata("Get in scope"), ComposeAction("Use in scope", "@body('Get_in_scope')"))
+    flow.append_action(ScopeStatement("Scope", body))
+    statement = IfStatement("Cond", Condition("1 == 2"))
+    statement.set_true_actions(branch(get_metadata("Get in branch"), ComposeAction("Use in branch", "@body('Get_in_branch')")))
+    flow.append_action(statement)
+
+    report = hoist_common_calls(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported)[0] == "Get in scope"
+    assert list(exported["Scope"]["actions"]) == ["Use in scope"]
+    assert list(exported["Cond"]["actions"]) == ["Use in branch"]
+    assert exported["Cond"]["actions"]["Use in branch"]["inputs"] == "@body('Get_in_scope')"
+    assert list(exported["Scope"]["runAfter"]) == ["Get in scope"]
+    assert list(exported["Cond"]["runAfter"]) == ["Scope", "Get in scope"]
+    assert "Get in branch" in str(report)
+
+
+def test_conditional_calls_are_not_hoisted(flow):
+    statement = IfStatement("Cond", Condition("1 == 2"))
+    statement.set_true_actions(branch(get_metadata("Get if true")))
+    statement.set_false_actions(branch(get_metadata("Get if false")))
+    flow.append_action(statement)
+    loop = ForeachStatement("Loop", "@triggerBody()?['items']")
+    loop.set_actions(branch(get_metadata("Get in loop")))
+    flow.append_action(loop)
+    before = flow.export()
+
+    hoist_common_calls(flow)
+
+    assert flow.export() == before
+
+
+def test_calls_depending_on_branch_values_are_not_hoisted(flow):
+    flow.append_action(get_metadata("Get"))
+    loop = ForeachStatement("Loop", "@triggerBody()?['items']")
+    loop.set_actions(branch(SharepointGetFileMetadataAction("Get item", "https://example.sharepoint.com/sites/site", "@items('Loop')")))
+    flow.append_action(loop)
+    flow.append_action(SharepointGetFileMetadataAction("Get item again", "https://example.sharepoint.com/sites/site", "@items('Loop')"))
+    before = flow.export()
+
+    hoist_common_calls(flow)
+
+    assert flow.export() == before
+
+
+def test_calls_after_a_write_are_kept_after_it(flow):
+    update = SharepointUpdateFileAction("Update", "https://example.sharepoint.com/sites/site", "file-id", "content")
+    flow.append_action(update)
+    flow.append_action(get_metadata("Get 1"))
+    flow.append_action(ComposeAction("Use 1", "@body('Get_1')"))
+    flow.append_action(get_metadata("Get 2"))
+    flow.append_action(ComposeAction("Use 2", "@body('Get_2')"))
+
+    hoist_common_calls(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported) == ["Update", "Get 1", "Use 1", "Use 2"]
+    assert list(exported["Get 1"]["runAfter"]) == ["Update"]
+    assert list(exported["Use 2"]["runAfter"]) == ["Use 1"]
+    assert exported["Use 2"]["inputs"] == "@body('Get_1')"
+
+
+def test_nested_call_is_hoisted_where_its_scope_was(flow):
+    update = SharepointUpdateFileAction("Update", "https://example.sharepoint.com/sites/site", "file-id", "content")
+    flow.append_action(update)
+    flow.append_action(ScopeStatement("Scope", branch(get_metadata("Get in scope"), ComposeAction("Use in scope", "@body('Get_in_scope')"))))
+    flow.append_action(get_metadata("Get after"))
+
+    hoist_common_calls(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported) == ["Update", "Get in scope", "Scope"]
+    assert list(exported["Get in scope"]["runAfter"]) == ["Update"]
+    assert list(exported["Scope"]["runAfter"]) == ["Update", "Get in scope"]
@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pypowerautomate
+
+MODULES = ["actions", "build", "connections", "environment_variable", "flow", "metadata", "optimizer", "package", "serialization", "solution", "triggers"]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_imports_first(module):
+    # Each subpackage must be importable on its own, in a fresh interpreter, before any other one.
+    source = os.path.dirname(os.path.dirname(pypowerautomate.__file__))
+    env = dict(os.environ, PYTHONPATH=source)
+    result = subprocess.run([sys.executable, "-c", f"import pypowerautomate.{module}"], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
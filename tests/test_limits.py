@@ -0,0 +1,40 @@
+import pytest
+
+from pypowerautomate.actions import Actions, ComposeAction, PlatformLimits, ScopeStatement
+
+
+def test_over_limit_leaves_the_budget_unchanged(new_flow):
+    flow = new_flow(limits=PlatformLimits(max_actions=2))
+    flow.append_action(ComposeAction("Short", "@concat('a')"))
+    before = flow.budget.export()
+
+    body = Actions()
+    body.append(ComposeAction("Long", "@concat('" + "b" * 100 + "')"))
+    body.append(ComposeAction("Other", 1))
+    with pytest.raises(ValueError, match="actions"):
+        flow.append_action(ScopeStatement("Scope", body))
+
+    assert flow.budget.export() == before
+    assert flow.budget.longest_expression == len("@concat('a')")
+
+
+def test_next_check_after_a_rollback(new_flow):
+    flow = new_flow(limits=PlatformLimits(max_actions=2))
+    with pytest.raises(ValueError):
+        flow.append_action(ScopeStatement("Scope", Actions() + ComposeAction("Long", "@concat('" + "b" * 100 + "')") + ComposeAction("Other", 1)))
+
+    flow.append_action(ComposeAction("Short", "@concat('a')"))
+    assert flow.budget.action_count == 1
+    assert flow.budget.longest_expression == len("@concat('a')")
+    with pytest.raises(ValueError, match="4 actions"):
+        flow.append_action(ScopeStatement("Scope", Actions() + ComposeAction("A", 1) + ComposeAction("B", 2)))
+    assert flow.budget.action_count == 1
+
+
+def test_expression_over_limit(new_flow):
+    flow = new_flow(limits=PlatformLimits(max_expression_length=20))
+    flow.append_action(ComposeAction("Short", "@concat('a')"))
+    with pytest.raises(ValueError, match="characters"):
+        flow.append_action(ComposeAction("Long", "@concat('" + "b" * 20 + "')"))
+    assert flow.budget.longest_expression == len("@concat('a')")
+    assert flow.budget.action_count == 1
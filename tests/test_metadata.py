@@ -0,0 +1,67 @@
+from pypowerautomate.actions import Actions, ComposeAction, ScopeStatement
+from pypowerautomate.flow import Flow
+from pypowerautomate.metadata import DeterministicIdAllocator, use_allocator
+from pypowerautomate.triggers import ManualTrigger
+
+
+def build_flow(cache: bool = False) -> Flow:
+    flow = Flow(cache_exports=cache)
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_action(ComposeAction("C", 1))
+    body = Actions()
+    body.append(ComposeAction("Inner", 2))
+    flow.append_action(ScopeStatement("Scope", body))
+    return flow
+
+
+def operation_ids(exported: dict) -> list:
+    ids = [trigger["metadata"]["operationMetadataId"] for trigger in exported["triggers"].values()]
+    stack = [exported["actions"]]
+    while stack:
+        for action in stack.pop().values():
+            ids.append(action["metadata"]["operationMetadataId"])
+            if "actions" in action:
+                stack.append(action["actions"])
+    return ids
+
+
+def test_export_then_deterministic_export():
+    for cache in (False, True):
+        first, second = build_flow(cache), build_flow(cache)
+        first.export()
+        first.analyze()
+
+        expected = operation_ids(second.export(DeterministicIdAllocator("seed")))
+        assert operation_ids(first.export(DeterministicIdAllocator("seed"))) == expected
+        assert first.export_json(id_allocator=DeterministicIdAllocator("seed")) == second.export_json(id_allocator=DeterministicIdAllocator("seed"))
+
+
+def test_random_ids_are_kept_between_exports():
+    flow = build_flow()
+    ids = operation_ids(flow.export())
+    assert operation_ids(flow.export()) == ids
+    assert len(set(ids)) == len(ids)
+
+
+def test_explicit_ids_are_kept():
+    flow = build_flow()
+    compose = flow.root_actions.get("C")
+    compose.metadata = {"operationMetadataId": "explicit"}
+    flow.triggers.nodes[0].metadata["operationMetadataId"] = "explicit trigger"
+
+    with use_allocator(DeterministicIdAllocator("seed")):
+        exported = flow.export()
+    assert exported["actions"]["C"]["metadata"]["operationMetadataId"] == "explicit"
+    assert exported["triggers"]["Button"]["metadata"]["operationMetadataId"] == "explicit trigger"
+
+
+def test_later_export_does_not_change_earlier_one():
+    for cache in (False, True):
+        flow = build_flow(cache)
+        first = flow.export(id_allocator=DeterministicIdAllocator("one"))
+        ids = operation_ids(first)
+
+        second = flow.export(id_allocator=DeterministicIdAllocator("two"))
+
+        assert operation_ids(first) == ids
+        assert set(operation_ids(second)).isdisjoint(ids)
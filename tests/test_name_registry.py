@@ -0,0 +1,83 @@
+from pypowerautomate.actions import Actions, ActionNameRegistry, ComposeAction, IfStatement, Condition, ScopeStatement
+from pypowerautomate.optimizer import eliminate_dead_code
+
+
+def exported_names(actions: dict) -> list:
+    names = []
+    stack = [actions]
+    while stack:
+        for name, action in stack.pop().items():
+            names.append(name)
+            stack.extend(nested for nested in (action.get("actions"), action.get("else", {}).get("actions")) if nested)
+    return names
+
+
+def test_nested_actions_built_for_another_flow(new_flow):
+    first = new_flow()
+    second = new_flow()
+    body = Actions()
+    body.append(ComposeAction("X", 1))
+    body.append(ComposeAction("Y", "@outputs('X')"))
+    first.append_action(ComposeAction("X", 0))
+    first.append_action(ScopeStatement("Scope", body))
+    second.append_action(ComposeAction("X", 2))
+
+    exported = first.export()["actions"]
+    names = exported_names(exported)
+    assert len(names) == len(set(names)) == 4
+    inner = exported["Scope"]["actions"]
+    assert list(inner) == ["X_1", "Y"]
+    assert list(inner["Y"]["runAfter"]) == ["X_1"]
+    assert body.name_registry is first.name_registry
+    assert len(second.export()["actions"]) == 1
+
+
+def test_nested_actions_built_before_any_flow(flow):
+    branch = Actions(name_registry=ActionNameRegistry())
+    inner = Actions(name_registry=branch.name_registry)
+    inner.append(ComposeAction("Check", 1))
+    branch.append(ScopeStatement("Check scope", inner))
+    statement = IfStatement("Check", Condition("1 == 1"))
+    statement.set_true_actions(branch)
+    flow.append_action(ComposeAction("Check", 0))
+    flow.append_action(statement)
+
+    names = exported_names(flow.export()["actions"])
+    assert len(names) == len(set(names)) == 4
+    assert "Check" in names
+
+
+def test_flow_does_not_change_the_default_registry(flow):
+    actions = Actions()
+    assert actions.name_registry is not flow.name_registry
+
+    with flow.name_registry.scope():
+        scoped = Actions()
+    assert scoped.name_registry is flow.name_registry
+    assert Actions().name_registry is not flow.name_registry
+
+
+def test_removed_names_are_released(flow):
+    flow.append_action(ComposeAction("X", 1))
+    flow.root_actions.remove(flow.root_actions.get("X"))
+    assert "X" not in flow.name_registry
+
+    flow.append_action(ComposeAction("X", 2))
+    assert list(flow.export()["actions"]) == ["X"]
+
+    flow.append_action(IfStatement("Cond", Condition("1 == 1")))
+    eliminate_dead_code(flow)
+    assert "Cond" not in flow.name_registry
+
+
+def test_shared_names_are_kept():
+    with ActionNameRegistry().scope() as registry:
+        left = Actions()
+        left.append(ComposeAction("X", 1))
+        right = Actions()
+        right.append(ComposeAction("Y", 2))
+        composed = left + right
+
+    composed.remove(composed.get("Y"))
+    assert "Y" in registry
+    assert list(right.export()) == ["Y"]
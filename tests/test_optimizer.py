@@ -0,0 +1,94 @@
+from pypowerautomate.actions import Actions, ComposeAction, Condition, HttpAction, IfStatement, ScopeStatement, SharepointDeleteFileAction, SharepointGetFileContentAction, SharepointGetFileMetadataAction, SharepointUpdateFileAction
+from pypowerautomate.flow import Flow
+from pypowerautomate.optimizer import eliminate_dead_code, flatten, parallelize
+
+
+def test_parallelize_keeps_references_to_nested_actions(flow):
+    body = Actions()
+    body.append(ComposeAction("GetX", 1))
+    flow.append_action(ScopeStatement("Try", body))
+    flow.append_action(ComposeAction("UseX", "@body('GetX')"))
+    flow.append_action(ComposeAction("Other", 2))
+
+    parallelize(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported["UseX"]["runAfter"]) == ["Try"]
+    assert exported["Other"]["runAfter"] == {}
+
+
+def build_constant_if(flow: Flow) -> IfStatement:
+    statement = IfStatement("Cond", Condition("1 == 1"))
+    branch = Actions()
+    branch.append(HttpAction("Call", "https://example.com", "GET"))
+    statement.set_true_actions(branch)
+    flow.append_action(statement)
+    return statement
+
+
+def test_constant_if_is_folded(new_flow):
+    for optimize in (eliminate_dead_code, flatten):
+        flow = new_flow()
+        build_constant_if(flow)
+
+        report = optimize(flow)
+
+        assert list(flow.export()["actions"]) == ["Call"]
+        assert "Cond" in str(report)
+
+
+def test_referenced_constant_if_is_kept(new_flow):
+    for optimize in (eliminate_dead_code, flatten):
+        flow = new_flow()
+        build_constant_if(flow)
+        check = HttpAction("Check", "https://example.com", "POST")
+        check.set_body("@actions('Cond')?['status']")
+        flow.append_action(check)
+
+        optimize(flow)
+
+        assert list(flow.export()["actions"]) == ["Cond", "Check"]
+
+
+def test_interpolated_condition_is_not_folded(new_flow):
+    for optimize in (eliminate_dead_code, flatten):
+        flow = new_flow()
+        statement = IfStatement("Cond", Condition("\"x@{variables('v')}\" == \"x\""))
+        branch = Actions()
+        branch.append(HttpAction("Call", "https://example.com", "GET"))
+        statement.set_false_actions(branch)
+        flow.append_action(statement)
+
+        optimize(flow)
+
+        exported = flow.export()["actions"]
+        assert list(exported) == ["Cond"]
+        assert list(exported["Cond"]["else"]["actions"]) == ["Call"]
+
+
+def test_parallelize_keeps_connector_writes_in_order(flow):
+    site = "https://example.sharepoint.com/sites/site"
+    flow.append_action(SharepointUpdateFileAction("Update", site, "file-id", "content"))
+    flow.append_action(SharepointGetFileMetadataAction("Get", site, "file-id"))
+    flow.append_action(SharepointGetFileContentAction("Read", site, "file-id", True))
+    flow.append_action(SharepointDeleteFileAction("Delete", site, "file-id"))
+    flow.append_action(ComposeAction("Other", 1))
+
+    parallelize(flow)
+
+    exported = flow.export()["actions"]
+    assert list(exported["Get"]["runAfter"]) == ["Update"]
+    assert list(exported["Read"]["runAfter"]) == ["Update"]
+    assert list(exported["Delete"]["runAfter"]) == ["Get", "Read"]
+    assert exported["Other"]["runAfter"] == {}
+
+
+def test_parallelize_keep_order_replaces_connector_ordering(flow):
+    site = "https://example.sharepoint.com/sites/site"
+    flow.append_action(SharepointUpdateFileAction("Update", site, "file-id", "content"))
+    flow.append_action(SharepointDeleteFileAction("Delete", site, "file-id"))
+
+    parallelize(flow, keep_order=lambda node: False)
+
+    exported = flow.export()["actions"]
+    assert exported["Delete"]["runAfter"] == {}
@@ -0,0 +1,17 @@
+import pytest
+
+from pypowerautomate.actions import ExcelOnlineListRows
+from pypowerautomate.actions.pagination import MAX_PAGINATION_THRESHOLD
+
+
+def test_pagination_threshold_is_validated():
+    action = ExcelOnlineListRows("List rows", "me", "docs", "file.xlsx", "Table1")
+    for threshold in (0, MAX_PAGINATION_THRESHOLD + 1, True, "10"):
+        with pytest.raises(ValueError):
+            action.set_pagination(threshold)
+    assert "runtimeConfiguration" not in action.export()
+
+    action.set_pagination(MAX_PAGINATION_THRESHOLD)
+    assert action.export()["runtimeConfiguration"] == {"paginationPolicy": {"minimumItemCount": MAX_PAGINATION_THRESHOLD}}
+    action.disable_pagination()
+    assert "runtimeConfiguration" not in action.export()
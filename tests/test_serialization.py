@@ -0,0 +1,41 @@
+import json
+
+from pypowerautomate.actions import ComposeAction
+from pypowerautomate.flow import Flow
+from pypowerautomate.serialization import DEFAULT_SERIALIZER, JsonSerializer, current_serializer, xor_decode
+from pypowerautomate.triggers import ManualTrigger
+
+
+def build_flow() -> Flow:
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_action(ComposeAction("C", {"f": 1.5e-5, "text": "café"}))
+    return flow
+
+
+def legacy_xor(text: str, key: str) -> str:
+    values = [int(x) for x in key.split(",")]
+    return ",".join(str(ord(text[i]) ^ values[i % len(values)]) for i in range(len(text)))
+
+
+def test_default_serializer_is_the_standard_library():
+    assert DEFAULT_SERIALIZER.backend.name == "json"
+    assert JsonSerializer().backend.name == "json"
+    assert current_serializer() is DEFAULT_SERIALIZER
+
+
+def test_export_json_matches_json_dumps():
+    flow = build_flow()
+    text = flow.export_json()
+
+    assert text == json.dumps(flow.export())
+    assert "1.5e-05" in text
+
+
+def test_xor_export_matches_the_legacy_encoding():
+    flow = build_flow()
+    key = "12,34,56"
+    encoded = flow.export_json(xor_key=key)
+
+    assert encoded == legacy_xor(json.dumps(flow.export()), key)
+    assert xor_decode(encoded, key).decode("utf-8") == json.dumps(flow.export())
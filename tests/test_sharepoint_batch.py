@@ -0,0 +1,70 @@
+import pytest
+
+from pypowerautomate.actions import ActionNameRegistry, SharepointBatchBuilder
+from pypowerautomate.actions.sharepointbatch import CRLF, MAX_SHAREPOINT_BATCH_SIZE
+from pypowerautomate.metadata import DeterministicIdAllocator, use_allocator
+
+SITE = "https://contoso.sharepoint.com/sites/team"
+ITEMS = "@body('Get_items')?['value']"
+
+
+def build(**kwargs) -> dict:
+    return SharepointBatchBuilder("Sync", SITE, "Tasks", ITEMS, **kwargs).build(ActionNameRegistry()).export()
+
+
+def test_operations_are_chunked_by_1000():
+    exported = build()
+    assert MAX_SHAREPOINT_BATCH_SIZE == 1000
+    assert list(exported) == ["Sync operations", "Sync chunks", "Sync batches"]
+    assert exported["Sync chunks"]["inputs"] == "@chunk(body('Sync_operations'), 1000)"
+    assert exported["Sync batches"]["foreach"] == "@outputs('Sync_chunks')"
+    assert build(batch_size=250)["Sync chunks"]["inputs"] == "@chunk(body('Sync_operations'), 250)"
+
+
+@pytest.mark.parametrize("batch_size", [0, 1001, True, 10.0])
+def test_invalid_batch_size(batch_size):
+    with pytest.raises(ValueError, match="batch size"):
+        SharepointBatchBuilder("Sync", SITE, "Tasks", ITEMS, batch_size=batch_size)
+
+
+def test_batch_request():
+    builder = SharepointBatchBuilder("Sync", SITE, "Tasks", ITEMS, operation="delete")
+    boundaries = builder.boundaries()
+    loop = builder.build(ActionNameRegistry()).export()["Sync batches"]["actions"]
+    assert list(loop) == ["Sync batch body", "Sync request", "Sync results", "Sync failures"]
+    body = loop["Sync batch body"]["inputs"]
+    assert body.startswith(f"--{boundaries['batch']}{CRLF}")
+    assert body.endswith(f"--{boundaries['changeset']}--{CRLF}{CRLF}--{boundaries['batch']}--{CRLF}")
+    parameters = loop["Sync request"]["inputs"]["parameters"]
+    assert parameters["parameters/uri"] == "_api/$batch"
+    assert parameters["parameters/headers"]["Content-Type"] == f"multipart/mixed; boundary={boundaries['batch']}"
+    assert f"DELETE {SITE}/_api/web/lists/getByTitle('Tasks')/items(@{{item()?['ID']}}) HTTP/1.1" in builder.operation_template()
+
+
+def test_response_parsing():
+    loop = build()["Sync batches"]["actions"]
+    results = loop["Sync results"]["inputs"]
+    assert results["from"] == "@skip(split(base64ToString(body('Sync_request')?['$content']), 'HTTP/1.1 '), 1)"
+    assert results["select"] == {"status": "@int(substring(item(), 0, 3))", "response": "@item()"}
+    assert loop["Sync failures"]["inputs"] == {"from": "@body('Sync_results')", "where": "@greaterOrEquals(item()?['status'], 400)"}
+
+    # The same steps in Python, on a response with one success and one failure.
+    response = CRLF.join([
+        "--batchresponse_1", "Content-Type: multipart/mixed; boundary=changesetresponse_1", "",
+        "--changesetresponse_1", "Content-Type: application/http", "",
+        "HTTP/1.1 204 No Content", "", "",
+        "--changesetresponse_1", "Content-Type: application/http", "",
+        "HTTP/1.1 412 Precondition Failed", "", '{"odata.error": {}}',
+        "--changesetresponse_1--", "--batchresponse_1--",
+    ])
+    statuses = [int(item[0:3]) for item in response.split("HTTP/1.1 ")[1:]]
+    assert statuses == [204, 412]
+    assert [status for status in statuses if status >= 400] == [412]
+
+
+def test_build_is_deterministic():
+    with use_allocator(DeterministicIdAllocator()):
+        assert build() == build()
+    first = SharepointBatchBuilder("Sync", SITE, "Tasks", ITEMS).boundaries()
+    other = SharepointBatchBuilder("Sync", SITE, "Other", ITEMS).boundaries()
+    assert first != other
@@ -0,0 +1,57 @@
+import pytest
+
+from pypowerautomate.actions import Actions, ActionNameRegistry, ComposeAction
+
+
+def new_actions() -> Actions:
+    return Actions(name_registry=ActionNameRegistry())
+
+
+def test_insertion_order_is_kept_when_valid():
+    actions = new_actions()
+    for name in ["A", "B", "C"]:
+        actions.append(ComposeAction(name, 0))
+    assert [node.action_name for node in actions.topological_order()] == ["A", "B", "C"]
+    assert list(actions.export()) == ["A", "B", "C"]
+
+
+def test_actions_are_sorted_after_their_dependencies():
+    actions = new_actions()
+    a = ComposeAction("A", 0)
+    b = ComposeAction("B", 1)
+    c = ComposeAction("C", 2)
+    actions.append(a)
+    actions.append(b)
+    actions.add_top(c)
+    actions.set_runafter(a, [c])
+
+    order = [node.action_name for node in actions.topological_order()]
+    assert order == ["C", "A", "B"]
+    exported = actions.export()
+    assert list(exported) == order
+    assert list(exported["A"]["runAfter"]) == ["C"]
+
+
+def test_cycle_is_reported():
+    actions = new_actions()
+    a = ComposeAction("A", 0)
+    actions.append(a)
+    actions.append(ComposeAction("B", 1))
+    c = ComposeAction("C", 2)
+    actions.append(c)
+    actions.set_runafter(a, [c])
+
+    with pytest.raises(ValueError, match="cycle: (A -> B -> C -> A|B -> C -> A -> B|C -> A -> B -> C)"):
+        actions.topological_order()
+    with pytest.raises(ValueError, match="cycle"):
+        actions.export()
+
+
+def test_run_after_an_unknown_action_is_reported():
+    actions = new_actions()
+    a = ComposeAction("A", 0)
+    actions.append(a)
+    a.runafter["Missing"] = ["Succeeded"]
+
+    with pytest.raises(ValueError, match="A runs after Missing"):
+        actions.topological_order()
@@ -0,0 +1,57 @@
+import io
+import zipfile
+
+from pypowerautomate.actions import ComposeAction
+from pypowerautomate.build import CanonicalBuild
+from pypowerautomate.flow import Flow
+from pypowerautomate.package import Package
+from pypowerautomate.solution import Solution
+from pypowerautomate.triggers import ManualTrigger
+
+
+class UnseekableStream(io.RawIOBase):
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.data += b
+        return len(b)
+
+
+def new_package() -> Package:
+    flow = Flow()
+    flow.set_trigger(ManualTrigger("Button"))
+    flow.append_action(ComposeAction("Compose", "@triggerBody()"))
+    package = Package("Package", flow, canonical=CanonicalBuild())
+    package.set_sharepoint_connector()
+    return package
+
+
+def test_package_zipbytes_match_the_zipfile(tmp_path):
+    package = new_package()
+    in_memory = package.export_zipbytes()
+    with open(package.export_zipfile(str(tmp_path)), "rb") as f:
+        assert f.read() == in_memory
+    with zipfile.ZipFile(io.BytesIO(in_memory)) as zip_file:
+        assert zip_file.testzip() is None
+        assert "manifest.json" in zip_file.namelist()
+
+
+def test_solution_zipbytes_match_the_zipfile(tmp_path):
+    solution = Solution("Solution", "pre", "Publisher", canonical=CanonicalBuild())
+    solution.add_package(new_package())
+    in_memory = solution.export_zipbytes()
+    with open(solution.export_zipfile(str(tmp_path)), "rb") as f:
+        assert f.read() == in_memory
+
+
+def test_unseekable_stream():
+    package = new_package()
+    stream = UnseekableStream()
+    package.write_zipfile(stream)
+    with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as zip_file:
+        assert zip_file.testzip() is None
+        assert sorted(zip_file.namelist()) == sorted(zipfile.ZipFile(io.BytesIO(package.export_zipbytes())).namelist())